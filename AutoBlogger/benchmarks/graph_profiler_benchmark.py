@@ -0,0 +1,116 @@
+"""
+Benchmark the overhead of `GraphProfiler` on a graph shaped like `content_graph`.
+
+The graph has the same topology (parallel validation branches joined before
+keyword generation, then search, context compilation and writing); each node
+makes one fake LLM call that sleeps `--latency` seconds and the state carries
+`--state-kb` KiB of page text, so no API keys or network are needed.
+
+Runs are timed with profiling disabled (`profile_graph(..., enabled=False)`),
+enabled, and enabled without state size measurement.
+
+Usage (from the AutoBlogger root):
+    python benchmarks/graph_profiler_benchmark.py --runs 50 --latency 0.02
+"""
+
+import os
+import sys
+
+# Add project root to PYTHONPATH to allow absolute imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import time
+from typing import Annotated, List, TypedDict
+
+import numpy as np
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langgraph.graph import END, START, StateGraph
+
+from server_src.content_creation.graph_profiler import GraphProfiler, profile_graph
+
+class FakeChatModel(BaseChatModel):
+    """
+    Chat model stand-in that sleeps instead of calling an API and reports token usage.
+    """
+    latency: float = 0.02
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self.latency)
+        message = AIMessage(content="ok", usage_metadata={"input_tokens": 500, "output_tokens": 50, "total_tokens": 550})
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+def _keep_last(old, new):
+    return new
+
+class BenchState(TypedDict):
+    title: str
+    pages: List[str]
+    notes: Annotated[str, _keep_last]
+
+def build_graph(llm: FakeChatModel, state_kb: int):
+    def node(name: str):
+        def run(state: BenchState):
+            llm.invoke(f"{name}: {state['title']}")
+            return {"notes": name}
+        return run
+
+    graph = StateGraph(BenchState)
+    for name in ["fetch_hints_links", "validate_hints", "extract_links_content", "validate_links",
+                 "join_validations", "gen_keywords", "web_search", "compile_context", "write_content"]:
+        graph.add_node(name, node(name))
+
+    graph.add_edge(START, "fetch_hints_links")
+    graph.add_edge("fetch_hints_links", "validate_hints")
+    graph.add_edge("fetch_hints_links", "extract_links_content")
+    graph.add_edge("extract_links_content", "validate_links")
+    graph.add_edge(["validate_hints", "validate_links"], "join_validations")
+    graph.add_edge("join_validations", "gen_keywords")
+    graph.add_edge("gen_keywords", "web_search")
+    graph.add_edge("web_search", "compile_context")
+    graph.add_edge("compile_context", "write_content")
+    graph.add_edge("write_content", END)
+
+    pages = ["lorem ipsum " * 85] * state_kb     # ~1 KiB per page
+    return graph.compile(), {"title": "Artificial General Intelligence", "pages": pages, "notes": ""}
+
+def time_runs(graph, graph_input, runs: int) -> np.ndarray:
+    graph.invoke(graph_input)   # warm-up
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        graph.invoke(graph_input)
+        latencies.append(time.perf_counter() - start)
+    return 1000 * np.array(latencies)
+
+def main():
+    parser = argparse.ArgumentParser(description="GraphProfiler overhead benchmark")
+    parser.add_argument("--runs", type=int, default=50, help="graph runs per mode")
+    parser.add_argument("--latency", type=float, default=0.02, help="fake LLM latency per call (seconds)")
+    parser.add_argument("--state-kb", type=int, default=64, help="page text carried in the state (KiB)")
+    args = parser.parse_args()
+
+    graph, graph_input = build_graph(FakeChatModel(latency=args.latency), args.state_kb)
+
+    modes = {
+        "disabled": profile_graph(graph, enabled=False)[0],
+        "enabled": GraphProfiler().attach(graph),
+        "enabled, no state size": GraphProfiler(measure_state=False).attach(graph),
+    }
+
+    baseline = None
+    print(f"{args.runs} runs, {args.latency * 1000:.0f} ms per LLM call, {args.state_kb} KiB state (ms per run)")
+    print(f"{'mode':<24} {'mean':>8} {'p50':>8} {'p95':>8} {'overhead':>9}")
+    for name, runnable in modes.items():
+        ms = time_runs(runnable, graph_input, args.runs)
+        baseline = baseline or ms.mean()
+        print(f"{name:<24} {ms.mean():8.2f} {np.percentile(ms, 50):8.2f} {np.percentile(ms, 95):8.2f} {100 * (ms.mean() / baseline - 1):8.2f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark per-call latency of the Hashnode GraphQL client.
+
+A local stub GraphQL server stands in for the Hashnode API. To model the
+TCP + TLS handshake of the real API, the stub delays the first request on
+every new connection by `--handshake` seconds, and every request by
+`--latency` seconds of server time.
+
+Three modes are compared:
+- per-call client: a new `httpx.AsyncClient` per request (previous behaviour)
+- shared client:   the pooled keep-alive client of `hashnode_server`, cache disabled
+- shared + cache:  the pooled client with the read-only query TTL cache
+
+Usage (from the AutoBlogger root):
+    python benchmarks/hashnode_client_benchmark.py --calls 50 --handshake 0.1 --latency 0.02
+"""
+
+import os
+import sys
+
+# Add project root to PYTHONPATH to allow absolute imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+class StubGraphQLHandler(BaseHTTPRequestHandler):
+    """
+    Minimal GraphQL endpoint answering every query with a fixed `me` payload.
+
+    One handler instance serves one connection, so the simulated handshake
+    delay is paid once per connection.
+    """
+    protocol_version = "HTTP/1.1"    # keep-alive
+    disable_nagle_algorithm = True    # headers and body are written separately
+    handshake = 0.0
+    latency = 0.0
+
+    def setup(self):
+        super().setup()
+        time.sleep(self.handshake)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.latency)
+
+        body = json.dumps({"data": {"me": {"name": "Benchmark", "username": "benchmark"}}}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_stub_server(handshake: float, latency: float) -> ThreadingHTTPServer:
+    StubGraphQLHandler.handshake = handshake
+    StubGraphQLHandler.latency = latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGraphQLHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+async def per_call_client(url: str, query: str) -> dict:
+    """
+    Previous `fetch_from_api` behaviour: one client (and connection) per call.
+    """
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        response = await client.post(url, json={"query": query, "variables": None})
+        response.raise_for_status()
+        return response.json()
+
+async def measure(call, calls: int) -> list:
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        await call()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+def summarize(name: str, latencies: list) -> str:
+    ordered = sorted(latencies)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    return f"{name:<18} mean {statistics.mean(latencies) * 1000:7.1f} ms   p50 {statistics.median(latencies) * 1000:7.1f} ms   p95 {p95 * 1000:7.1f} ms"
+
+async def run(args, url: str) -> None:
+    # Point the server module at the stub before importing it
+    os.environ["HASHNODE_API_URL"] = url
+    os.environ.setdefault("HASHNODE_TOKEN", "benchmark-dummy-token")
+    from mcp_files.servers import hashnode_server
+
+    query = hashnode_server.ME_QUERY
+
+    before = await measure(lambda: per_call_client(url, query), args.calls)
+
+    hashnode_server.HASHNODE_CACHE_TTL = 0
+    shared = await measure(lambda: hashnode_server.fetch_from_api(query), args.calls)
+
+    hashnode_server.HASHNODE_CACHE_TTL = 60
+    cached = await measure(lambda: hashnode_server.fetch_from_api(query), args.calls)
+
+    await hashnode_server.close_client()
+
+    print(f"Calls per mode:     {args.calls}")
+    print(f"Stub handshake:     {args.handshake * 1000:.0f} ms per new connection")
+    print(f"Stub latency:       {args.latency * 1000:.0f} ms per request")
+    print(summarize("per-call client", before))
+    print(summarize("shared client", shared))
+    print(summarize("shared + cache", cached))
+    print(f"Speed-up (shared):  {statistics.mean(before) / statistics.mean(shared):.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-call vs shared Hashnode client benchmark")
+    parser.add_argument("--calls", type=int, default=50, help="GraphQL calls per mode")
+    parser.add_argument("--handshake", type=float, default=0.1, help="simulated handshake time per new connection (seconds)")
+    parser.add_argument("--latency", type=float, default=0.02, help="simulated server time per request (seconds)")
+    args = parser.parse_args()
+
+    server = start_stub_server(args.handshake, args.latency)
+    try:
+        asyncio.run(run(args, f"http://127.0.0.1:{server.server_address[1]}/graphql"))
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark the sequential vs concurrent `web_search` node.
+
+A fake Tavily tool with configurable latency replaces the real one, so
+the benchmark measures only the node's orchestration (no network, no
+API key required).
+
+Usage (from the AutoBlogger root):
+    python benchmarks/web_search_benchmark.py --keywords 10 --latency 0.5
+"""
+
+import os
+import sys
+
+# Add project root to PYTHONPATH to allow absolute imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Clients validate their keys at construction; the benchmark never calls them
+os.environ.setdefault("TAVILY_API_KEY", "benchmark-dummy-key")
+os.environ.setdefault("GROQ_API_KEY", "benchmark-dummy-key")
+
+import argparse
+import asyncio
+import importlib
+import random
+import time
+
+from server_src.content_creation.graph.state import ContentState
+
+# Import the module itself (the package re-exports the node function under the same name)
+web_search_module = importlib.import_module("server_src.content_creation.graph.nodes.web_search")
+
+class FakeTavily:
+    """
+    Stand-in for `TavilySearch` that sleeps instead of calling the API.
+
+    Each call waits `latency` seconds (plus up to `jitter` seconds of random
+    delay) and returns a response shaped like a real Tavily result.
+    """
+    def __init__(self, latency: float, jitter: float = 0.0):
+        self.latency = latency
+        self.jitter = jitter
+
+    def _delay(self) -> float:
+        return self.latency + random.uniform(0, self.jitter)
+
+    def _response(self, query: str) -> dict:
+        return {
+            "results": [
+                {
+                    "title": f"Result for {query}",
+                    "content": f"{query} " * 40,
+                    "url": f"https://example.com/{query.replace(' ', '-')}",
+                }
+            ],
+            "images": [
+                {"url": "https://example.com/shared.png", "description": "Shared image"},
+                {"url": f"https://example.com/{query.replace(' ', '-')}.png", "description": query},
+            ],
+        }
+
+    def invoke(self, payload: dict) -> dict:
+        time.sleep(self._delay())
+        return self._response(payload["query"])
+
+    async def ainvoke(self, payload: dict) -> dict:
+        await asyncio.sleep(self._delay())
+        return self._response(payload["query"])
+
+def main():
+    parser = argparse.ArgumentParser(description="Sequential vs concurrent web_search benchmark")
+    parser.add_argument("--keywords", type=int, default=10, help="number of search keywords")
+    parser.add_argument("--latency", type=float, default=0.5, help="fake Tavily latency per call (seconds)")
+    parser.add_argument("--jitter", type=float, default=0.2, help="extra random latency per call (seconds)")
+    parser.add_argument("--concurrency", type=int, default=None, help="override WEB_SEARCH_MAX_CONCURRENCY")
+    args = parser.parse_args()
+
+    web_search_module.web_search_tool = FakeTavily(args.latency, args.jitter)
+    if args.concurrency:
+        web_search_module.WEB_SEARCH_MAX_CONCURRENCY = args.concurrency
+
+    state = ContentState(
+        title="Benchmark",
+        search_keywords=[f"keyword {i}" for i in range(args.keywords)],
+        images=[{"url": "https://example.com/shared.png", "source": "user"}],
+    )
+
+    start = time.perf_counter()
+    sequential = web_search_module.web_search(state)
+    sequential_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    concurrent = asyncio.run(web_search_module.aweb_search(state))
+    concurrent_time = time.perf_counter() - start
+
+    print(f"Keywords:            {args.keywords}")
+    print(f"Latency per call:    {args.latency:.2f}s (+ up to {args.jitter:.2f}s jitter)")
+    print(f"Max concurrency:     {web_search_module.WEB_SEARCH_MAX_CONCURRENCY}")
+    print(f"Sequential:          {sequential_time:.2f}s")
+    print(f"Concurrent:          {concurrent_time:.2f}s")
+    print(f"Speed-up:            {sequential_time / concurrent_time:.1f}x")
+    print(f"Identical output:    {sequential == concurrent}")
+
+if __name__ == "__main__":
+    main()
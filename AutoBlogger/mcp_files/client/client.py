@@ -100,6 +100,20 @@ def print_message_contents(response):
         elif isinstance(msg, AIMessage):
             logger.info(f"[AI]: {msg.content}")
 
+async def handle_server_log(params):
+    """
+    Render streamed blog content as it arrives; log other server notifications.
+
+    Parameters
+    ----------
+    params : LoggingMessageNotificationParams
+        Log notification sent by an MCP server.
+    """
+    if params.logger == "blog_content_creator.content":
+        print(params.data, end="", flush=True)
+    else:
+        logger.info(f"[{params.logger or 'server'}] {params.data}")
+
 async def process_user_query(agent):
     """
     Interactive loop that accepts user queries and invokes the agent.
@@ -166,7 +180,7 @@ async def run_agent():
                 read, write = await stack.enter_async_context(sse_client(url=url))
 
                 # Create MCP client session using the pipes
-                session = await stack.enter_async_context(ClientSession(read, write))
+                session = await stack.enter_async_context(ClientSession(read, write, logging_callback=handle_server_log))
                 await session.initialize()
 
                 # Load tools exposed by the MCP server
@@ -10,18 +10,103 @@ from logging_config import get_logger
 logger = get_logger("ContentCreatorServer")
 logger.info("ContentCreatorServer started")
 
+import atexit
+import time
 from server_src.content_creation.graph.graph import content_graph
-from mcp.server.fastmcp import FastMCP
+from server_src.content_creation.graph_profiler import profile_graph
+from server_src.content_creation.graph.run_control import run_scope
+from server_src.content_creation.configs.configs import ConfigLoader
+from mcp.server.fastmcp import FastMCP, Context
 from dotenv import load_dotenv
 
 # Load environment variables (API keys, configs, etc.)
 load_dotenv()
 
+config_data = ConfigLoader()    # load config yaml file
+STREAM_FLUSH_INTERVAL = config_data.get("STREAM_FLUSH_INTERVAL", 0.25)
+STREAM_FLUSH_CHARS = config_data.get("STREAM_FLUSH_CHARS", 200)
+
+# Nodes on the successful path (progress total); `exit` only runs on early termination
+PIPELINE_STEPS = len([n for n in content_graph.nodes if n not in ("__start__", "exit")])
+
+# Graph used by the tool: `content_graph` with a GraphProfiler attached when
+# GRAPH_PROFILING_ENABLED is set (profiler is None otherwise). The profile is
+# written on shutdown, or on demand with the `graph_profile` tool.
+profiled_graph, profiler = profile_graph(content_graph)
+if profiler is not None:
+    atexit.register(profiler.save, prefix="blog_content_creator")
+
+# Logger name of the notifications carrying streamed content
+CONTENT_STREAM_LOGGER = "blog_content_creator.content"
+
 # Initialize MCP server instance
 mcp = FastMCP("Content_Creation_Server")
 
+async def stream_content_graph(topic: str, ctx: Context, run_id: str) -> dict:
+    """
+    Run the content graph, streaming progress and content to the MCP client.
+
+    - One progress notification is sent per completed node.
+    - Tokens generated by `write_content` are coalesced (every
+      `STREAM_FLUSH_INTERVAL` seconds or `STREAM_FLUSH_CHARS` characters)
+      and sent as `info` log notifications from `CONTENT_STREAM_LOGGER`.
+
+    Parameters
+    ----------
+    topic : str
+        The subject for which content should be generated.
+    ctx : Context
+        MCP request context used to send notifications.
+    run_id : str
+        Identifier of the graph run (from `run_scope`).
+
+    Returns
+    -------
+    dict
+        Final values produced by the graph nodes (e.g. `content`, `exit_reason`).
+    """
+    result, step = {}, 0
+    buffer, last_flush, streamed = [], time.monotonic(), False
+
+    async def flush():
+        nonlocal buffer, last_flush, streamed
+        if buffer:
+            await ctx.log("info", "".join(buffer), logger_name=CONTENT_STREAM_LOGGER)
+            streamed = True
+        buffer, last_flush = [], time.monotonic()
+
+    async for mode, chunk in profiled_graph.astream(
+        {"title": topic, "run_id": run_id},
+        config={"configurable": {"stream_content": True}},
+        stream_mode=["updates", "messages"],
+    ):
+        if mode == "messages":
+            message, metadata = chunk
+            if metadata.get("langgraph_node") != "write_content" or not isinstance(message.content, str):
+                continue
+
+            buffer.append(message.content)
+            if time.monotonic() - last_flush >= STREAM_FLUSH_INTERVAL or sum(len(t) for t in buffer) >= STREAM_FLUSH_CHARS:
+                await flush()
+            continue
+
+        # "updates": {node_name: values returned by the node}
+        for node, values in chunk.items():
+            if values:
+                result.update(values)
+            step += 1
+            await ctx.report_progress(step, PIPELINE_STEPS, message=f"{node} completed")
+
+    await flush()
+
+    # Nothing streamed (e.g. served from the LLM cache): send the post in one notification
+    if not streamed and result.get("content"):
+        await ctx.log("info", result["content"], logger_name=CONTENT_STREAM_LOGGER)
+
+    return result
+
 @mcp.tool()
-async def blog_content_creator(topic: str) -> str:
+async def blog_content_creator(topic: str, stream: bool = False, ctx: Context = None) -> str:
     """
     Generate blog-style informational content for a given topic.
 
@@ -32,6 +117,10 @@ async def blog_content_creator(topic: str) -> str:
     ----------
     topic : str
         The subject for which content should be generated.
+    stream : bool
+        If True, send a progress notification per pipeline step and stream
+        the content as it is written (log notifications from
+        `blog_content_creator.content`). The full content is still returned.
 
     Returns
     -------
@@ -40,8 +129,13 @@ async def blog_content_creator(topic: str) -> str:
     """
     logger.info(f"Generating content for topic: {topic}")
 
-    # Invoke the content generation graph asynchronously
-    result = await content_graph.ainvoke(input={"title": topic})
+    # The run's cancellation signal is released however the run ends
+    with run_scope() as run_id:
+        if stream and ctx is not None:
+            result = await stream_content_graph(topic, ctx, run_id)
+        else:
+            # Invoke the content generation graph asynchronously
+            result = await profiled_graph.ainvoke(input={"title": topic, "run_id": run_id})
 
     if result.get("content"):
         output = result["content"]
@@ -52,6 +146,29 @@ async def blog_content_creator(topic: str) -> str:
 
     return output
 
+@mcp.tool()
+async def graph_profile(save: bool = False) -> str:
+    """
+    Report the profile of recent content graph runs (GRAPH_PROFILING_ENABLED).
+
+    Parameters
+    ----------
+    save : bool
+        If True, also write the Chrome trace and folded stacks to GRAPH_PROFILE_DIR.
+
+    Returns
+    -------
+    str
+        Per-node and per-run summary table, or a notice if profiling is disabled.
+    """
+    if profiler is None:
+        return "Profiling is disabled; set GRAPH_PROFILING_ENABLED in the config yaml."
+
+    if save:
+        paths = profiler.save(prefix="blog_content_creator")
+        return f"Graph profile written to {paths['trace']} and {paths['folded']}\n{profiler.format_summary()}"
+    return profiler.format_summary()
+
 if __name__ == "__main__":
     """
     Entry point for starting the Content Creation MCP Server.
@@ -9,10 +9,19 @@ from logging_config import get_logger
 logger = get_logger("HashnodeServer")
 logger.info("HashnodeServer started")
 
+import asyncio
+import json
+import random
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Optional
+
 import httpx
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+from configs.configs import ConfigLoader
 from server_src.hashnode_graphql_queries import (
     ME_QUERY,
     CREATE_DRAFT_QUERY,
@@ -29,13 +38,145 @@ load_dotenv()
 HASHNODE_API_URL = os.getenv("HASHNODE_API_URL")
 HASHNODE_TOKEN = os.getenv("HASHNODE_TOKEN")
 
+# HTTP client, retry and cache settings
+config_data = ConfigLoader()    # load config yaml file
+HASHNODE_HTTP2 = config_data.get("HASHNODE_HTTP2", True)
+HASHNODE_TIMEOUT = config_data.get("HASHNODE_TIMEOUT", 60)
+HASHNODE_MAX_CONNECTIONS = config_data.get("HASHNODE_MAX_CONNECTIONS", 10)
+HASHNODE_MAX_KEEPALIVE = config_data.get("HASHNODE_MAX_KEEPALIVE", 5)
+HASHNODE_KEEPALIVE_EXPIRY = config_data.get("HASHNODE_KEEPALIVE_EXPIRY", 30)
+HASHNODE_MAX_RETRIES = config_data.get("HASHNODE_MAX_RETRIES", 3)
+HASHNODE_BACKOFF_BASE = config_data.get("HASHNODE_BACKOFF_BASE", 0.5)
+HASHNODE_BACKOFF_MAX = config_data.get("HASHNODE_BACKOFF_MAX", 8)
+HASHNODE_CACHE_TTL = config_data.get("HASHNODE_CACHE_TTL", 60)
+HASHNODE_CACHE_MAX_ENTRIES = config_data.get("HASHNODE_CACHE_MAX_ENTRIES", 128)
+
+# Read-only queries: safe to cache and to retry on any 5xx
+READ_ONLY_QUERIES = {ME_QUERY, GET_PUBLICATION_QUERY, PUBLICATION_POSTS_QUERY, PUBLICATION_QUERY}
+
+# Status codes worth retrying. Mutations are retried only when the request
+# was certainly not processed (429 / 503), to avoid creating duplicates.
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MUTATION_RETRY_STATUSES = {429, 503}
+
+_client: Optional[httpx.AsyncClient] = None
+_client_users = 0
+_response_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+def _http2_available() -> bool:
+    if not HASHNODE_HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        logger.warning("HASHNODE_HTTP2 is enabled but the h2 package is missing; using HTTP/1.1")
+        return False
+
+def get_client() -> httpx.AsyncClient:
+    """
+    Return the shared Hashnode HTTP client, creating it on first use.
+
+    The client keeps connections alive between tool calls, so the TCP / TLS
+    handshake is paid once per connection instead of once per request.
+
+    Returns
+    -------
+    httpx.AsyncClient
+        Shared client with HTTP/2 (when available) and pool limits from config.
+    """
+    global _client
+
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=_http2_available(),
+            timeout=HASHNODE_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=HASHNODE_MAX_CONNECTIONS,
+                max_keepalive_connections=HASHNODE_MAX_KEEPALIVE,
+                keepalive_expiry=HASHNODE_KEEPALIVE_EXPIRY,
+            ),
+            headers={
+                "Authorization": HASHNODE_TOKEN or "",
+                "Content-Type": "application/json",
+            },
+        )
+    return _client
+
+async def close_client() -> None:
+    """
+    Close the shared HTTP client, if open.
+    """
+    global _client
+
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """
+    Open the shared HTTP client with the server and close it on shutdown.
+
+    With the SSE transport the lifespan is entered per client session, so the
+    client is reference-counted and closed when the last session ends.
+    """
+    global _client_users
+
+    _client_users += 1
+    get_client()
+    try:
+        yield {}
+    finally:
+        _client_users -= 1
+        if _client_users == 0:
+            await close_client()
+            logger.info("Closed shared Hashnode HTTP client.")
+
 # Initialize MCP server
-mcp = FastMCP("Hashnode_Server")
+mcp = FastMCP("Hashnode_Server", lifespan=lifespan)
+
+def _cache_key(query: str, variables: Optional[dict]) -> str:
+    return query + json.dumps(variables, sort_keys=True)
+
+def _cache_get(key: str) -> Optional[dict]:
+    entry = _response_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, data = entry
+    if time.monotonic() >= expires_at:
+        del _response_cache[key]
+        return None
+    _response_cache.move_to_end(key)
+    return data
+
+def _cache_put(key: str, data: dict) -> None:
+    _response_cache[key] = (time.monotonic() + HASHNODE_CACHE_TTL, data)
+    _response_cache.move_to_end(key)
+    while len(_response_cache) > HASHNODE_CACHE_MAX_ENTRIES:
+        _response_cache.popitem(last=False)
+
+def _backoff(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    """
+    Delay before the next attempt: `Retry-After` if sent, else full-jitter exponential backoff.
+    """
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), HASHNODE_BACKOFF_MAX)
+        except ValueError:
+            pass
+    return random.uniform(0, min(HASHNODE_BACKOFF_MAX, HASHNODE_BACKOFF_BASE * 2 ** attempt))
 
 async def fetch_from_api(query: str, variables: dict = None) -> dict:
     """
     Execute a GraphQL request against the Hashnode API.
 
+    Requests go through the shared keep-alive client. Rate-limited (429) and
+    server-error (5xx) responses are retried with jittered backoff, and
+    read-only query results are cached for `HASHNODE_CACHE_TTL` seconds.
+    Any successful mutation clears the cache.
+
     Parameters
     ----------
     query : str
@@ -51,30 +192,62 @@ async def fetch_from_api(query: str, variables: dict = None) -> dict:
     Raises
     ------
     httpx.HTTPStatusError
-        If the API returns a non-2xx status code.
+        If the API returns a non-2xx status code after all retries.
     """
-    headers = {
-        "Authorization": HASHNODE_TOKEN,
-        "Content-Type": "application/json",
-    }
-
-    # Use an async HTTP client to avoid blocking the event loop
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        # Send POST request with GraphQL query and optional variables
-        response = await client.post(
-            HASHNODE_API_URL,
-            json={"query": query, "variables": variables},
-            headers=headers,
-        )
+    read_only = query in READ_ONLY_QUERIES
+    cache_key = _cache_key(query, variables) if read_only and HASHNODE_CACHE_TTL > 0 else None
+
+    if cache_key:
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            logger.debug("Served Hashnode API response from cache")
+            return cached
+
+    retry_statuses = RETRY_STATUSES if read_only else MUTATION_RETRY_STATUSES
+    # Mutations are only retried when the connection was never established
+    retry_errors = httpx.TransportError if read_only else (httpx.ConnectError, httpx.ConnectTimeout)
+    client = get_client()
+
+    for attempt in range(HASHNODE_MAX_RETRIES + 1):
+        last_attempt = attempt == HASHNODE_MAX_RETRIES
+
+        try:
+            # Send POST request with GraphQL query and optional variables
+            response = await client.post(
+                HASHNODE_API_URL,
+                json={"query": query, "variables": variables},
+            )
+        except retry_errors as e:
+            if last_attempt:
+                raise
+            delay = _backoff(attempt)
+            logger.warning(f"Hashnode API request failed ({type(e).__name__}); retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+            continue
+
+        if response.status_code in retry_statuses and not last_attempt:
+            delay = _backoff(attempt, response)
+            logger.warning(f"Hashnode API returned {response.status_code}; retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+            continue
 
         # Raise an exception if the HTTP response is not 2xx
         response.raise_for_status()
+        break
+
+    # Log successful response receipt (without dumping payload)
+    logger.debug("Received successful response from Hashnode API")
+
+    data = response.json()
 
-        # Log successful response receipt (without dumping payload)
-        logger.debug("Received successful response from Hashnode API")
+    if cache_key and not data.get("errors"):
+        _cache_put(cache_key, data)
+    elif not read_only:
+        # Drafts / posts changed: cached reads may be stale
+        _response_cache.clear()
 
-        # Return parsed JSON body
-        return response.json()
+    # Return parsed JSON body
+    return data
 
 def format_section(title: str, content: str) -> str:
     """
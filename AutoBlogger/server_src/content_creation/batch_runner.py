@@ -0,0 +1,376 @@
+"""
+Batch blog generation.
+
+Runs many topics through `content_graph` from a JSON manifest:
+
+    [
+        {"title": "...", "hints": [...], "links": [...], "images": [...]},
+        ...
+    ]
+
+(a `{"jobs": [...]}` object is accepted too; each job may set its own `id`).
+
+Jobs are pulled from a queue by a bounded pool of async workers running in
+one process, so the LLM clients, the HTTP client and the extraction pool are
+shared by all jobs. Per-job state is persisted in a SQLite file next to the
+manifest's batch name, so an interrupted batch resumes where it stopped:
+finished jobs are skipped and jobs that were running are retried.
+
+At the end, throughput (posts/min), failures and per-stage latency are
+reported.
+
+Usage (from the AutoBlogger root):
+    python -m server_src.content_creation.batch_runner topics.json --workers 3
+"""
+
+from logging_config import get_logger
+logger = get_logger("ContentCreationServer")
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+import numpy as np
+from langchain_core.callbacks import AsyncCallbackHandler
+
+from server_src.content_creation.configs.configs import ConfigLoader
+from server_src.content_creation.graph.run_control import run_scope
+
+config_data = ConfigLoader()    # load config yaml file
+BATCH_MAX_WORKERS = config_data.get("BATCH_MAX_WORKERS", 3)
+BATCH_JOB_TIMEOUT = config_data.get("BATCH_JOB_TIMEOUT", 900)
+BATCH_STATE_DIR = config_data.get("BATCH_STATE_DIR", ".cache/batch")
+BATCH_OUTPUT_DIR = config_data.get("BATCH_OUTPUT_DIR", "markdowns/batch")
+
+PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+
+def load_manifest(path: str) -> List[Dict[str, Any]]:
+    """
+    Load and normalize batch jobs from a JSON manifest.
+
+    Args:
+        path (str): Manifest file path.
+
+    Returns:
+        List[dict]: Jobs with `id`, `title`, `hints`, `links` and `images`.
+    """
+    with open(path, "r") as f:
+        data = json.load(f)
+
+    entries = data.get("jobs", []) if isinstance(data, dict) else data
+
+    jobs, seen = [], set()
+    for entry in entries:
+        title = (entry.get("title") or "").strip()
+        if not title:
+            logger.warning(f"Skipping manifest entry without a title: {entry}")
+            continue
+
+        job = {
+            "title": title,
+            "hints": entry.get("hints", []),
+            "links": entry.get("links", []),
+            "images": entry.get("images", []),
+        }
+        # Stable id derived from the job content unless one is given
+        job["id"] = str(entry.get("id") or hashlib.sha256(json.dumps(job, sort_keys=True).encode("utf-8")).hexdigest()[:16])
+
+        if job["id"] in seen:
+            logger.warning(f"Skipping duplicate manifest entry: {job['id']}")
+            continue
+        seen.add(job["id"])
+        jobs.append(job)
+
+    return jobs
+
+class JobStore:
+    """
+    SQLite-backed per-job state of a batch, used to resume interrupted runs.
+
+    Attributes:
+        path (str): SQLite database file.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                spec TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                output_path TEXT,
+                error TEXT,
+                stage_latency TEXT,
+                started_at REAL,
+                finished_at REAL
+            )
+            """
+        )
+        self._db.commit()
+
+    def sync(self, jobs: List[Dict[str, Any]], retry_failed: bool = False) -> List[Dict[str, Any]]:
+        """
+        Register new jobs and return the ones still to run.
+
+        Jobs left `running` by a crashed batch are reset to `pending`;
+        failed jobs are retried only when `retry_failed` is set.
+        """
+        self._db.executemany(
+            "INSERT OR IGNORE INTO jobs (id, spec, status) VALUES (?, ?, ?)",
+            [(job["id"], json.dumps(job), PENDING) for job in jobs]
+        )
+        resumable = (RUNNING, FAILED) if retry_failed else (RUNNING,)
+        self._db.execute(
+            f"UPDATE jobs SET status = ? WHERE status IN ({','.join('?' * len(resumable))})",
+            (PENDING, *resumable)
+        )
+        self._db.commit()
+
+        ids = [job["id"] for job in jobs]
+        pending = {
+            row[0] for row in self._db.execute(
+                f"SELECT id FROM jobs WHERE status = ? AND id IN ({','.join('?' * len(ids))})",
+                (PENDING, *ids)
+            )
+        } if ids else set()
+
+        return [job for job in jobs if job["id"] in pending]
+
+    def mark_running(self, job_id: str) -> None:
+        self._db.execute(
+            "UPDATE jobs SET status = ?, attempts = attempts + 1, started_at = ?, error = NULL WHERE id = ?",
+            (RUNNING, time.time(), job_id)
+        )
+        self._db.commit()
+
+    def mark_finished(self, job_id: str, status: str, output_path: Optional[str] = None, error: Optional[str] = None, stage_latency: Optional[Dict[str, float]] = None) -> None:
+        self._db.execute(
+            "UPDATE jobs SET status = ?, output_path = ?, error = ?, stage_latency = ?, finished_at = ? WHERE id = ?",
+            (status, output_path, error, json.dumps(stage_latency or {}), time.time(), job_id)
+        )
+        self._db.commit()
+
+    def counts(self) -> Dict[str, int]:
+        return dict(self._db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    def close(self) -> None:
+        self._db.close()
+
+class StageTimer(AsyncCallbackHandler):
+    """
+    Callback handler recording the wall-clock latency of each graph node.
+
+    Attributes:
+        latency (dict): Seconds spent per node name (summed if a node runs more than once).
+    """
+    def __init__(self):
+        self.latency: Dict[str, float] = {}
+        self._open: Dict[UUID, tuple] = {}
+
+    async def on_chain_start(self, serialized, inputs, *, run_id: UUID, parent_run_id: Optional[UUID] = None, metadata: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        node = (metadata or {}).get("langgraph_node")
+        # Only the node's own run, not runnables nested inside it
+        if node and kwargs.get("name") == node and parent_run_id not in self._open:
+            self._open[run_id] = (node, time.perf_counter())
+
+    def _close(self, run_id: UUID) -> None:
+        opened = self._open.pop(run_id, None)
+        if opened:
+            node, start = opened
+            self.latency[node] = self.latency.get(node, 0.0) + time.perf_counter() - start
+
+    async def on_chain_end(self, outputs, *, run_id: UUID, **kwargs: Any) -> None:
+        self._close(run_id)
+
+    async def on_chain_error(self, error, *, run_id: UUID, **kwargs: Any) -> None:
+        self._close(run_id)
+
+def _output_path(output_dir: str, job: Dict[str, Any]) -> str:
+    slug = re.sub(r"[^a-z0-9]+", "-", job["title"].lower()).strip("-")[:60]
+    return os.path.join(output_dir, f"{slug or 'post'}-{job['id']}.md")
+
+async def _run_job(graph, job: Dict[str, Any], store: JobStore, output_dir: str, timeout: float) -> Dict[str, Any]:
+    """
+    Run one job through the graph and persist its outcome.
+    """
+    timer = StageTimer()
+    store.mark_running(job["id"])
+    start = time.perf_counter()
+
+    graph_input = {
+        "title": job["title"],
+        "user_hints": job["hints"],
+        "user_links": job["links"],
+        "images": [{"url": url, "source": "user"} for url in job["images"] if isinstance(url, str) and url.strip()],
+    }
+
+    status, output_path, error = FAILED, None, None
+    try:
+        with run_scope() as run_id:
+            result = await asyncio.wait_for(graph.ainvoke({**graph_input, "run_id": run_id}, config={"callbacks": [timer]}), timeout)
+
+        if result.get("content"):
+            output_path = _output_path(output_dir, job)
+            with open(output_path, "w", encoding="utf-8") as f:
+                f.write(result["content"])
+            status = DONE
+        else:
+            error = result.get("exit_reason") or "No content generated"
+
+    except asyncio.TimeoutError:
+        error = f"Timed out after {timeout}s"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+
+    store.mark_finished(job["id"], status, output_path, error, timer.latency)
+
+    elapsed = time.perf_counter() - start
+    if status == DONE:
+        logger.info(f"Batch job {job['id']} done in {elapsed:.1f}s: {output_path}")
+    else:
+        logger.error(f"Batch job {job['id']} failed after {elapsed:.1f}s: {error}")
+
+    return {"id": job["id"], "title": job["title"], "status": status, "error": error, "latency": timer.latency}
+
+async def run_batch(
+    jobs: List[Dict[str, Any]],
+    store: JobStore,
+    workers: int = BATCH_MAX_WORKERS,
+    output_dir: str = BATCH_OUTPUT_DIR,
+    timeout: float = BATCH_JOB_TIMEOUT,
+    retry_failed: bool = False,
+    graph=None,
+) -> Dict[str, Any]:
+    """
+    Run pending jobs with a bounded pool of async workers.
+
+    Args:
+        jobs (List[dict]): Jobs loaded from the manifest.
+        store (JobStore): Persistent job state.
+        workers (int): Number of jobs generated concurrently.
+        output_dir (str): Directory for generated Markdown posts.
+        timeout (float): Seconds allowed per job.
+        retry_failed (bool): Also rerun jobs that failed in a previous run.
+        graph: Compiled graph to run (defaults to `content_graph`).
+
+    Returns:
+        dict: Batch report (see `format_report`).
+    """
+    if graph is None:
+        from server_src.content_creation.graph.graph import content_graph
+        graph = content_graph
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    pending = store.sync(jobs, retry_failed=retry_failed)
+    logger.info(f"Batch: {len(jobs)} jobs in manifest, {len(pending)} to run with {workers} workers")
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for job in pending:
+        queue.put_nowait(job)
+
+    outcomes = []
+
+    async def worker():
+        while True:
+            try:
+                job = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            outcomes.append(await _run_job(graph, job, store, output_dir, timeout))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, min(workers, len(pending) or 1)))))
+    elapsed = time.perf_counter() - start
+
+    return {"elapsed": elapsed, "outcomes": outcomes, "totals": store.counts()}
+
+def format_report(report: Dict[str, Any]) -> str:
+    """
+    Summarize a batch run: throughput, failures and per-stage latency.
+    """
+    outcomes = report["outcomes"]
+    done = [o for o in outcomes if o["status"] == DONE]
+    failed = [o for o in outcomes if o["status"] == FAILED]
+    minutes = report["elapsed"] / 60
+
+    lines = [
+        f"Jobs run:      {len(outcomes)} ({len(done)} done, {len(failed)} failed) in {report['elapsed']:.1f}s",
+        f"Throughput:    {len(done) / minutes if minutes else 0.0:.2f} posts/min",
+        f"Batch totals:  {report['totals']}",
+    ]
+
+    stages: Dict[str, List[float]] = {}
+    for outcome in outcomes:
+        for node, seconds in outcome["latency"].items():
+            stages.setdefault(node, []).append(seconds)
+
+    if stages:
+        lines.append("Stage latency (s):   mean     p95     max")
+        for node, values in stages.items():
+            v = np.array(values)
+            lines.append(f"  {node:<18} {v.mean():6.2f}  {np.percentile(v, 95):6.2f}  {v.max():6.2f}")
+
+    if failed:
+        lines.append("Failures:")
+        lines.extend(f"  {o['id']} ({o['title']}): {o['error']}" for o in failed)
+
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate blog posts for every topic in a manifest")
+    parser.add_argument("manifest", help="JSON manifest of topics (title, hints, links, images)")
+    parser.add_argument("--workers", type=int, default=BATCH_MAX_WORKERS, help="jobs generated concurrently")
+    parser.add_argument("--output-dir", default=BATCH_OUTPUT_DIR, help="directory for generated Markdown posts")
+    parser.add_argument("--state", default=None, help="job state file (default: <BATCH_STATE_DIR>/<manifest name>.sqlite)")
+    parser.add_argument("--timeout", type=float, default=BATCH_JOB_TIMEOUT, help="seconds allowed per job")
+    parser.add_argument("--retry-failed", action="store_true", help="rerun jobs that failed in a previous run")
+    parser.add_argument("--profile", action="store_true", help="profile the graph runs (see graph_profiler.py); also on with GRAPH_PROFILING_ENABLED")
+    args = parser.parse_args()
+
+    from server_src.content_creation.graph.graph import content_graph
+    from server_src.content_creation.graph_profiler import GRAPH_PROFILING_ENABLED, profile_graph
+    from server_src.content_creation.link_fetcher import close_pools
+
+    graph, profiler = profile_graph(content_graph, enabled=args.profile or GRAPH_PROFILING_ENABLED)
+
+    state_path = args.state or os.path.join(
+        BATCH_STATE_DIR, f"{os.path.splitext(os.path.basename(args.manifest))[0]}.sqlite"
+    )
+    store = JobStore(state_path)
+
+    try:
+        report = asyncio.run(run_batch(
+            load_manifest(args.manifest),
+            store,
+            workers=args.workers,
+            output_dir=args.output_dir,
+            timeout=args.timeout,
+            retry_failed=args.retry_failed,
+            graph=graph,
+        ))
+        summary = format_report(report)
+        logger.info(f"Batch report:\n{summary}")
+        print(summary)
+
+        if profiler is not None:
+            profiler.save(prefix=os.path.splitext(os.path.basename(args.manifest))[0])
+            print(profiler.format_summary())
+    finally:
+        store.close()
+        close_pools()
+
+if __name__ == "__main__":
+    main()
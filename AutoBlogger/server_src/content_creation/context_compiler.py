@@ -0,0 +1,257 @@
+"""
+Token-budgeted context compilation for the content writer.
+
+Each source (user hints, extracted link contents, web search results) is
+split into chunks, near-duplicate chunks are removed with SimHash, the
+remaining chunks are ranked against the title with vectorized BM25, and
+chunks are packed into a token budget. Source priority is preserved:
+all hints are considered before any link chunk, and link chunks before
+any web result chunk.
+"""
+
+from logging_config import get_logger
+logger = get_logger("ContentCreationServer")
+
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from server_src.content_creation.configs.configs import ConfigLoader
+from server_src.content_creation.utils import count_tokens
+
+config_data = ConfigLoader()    # load config yaml file
+CONTEXT_TOKEN_BUDGET = config_data.get("CONTEXT_TOKEN_BUDGET", 6000)
+CONTEXT_CHUNK_TOKENS = config_data.get("CONTEXT_CHUNK_TOKENS", 300)
+CONTEXT_DEDUP_DISTANCE = config_data.get("CONTEXT_DEDUP_DISTANCE", 3)
+
+BLOCK_SEPARATOR = "\n\n---\n\n"
+_TOKEN_PATTERN = re.compile(r"\w+")
+_HEADER_PATTERN = re.compile(r"^\[[A-Z]+: .*\]$")
+
+@dataclass
+class Chunk:
+    """
+    A passage of one source block, with its ranking metadata.
+    """
+    section: str
+    block: int
+    position: int
+    header: str
+    text: str
+    tokens: int
+    score: float = 0.0
+
+def _words(text: str) -> List[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+def _split_header(block: str) -> Tuple[str, str]:
+    """
+    Separate leading `[SOURCE: ...]` / `[QUERY: ...]` tag lines from a block body.
+    """
+    lines = block.strip().split("\n")
+    header_lines = []
+    while lines and _HEADER_PATTERN.match(lines[0].strip()):
+        header_lines.append(lines.pop(0).strip())
+    return "\n".join(header_lines), "\n".join(lines).strip()
+
+def chunk_text(text: str, max_tokens: int = CONTEXT_CHUNK_TOKENS) -> List[str]:
+    """
+    Split text into chunks of roughly `max_tokens`, on paragraph boundaries where possible.
+
+    Args:
+        text (str): Text to split.
+        max_tokens (int): Target maximum tokens per chunk.
+
+    Returns:
+        List[str]: Chunks in original order.
+    """
+    chunks, current, current_tokens = [], [], 0
+
+    for paragraph in (p.strip() for p in re.split(r"\n\s*\n", text)):
+        if not paragraph:
+            continue
+
+        tokens = count_tokens(paragraph)
+
+        # Oversized paragraph: fall back to sentence-level splitting
+        if tokens > max_tokens:
+            pieces = re.split(r"(?<=[.!?])\s+", paragraph)
+        else:
+            pieces = [paragraph]
+
+        for piece in pieces:
+            piece_tokens = count_tokens(piece)
+            if current and current_tokens + piece_tokens > max_tokens:
+                chunks.append("\n\n".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += piece_tokens
+
+    if current:
+        chunks.append("\n\n".join(current))
+
+    return chunks
+
+def simhash(text: str) -> int:
+    """
+    Compute a 64-bit SimHash fingerprint over word 3-shingles.
+    """
+    words = _words(text)
+    shingles = [" ".join(words[i:i + 3]) for i in range(max(len(words) - 2, 1))]
+    if not shingles:
+        return 0
+
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little") for s in shingles],
+        dtype=np.uint64
+    )
+    bits = ((hashes[:, None] >> np.arange(64, dtype=np.uint64)) & np.uint64(1)).astype(np.int8)
+    votes = (bits * 2 - 1).sum(axis=0)
+
+    return int(sum(1 << i for i in range(64) if votes[i] > 0))
+
+def deduplicate(chunks: List[Chunk], max_distance: int = CONTEXT_DEDUP_DISTANCE) -> List[Chunk]:
+    """
+    Drop chunks whose SimHash is within `max_distance` bits of an earlier chunk.
+
+    Chunks are expected in priority order, so the higher-priority copy is kept.
+    """
+    kept, fingerprints = [], []
+
+    for chunk in chunks:
+        fingerprint = simhash(chunk.text)
+        if any(bin(fingerprint ^ f).count("1") <= max_distance for f in fingerprints):
+            continue
+        kept.append(chunk)
+        fingerprints.append(fingerprint)
+
+    return kept
+
+def bm25_scores(query: str, documents: List[str], k1: float = 1.5, b: float = 0.75) -> np.ndarray:
+    """
+    Score documents against a query with BM25, vectorized over all documents.
+
+    Args:
+        query (str): Query text (the post title).
+        documents (List[str]): Texts to score.
+
+    Returns:
+        np.ndarray: One BM25 score per document.
+    """
+    terms = list(dict.fromkeys(_words(query)))
+    if not documents or not terms:
+        return np.zeros(len(documents))
+
+    tokenized = [_words(d) for d in documents]
+    term_index = {t: j for j, t in enumerate(terms)}
+
+    # Term-frequency matrix restricted to query terms: (documents x terms)
+    tf = np.zeros((len(documents), len(terms)))
+    for i, words in enumerate(tokenized):
+        for w in words:
+            j = term_index.get(w)
+            if j is not None:
+                tf[i, j] += 1
+
+    lengths = np.array([len(w) for w in tokenized], dtype=float)
+    avg_length = lengths.mean() or 1.0
+
+    df = (tf > 0).sum(axis=0)
+    idf = np.log(1 + (len(documents) - df + 0.5) / (df + 0.5))
+
+    norm = k1 * (1 - b + b * lengths / avg_length)
+    return ((tf * (k1 + 1)) / (tf + norm[:, None]) * idf).sum(axis=1)
+
+def _chunk_section(section: str, blocks: List[str]) -> List[Chunk]:
+    chunks = []
+    for block_id, block in enumerate(blocks):
+        header, body = _split_header(block)
+        for position, text in enumerate(chunk_text(body)):
+            chunks.append(Chunk(section, block_id, position, header, text, count_tokens(text)))
+    return chunks
+
+def compile_budgeted_context(
+    title: str,
+    hints: Optional[List[str]],
+    link_contents: Optional[str],
+    web_results: Optional[str],
+    token_budget: int = CONTEXT_TOKEN_BUDGET,
+) -> Optional[str]:
+    """
+    Build the writer context within a token budget.
+
+    Args:
+        title (str): Post title used to rank chunks.
+        hints (List[str] | None): User hints (highest priority).
+        link_contents (str | None): Extracted link contents, blocks joined by `---`.
+        web_results (str | None): Web search results, blocks joined by `---`.
+        token_budget (int): Maximum tokens of chunk text to include.
+
+    Returns:
+        str | None: Compiled context, or None if no source has content.
+    """
+    sections: Dict[str, List[Chunk]] = {
+        "USER HINTS": [
+            Chunk("USER HINTS", i, 0, "", f"- {h}", count_tokens(f"- {h}"))
+            for i, h in enumerate(hints or [])
+        ],
+        "LINK CONTENTS": _chunk_section("LINK CONTENTS", link_contents.split(BLOCK_SEPARATOR)) if link_contents else [],
+        "WEB SEARCH RESULTS": _chunk_section("WEB SEARCH RESULTS", web_results.split(BLOCK_SEPARATOR)) if web_results else [],
+    }
+
+    total_chunks = sum(len(c) for c in sections.values())
+    if not total_chunks:
+        return None
+
+    total_tokens = sum(c.tokens for chunks in sections.values() for c in chunks)
+
+    # Deduplicate across sources in priority order (hints > links > web)
+    ordered = deduplicate([c for chunks in sections.values() for c in chunks])
+
+    scores = bm25_scores(title, [c.text for c in ordered])
+    for chunk, score in zip(ordered, scores):
+        chunk.score = float(score)
+
+    # Pack: tiers in priority order, most relevant chunk first within a tier
+    selected, used = [], 0
+    for section in sections:
+        tier = sorted((c for c in ordered if c.section == section), key=lambda c: -c.score)
+        for chunk in tier:
+            if used + chunk.tokens > token_budget:
+                continue
+            selected.append(chunk)
+            used += chunk.tokens
+
+    logger.info(
+        f"Context budget: {used}/{token_budget} tokens used, "
+        f"{len(selected)}/{total_chunks} chunks kept "
+        f"({total_chunks - len(ordered)} near-duplicates removed, {total_tokens} tokens before packing)"
+    )
+
+    # Render selected chunks grouped by section and source block, in original order
+    rendered = []
+    for section in sections:
+        chunks = sorted((c for c in selected if c.section == section), key=lambda c: (c.block, c.position))
+        if not chunks:
+            continue
+
+        if section == "USER HINTS":
+            body = "\n".join(c.text for c in chunks)
+        else:
+            blocks, current_block = [], None
+            for c in chunks:
+                if c.block != current_block:
+                    blocks.append((c.header, []))
+                    current_block = c.block
+                blocks[-1][1].append(c.text)
+            body = BLOCK_SEPARATOR.join(
+                (f"{header}\n" if header else "") + "\n\n".join(texts)
+                for header, texts in blocks
+            )
+
+        rendered.append(f"### {section}\n{body}")
+
+    return BLOCK_SEPARATOR.join(rendered) if rendered else None
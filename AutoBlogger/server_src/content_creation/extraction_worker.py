@@ -0,0 +1,29 @@
+"""
+CPU-bound page extraction executed inside worker processes.
+
+This module is intentionally lightweight (no logger, no LLM imports) because
+it is re-imported by every process in the extraction pool.
+"""
+
+from typing import Optional
+import trafilatura
+
+# Trafilatura options; also part of the page cache key
+EXTRACT_OPTIONS = {
+    "include_formatting": True,
+    "include_tables": True,
+    "include_comments": False,
+    "output_format": "markdown",
+}
+
+def extract_markdown(downloaded: bytes) -> Optional[str]:
+    """
+    Extract readable text as Markdown from a downloaded HTML page.
+
+    Args:
+        downloaded (bytes): Raw HTML body of the page.
+
+    Returns:
+        str | None: Extracted Markdown text, or None if nothing usable was found.
+    """
+    return trafilatura.extract(downloaded, **EXTRACT_OPTIONS)
@@ -1,6 +1,8 @@
 from pydantic import BaseModel, Field
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.output_parsers import StrOutputParser
 from server_src.content_creation.utils import initialize_llm
+from server_src.content_creation.llm_cache import cached_chain
 
 class BlogContent(BaseModel):
     """
@@ -93,3 +95,12 @@ content_prompt = ChatPromptTemplate.from_messages(
 # Final content writer chain
 # Combines prompt template with structured LLM
 content_writer = content_prompt | structured_llm
+
+# Serve repeated / near-identical requests from the local response cache
+content_writer = cached_chain(content_writer, content_prompt, BlogContent, name="content_writer")
+
+# Streaming variant: plain Markdown text so tokens can be emitted as they are generated.
+# Shares the cache namespace with `content_writer` (same name, prompt and schema),
+# so a post cached by either chain is served to both.
+content_writer_stream = content_prompt | llm | StrOutputParser() | (lambda text: BlogContent(content=text))
+content_writer_stream = cached_chain(content_writer_stream, content_prompt, BlogContent, name="content_writer")
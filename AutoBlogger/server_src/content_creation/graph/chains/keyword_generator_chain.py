@@ -2,6 +2,7 @@ from pydantic import BaseModel, Field
 from typing import List
 from langchain_core.prompts import ChatPromptTemplate
 from server_src.content_creation.utils import initialize_llm
+from server_src.content_creation.llm_cache import cached_chain
 
 class KeywordList(BaseModel):
     """
@@ -56,3 +57,6 @@ keyword_prompt = ChatPromptTemplate.from_messages(
 
 # Final keyword generation chain
 keyword_generator = keyword_prompt | structured_llm
+
+# Serve repeated / near-identical requests from the local response cache
+keyword_generator = cached_chain(keyword_generator, keyword_prompt, KeywordList, name="keyword_generator")
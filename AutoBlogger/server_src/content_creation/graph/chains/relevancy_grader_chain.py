@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from server_src.content_creation.utils import initialize_llm
+from server_src.content_creation.llm_cache import cached_chain
 from langchain_core.prompts import ChatPromptTemplate
 
 class RelevanceGrade(BaseModel):
@@ -60,3 +61,6 @@ relevance_prompt = ChatPromptTemplate.from_messages(
 
 # Final relevance grading chain
 relevance_grader = relevance_prompt | structured_llm
+
+# Serve repeated / near-identical requests from the local response cache
+relevance_grader = cached_chain(relevance_grader, relevance_prompt, RelevanceGrade, name="relevance_grader")
@@ -5,7 +5,8 @@ Defines and compiles the LangGraph workflow for automated content creation.
 
 This graph orchestrates the full pipeline:
 - Hint and link extraction
-- Validation steps with conditional routing
+- Hint validation and link extraction/validation as parallel branches,
+  joined before keyword generation, with conditional early exit
 - Keyword generation and web search
 - Context compilation
 - Final content writing
@@ -18,6 +19,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from langgraph.graph import START, END, StateGraph
+from langchain_core.runnables import RunnableLambda
 from server_src.content_creation.graph.state import ContentState
 from server_src.content_creation.graph.nodes import *
 
@@ -30,35 +32,30 @@ graph.add_node("fetch_hints_links", fetch_hints_links)
 graph.add_node("validate_hints", validate_title_vs_hints)
 graph.add_node("extract_links_content", extract_links_content)
 graph.add_node("validate_links", validate_title_vs_links)
+graph.add_node("join_validations", join_validations)
 graph.add_node("gen_keywords", generate_keywords)
-graph.add_node("web_search", web_search)
+# Sync `invoke` searches keywords sequentially; `ainvoke` fans them out concurrently
+graph.add_node("web_search", RunnableLambda(web_search, afunc=aweb_search, name="web_search"))
 graph.add_node("compile_context", compile_context)
-graph.add_node("write_content", write_content)
+# `ainvoke` / `astream` can stream the post token by token (see `awrite_content`)
+graph.add_node("write_content", RunnableLambda(write_content, afunc=awrite_content, name="write_content"))
 graph.add_node("exit", exit_node)
 
-# Define linear execution flow
+# Fan out after loading inputs:
+# hint validation runs in parallel with link extraction + link validation
 graph.add_edge(START, "fetch_hints_links")
 graph.add_edge("fetch_hints_links", "validate_hints")
-
-# Conditional routing after hint validation
-# Either exit early or continue to link extraction
-graph.add_conditional_edges(
-    "validate_hints",
-    route_after_validate_hints,
-    {
-        "exit": "exit",
-        "extract_links_content": "extract_links_content",
-    }
-)
-
-# Continue flow with link extraction and validation
+graph.add_edge("fetch_hints_links", "extract_links_content")
 graph.add_edge("extract_links_content", "validate_links")
 
-# Conditional routing after link validation
-# Either exit early or proceed to keyword generation
+# Join both branches before deciding whether to continue
+graph.add_edge(["validate_hints", "validate_links"], "join_validations")
+
+# Conditional routing after both validations
+# Either exit early (hints or links irrelevant) or proceed to keyword generation
 graph.add_conditional_edges(
-    "validate_links",
-    route_after_validate_links,
+    "join_validations",
+    route_after_validations,
     {
         "exit": "exit",
         "gen_keywords": "gen_keywords",
@@ -3,10 +3,10 @@ from server_src.content_creation.graph.nodes.validate_title_vs_hints import vali
 from server_src.content_creation.graph.nodes.extract_links_content import extract_links_content
 from server_src.content_creation.graph.nodes.validate_title_vs_links import validate_title_vs_links
 from server_src.content_creation.graph.nodes.gen_keywords import generate_keywords
-from server_src.content_creation.graph.nodes.web_search import web_search
+from server_src.content_creation.graph.nodes.web_search import web_search, aweb_search
 from server_src.content_creation.graph.nodes.compile_context import compile_context
-from server_src.content_creation.graph.nodes.write_content import write_content
-from server_src.content_creation.graph.nodes.other_nodes import route_after_validate_hints, route_after_validate_links, exit_node
+from server_src.content_creation.graph.nodes.write_content import write_content, awrite_content
+from server_src.content_creation.graph.nodes.other_nodes import route_after_validate_hints, route_after_validate_links, join_validations, route_after_validations, exit_node
 
 __all__ = ['fetch_hints_links',
             'validate_title_vs_hints', 
@@ -14,9 +14,13 @@ __all__ = ['fetch_hints_links',
             'validate_title_vs_links',
             'generate_keywords',
             'web_search',
+            'aweb_search',
             'compile_context',
             'write_content',
+            'awrite_content',
             'route_after_validate_hints',
             'route_after_validate_links',
+            'join_validations',
+            'route_after_validations',
             'exit_node'
             ]
\ No newline at end of file
@@ -2,6 +2,7 @@ from logging_config import get_logger
 logger = get_logger("ContentCreationServer")
 
 from server_src.content_creation.graph.state import ContentState
+from server_src.content_creation.context_compiler import compile_budgeted_context
 
 def compile_context(state: ContentState):
     """
@@ -11,6 +12,11 @@ def compile_context(state: ContentState):
     search results into a single, well-structured context block. The
     resulting context is used as the primary input for content generation.
 
+    Sources are chunked, near-duplicate passages are dropped, and chunks
+    are ranked against the title and packed into the configured token
+    budget (see `context_compiler`), so the writer prompt stays bounded
+    on large inputs.
+
     Priority order:
     1. User-provided hints (highest priority)
     2. Extracted link contents
@@ -27,40 +33,27 @@ def compile_context(state: ContentState):
     """
     logger.info("--- COMPILE CONTEXT ---")
 
-    context_sections = []
-
-    # User hints (highest priority)
     if state.user_hints:
         logger.info(f"Compiling {len(state.user_hints)} user hints into context")
-        hints_block = "\n".join(f"- {h}" for h in state.user_hints)
-        context_sections.append(
-            "### USER HINTS\n" + hints_block
-        )
-
-    # Extracted link contents
     if state.link_contents:
         logger.info("Compiling extracted link contents into context")
-        context_sections.append(
-            "### LINK CONTENTS\n" + state.link_contents
-        )
-
-    # Tavily / web search results
     if state.tavily_results:
         logger.info("Compiling web search results into context")
-        context_sections.append(
-            "### WEB SEARCH RESULTS\n" + state.tavily_results
-        )
+
+    compiled_context = compile_budgeted_context(
+        title=state.title,
+        hints=state.user_hints,
+        link_contents=state.link_contents,
+        web_results=state.tavily_results,
+    )
 
     # Guard: no context available
-    if not context_sections:
+    if not compiled_context:
         logger.warning("No context sections available; exiting graph early")
         return {
             "exit_reason": "No context available to compile."
         }
 
-    # Join sections with clear visual separators
-    compiled_context = "\n\n---\n\n".join(context_sections)
-
     logger.info("Context compilation completed successfully")
 
     return {
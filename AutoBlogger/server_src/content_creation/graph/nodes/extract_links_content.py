@@ -2,8 +2,9 @@ from logging_config import get_logger
 logger = get_logger("ContentCreationServer")
 
 from server_src.content_creation.graph.state import ContentState
+from server_src.content_creation.link_fetcher import fetch_and_extract
+from server_src.content_creation.graph.run_control import cancel_run, get_cancel_event
 from typing import Dict
-import trafilatura
 
 def extract_links_content(state: ContentState) -> Dict:
     """
@@ -11,10 +12,17 @@ def extract_links_content(state: ContentState) -> Dict:
 
     This node downloads each URL supplied by the user and extracts
     high-quality, Markdown-formatted text using Trafilatura.
-    Extracted content is filtered to remove very short or low-signal pages.
+    Downloads run concurrently over a shared, keep-alive HTTP client and
+    extraction runs in a process pool (see `link_fetcher`); results keep
+    the input order. Extracted content is filtered to remove very short
+    or low-signal pages.
+
+    This node runs in parallel with hint validation; if the hints are
+    rejected meanwhile, outstanding downloads are abandoned.
 
     If no meaningful content can be extracted from any link, the graph
-    exits early with an appropriate reason.
+    exits early with an appropriate reason and hint validation is
+    signalled to stop.
 
     Args:
         state (ContentState): Current graph state containing user-provided links.
@@ -22,8 +30,9 @@ def extract_links_content(state: ContentState) -> Dict:
     Returns:
         dict:
             - {"link_contents": str} containing combined extracted content
-            - {"exit_reason": str} if extraction fails or yields no usable content
-            - {} if no user links were provided
+            - {"title_links_relevant": False, "exit_reason": str} if extraction
+              fails or yields no usable content
+            - {} if no user links were provided or the run was cancelled
     """
     logger.info("--- EXTRACT LINKS CONTENT ---")
 
@@ -36,42 +45,31 @@ def extract_links_content(state: ContentState) -> Dict:
 
     logger.info(f"Extracting content from {len(state.user_links)} links")
 
-    # Process each user-provided URL
-    for url in state.user_links:
-        try:
-            logger.info(f"Fetching URL: {url}")
-
-            downloaded = trafilatura.fetch_url(url)
-            if not downloaded:
-                logger.warning(f"Failed to download content from URL: {url}")
-                continue
-
-            # Extract readable text as Markdown
-            text = trafilatura.extract(
-                downloaded,
-                include_formatting=True,
-                include_tables=True,
-                include_comments=False,
-                output_format="markdown"
-            )
+    # Download and extract all user-provided URLs concurrently (input order preserved)
+    cancel_event = get_cancel_event(state.run_id)
+    texts = fetch_and_extract(state.user_links, cancel_event=cancel_event)
 
-            # Filter out low-quality or empty content
-            if text and len(text.strip()) > 100:
-                extracted_texts.append(
-                    f"[SOURCE: {url}]\n{text.strip()}"
-                )
-                logger.info(f"Successfully extracted content from: {url}")
-            else:
-                logger.info(f"Low-quality or empty extracted content from: {url}")
+    # Guard: hint validation failed while links were being fetched
+    if cancel_event is not None and cancel_event.is_set():
+        logger.info("Run cancelled by hint validation; discarding link contents")
+        return {}
 
-        except Exception as e:
-            # Catch and log extraction failures per URL
-            logger.exception(f"Error extracting content from {url}: {e}")
+    for url, text in zip(state.user_links, texts):
+        # Filter out low-quality or empty content
+        if text and len(text.strip()) > 100:
+            extracted_texts.append(
+                f"[SOURCE: {url}]\n{text.strip()}"
+            )
+            logger.info(f"Successfully extracted content from: {url}")
+        else:
+            logger.info(f"Low-quality or empty extracted content from: {url}")
 
     # Guard: no usable content extracted
     if not extracted_texts:
-        logger.warning("No meaningful content extracted from provided links")
+        logger.warning("No meaningful content extracted from provided links; cancelling hint branch")
+        cancel_run(state.run_id)
         return {
+            "title_links_relevant": False,
             "exit_reason": "Unable to extract meaningful content from provided links."
         }
 
@@ -1,5 +1,6 @@
 import json
 import os
+import uuid
 from logging_config import get_logger
 logger = get_logger("ContentCreationServer")
 from server_src.content_creation.graph.state import ContentState
@@ -15,6 +16,9 @@ def fetch_hints_links(state: ContentState):
     - reference links
     - image URLs (normalized into a standard structure)
 
+    If the run input already carries hints, links or images (e.g. a batch
+    job), those are used instead of the input file.
+
     If the file is missing or contains no usable content, the graph exits
     early with a descriptive reason.
 
@@ -29,28 +33,42 @@ def fetch_hints_links(state: ContentState):
     """
     logger.info("--- FETCH HINTS, LINKS, AND IMAGES ---")
 
-    # Resolve input file path from config
-    config_data = ConfigLoader()    # load config yaml file
-    input_file_path = config_data['INPUT_FILE_PATH']
-    INPUT_FILE = os.path.join(os.curdir, input_file_path) if input_file_path else None
+    # Identify this run so parallel branches can cancel each other
+    # (callers pass one from `run_scope`, which releases it however the run ends)
+    run_id = state.run_id or uuid.uuid4().hex
+
+    # Inputs passed with the run (batch jobs) take precedence over the input file
+    if any(v is not None for v in (state.user_hints, state.user_links, state.images)):
+        logger.info("Using hints, links, and images provided with the run input")
+        data = {
+            "hints": state.user_hints or [],
+            "links": state.user_links or [],
+            "images": [img.get("url") for img in state.images or []],
+        }
+    else:
+        # Resolve input file path from config
+        config_data = ConfigLoader()    # load config yaml file
+        input_file_path = config_data['INPUT_FILE_PATH']
+        INPUT_FILE = os.path.join(os.curdir, input_file_path) if input_file_path else None
 
-    # Guard: input file path not configured
-    if not INPUT_FILE:
-        logger.error("Input file path is invalid")
-        return {"exit_reason": "Input file path is invalid"}
+        # Guard: input file path not configured
+        if not INPUT_FILE:
+            logger.error("Input file path is invalid")
+            return {"run_id": run_id, "exit_reason": "Input file path is invalid"}
 
-    logger.info(f"Input file path: {INPUT_FILE}")
+        logger.info(f"Input file path: {INPUT_FILE}")
 
-    # Guard: input file does not exist
-    if not os.path.exists(INPUT_FILE):
-        logger.error(f"Input file not found: {INPUT_FILE}")
-        return {"exit_reason": f"Input file not found: {INPUT_FILE}"}
+        # Guard: input file does not exist
+        if not os.path.exists(INPUT_FILE):
+            logger.error(f"Input file not found: {INPUT_FILE}")
+            return {"run_id": run_id, "exit_reason": f"Input file not found: {INPUT_FILE}"}
 
-    # Load input JSON
-    with open(INPUT_FILE, "r") as f:
-        data = json.load(f)
+        # Load input JSON
+        with open(INPUT_FILE, "r") as f:
+            data = json.load(f)
 
     # Populate state fields
+    state.run_id = run_id
     state.user_hints = data.get("hints", [])
     state.user_links = data.get("links", [])
 
@@ -75,6 +93,6 @@ def fetch_hints_links(state: ContentState):
     # Guard: no usable content provided
     if not any([state.user_hints, state.user_links, state.images]):
         logger.warning("Input file contains no usable hints, links, or images")
-        return {"exit_reason": "Input file contains no usable content"}
+        return {"run_id": run_id, "exit_reason": "Input file contains no usable content"}
 
     return state
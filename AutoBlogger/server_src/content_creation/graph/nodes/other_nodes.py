@@ -2,20 +2,22 @@ from logging_config import get_logger
 
 logger = get_logger("ContentCreationServer")
 from server_src.content_creation.graph.state import ContentState
+from server_src.content_creation.graph.run_control import release_run
 
 def route_after_validate_hints(state: ContentState) -> str:
     """
     Determine the next graph node after title ↔ user hints validation.
 
     If the hints are deemed irrelevant to the title, the graph exits early.
-    Otherwise, execution continues to link content extraction.
+    Otherwise, execution continues to keyword generation (subject to the
+    link validation result, see `route_after_validations`).
 
     Args:
         state (ContentState): Current graph state containing the
                               title-hints relevance flag.
 
     Returns:
-        str: Name of the next node to execute ("exit" or "extract_links_content").
+        str: Name of the next node to execute ("exit" or "gen_keywords").
     """
     logger.info("--- ROUTING AFTER HINTS VALIDATION ---")
 
@@ -23,8 +25,8 @@ def route_after_validate_hints(state: ContentState) -> str:
         logger.warning("Title and user hints are not relevant; routing to exit")
         return "exit"
 
-    logger.info("Hints are relevant; continuing to link content extraction")
-    return "extract_links_content"
+    logger.info("Hints are relevant; continuing to keyword generation")
+    return "gen_keywords"
 
 def route_after_validate_links(state: ContentState) -> str:
     """
@@ -50,6 +52,43 @@ def route_after_validate_links(state: ContentState) -> str:
     logger.info("Link contents are relevant; continuing to keyword generation")
     return "gen_keywords"
 
+def join_validations(state: ContentState):
+    """
+    Join point of the parallel hint-validation and link-validation branches.
+
+    The node runs once both branches have finished. It performs no work
+    other than releasing the run's cancellation signal; routing is decided
+    by `route_after_validations`.
+
+    Args:
+        state (ContentState): Current graph state with both validation results.
+
+    Returns:
+        dict: Empty update.
+    """
+    logger.info("--- JOIN VALIDATIONS ---")
+
+    release_run(state.run_id)
+    return {}
+
+def route_after_validations(state: ContentState) -> str:
+    """
+    Determine the next graph node once both validation branches have joined.
+
+    Applies the early-exit rules of `route_after_validate_hints` first and
+    `route_after_validate_links` second, so a hint failure takes precedence.
+
+    Args:
+        state (ContentState): Current graph state containing both relevance flags.
+
+    Returns:
+        str: Name of the next node to execute ("exit" or "gen_keywords").
+    """
+    if route_after_validate_hints(state) == "exit":
+        return "exit"
+
+    return route_after_validate_links(state)
+
 def exit_node(state: ContentState):
     """
     Terminal node for early graph termination.
@@ -65,11 +104,14 @@ def exit_node(state: ContentState):
     Returns:
         dict:
             - content: None
-            - exit_reason: Explanation for termination
+            - exit_reason: Explanation for termination (a hint validation
+              failure takes precedence, as in `route_after_validations`)
     """
     logger.info("--- EXIT NODE ---")
 
+    release_run(state.run_id)
+
     return {
         "content": None,
-        "exit_reason": state.exit_reason or "Validation failed",
+        "exit_reason": state.hints_exit_reason or state.exit_reason or "Validation failed",
     }
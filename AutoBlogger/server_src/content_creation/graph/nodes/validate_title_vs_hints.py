@@ -3,6 +3,7 @@ from logging_config import get_logger
 logger = get_logger("ContentCreationServer")
 from server_src.content_creation.graph.state import ContentState
 from server_src.content_creation.graph.chains.relevancy_grader_chain import relevance_grader
+from server_src.content_creation.graph.run_control import cancel_run, is_cancelled
 
 def validate_title_vs_hints(state: ContentState):
     """
@@ -13,7 +14,10 @@ def validate_title_vs_hints(state: ContentState):
 
     Behavior:
     - If no hints are provided, the validation is skipped and treated as valid.
-    - If hints are provided and deemed irrelevant, the graph exits early.
+    - If the link branch already failed (run cancelled), the LLM call is
+      skipped, and a decision that arrives after the cancellation is discarded.
+    - If hints are provided and deemed irrelevant, the graph exits early and
+      the parallel link branch is signalled to stop its in-flight work.
     - If relevant, execution continues to the next node.
 
     Args:
@@ -23,7 +27,8 @@ def validate_title_vs_hints(state: ContentState):
     Returns:
         dict:
             - {"title_hints_relevant": True} if validation passes
-            - {"title_hints_relevant": False, "exit_reason": str} if validation fails
+            - {"title_hints_relevant": False, "hints_exit_reason": str} if validation fails
+            - {} if the link branch failed first
     """
     logger.info("--- VALIDATE TITLE VS HINTS ---")
 
@@ -32,6 +37,11 @@ def validate_title_vs_hints(state: ContentState):
         logger.info("No user hints provided; skipping relevance check")
         return {"title_hints_relevant": True}
 
+    # Guard: the run is exiting anyway; avoid a wasted LLM round trip
+    if is_cancelled(state.run_id):
+        logger.info("Run cancelled by link branch; skipping hint relevance check")
+        return {}
+
     # Combine hints into a single block for relevance grading
     combined_hints = "\n".join(f"- {h}" for h in state.user_hints)
 
@@ -48,12 +58,18 @@ def validate_title_vs_hints(state: ContentState):
         f"relevant={decision.relevant}, reason={decision.reason}"
     )
 
+    # Guard: the link branch failed while the grader was running
+    if is_cancelled(state.run_id):
+        logger.info("Run cancelled by link branch; discarding hint relevance decision")
+        return {}
+
     # Handle relevance decision
     if not decision.relevant:
-        logger.warning("User hints are not relevant to the title")
+        logger.warning("User hints are not relevant to the title; cancelling link branch")
+        cancel_run(state.run_id)
         return {
             "title_hints_relevant": False,
-            "exit_reason": decision.reason
+            "hints_exit_reason": decision.reason
         }
 
     logger.info("User hints are relevant to the title")
@@ -3,6 +3,7 @@ logger = get_logger("ContentCreationServer")
 
 from server_src.content_creation.graph.state import ContentState
 from server_src.content_creation.graph.chains.relevancy_grader_chain import relevance_grader
+from server_src.content_creation.graph.run_control import cancel_run
 
 def validate_title_vs_links(state: ContentState):
     """
@@ -13,8 +14,11 @@ def validate_title_vs_links(state: ContentState):
     relevance grader.
 
     Behavior:
+    - If hint validation (parallel branch) or link extraction already failed,
+      the LLM call is skipped.
     - If no link content is available, validation is skipped and treated as valid.
-    - If link content is present and deemed irrelevant, the graph exits early.
+    - If link content is present and deemed irrelevant, the graph exits early
+      and the hint branch is signalled to stop.
     - If relevant, execution continues to the next stage.
 
     Args:
@@ -25,9 +29,20 @@ def validate_title_vs_links(state: ContentState):
         dict:
             - {"title_links_relevant": True} if validation passes
             - {"title_links_relevant": False, "exit_reason": str} if validation fails
+            - {} if the hint branch or link extraction already failed
     """
     logger.info("--- VALIDATE TITLE VS LINKS ---")
 
+    # Guard: the run is exiting anyway; avoid a wasted LLM round trip
+    if state.title_hints_relevant is False:
+        logger.info("Hint validation failed; skipping link relevance check")
+        return {}
+
+    # Guard: link extraction already failed the run
+    if state.title_links_relevant is False:
+        logger.info("Link extraction failed; skipping link relevance check")
+        return {}
+
     # Guard: no link content extracted (links are optional)
     if not state.link_contents:
         logger.info("No link contents available; skipping relevance check")
@@ -48,7 +63,8 @@ def validate_title_vs_links(state: ContentState):
 
     # Handle relevance decision
     if not decision.relevant:
-        logger.warning("Extracted link contents are not relevant to the title")
+        logger.warning("Extracted link contents are not relevant to the title; cancelling hint branch")
+        cancel_run(state.run_id)
         return {
             "title_links_relevant": False,
             "exit_reason": decision.reason
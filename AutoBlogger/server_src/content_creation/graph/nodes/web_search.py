@@ -1,7 +1,9 @@
 from logging_config import get_logger
 logger = get_logger("ContentCreationServer")
 from server_src.content_creation.graph.state import ContentState
-from typing import Dict
+from server_src.content_creation.configs.configs import ConfigLoader
+from typing import Dict, List, Tuple
+import asyncio
 import warnings
 
 # Suppress known LangChain tool field shadowing warnings
@@ -19,6 +21,122 @@ web_search_tool = TavilySearch( # Tavily web search tool configuration
     include_image_descriptions=True,
 )
 
+# Fan-out settings for the async node
+config_data = ConfigLoader()    # load config yaml file
+WEB_SEARCH_MAX_CONCURRENCY = config_data.get("WEB_SEARCH_MAX_CONCURRENCY", 4)
+WEB_SEARCH_TIMEOUT = config_data.get("WEB_SEARCH_TIMEOUT", 20)
+
+def _parse_tavily_results(keyword: str, tavily_results: Dict) -> Tuple[List[str], List[Dict]]:
+    """
+    Normalize a raw Tavily response for a single keyword.
+
+    Args:
+        keyword (str): Search keyword the response belongs to.
+        tavily_results (dict): Raw response returned by the Tavily tool.
+
+    Returns:
+        tuple:
+            - List[str] of high-signal text blocks
+            - List[dict] of image entries with descriptions
+    """
+    text_blocks = []
+    images = []
+
+    # ---------------- TEXT RESULTS ----------------
+    for res in tavily_results.get("results", []):
+        title = res.get("title", "")
+        content = res.get("content", "")
+        url = res.get("url")
+
+        # Filter out low-signal text
+        if content and len(content.strip()) > 100:
+            block = f"{title}: {content}".strip()
+
+            if url:
+                text_blocks.append(
+                    f"[QUERY: {keyword}]\n[SOURCE: {url}]\n{block}"
+                )
+            else:
+                text_blocks.append(
+                    f"[QUERY: {keyword}]\n{block}"
+                )
+
+    # ---------------- IMAGE RESULTS ----------------
+    for img in tavily_results.get("images", []):
+        img_url = img.get("url")
+        img_desc = img.get("description")
+
+        if img_url:
+            images.append(
+                {
+                    "url": img_url,
+                    "description": img_desc.strip() if img_desc else "No Description",
+                    "query": keyword,
+                    "source": "tavily"
+                }
+            )
+
+    return text_blocks, images
+
+def _merge_search_results(state: ContentState, per_keyword: List[Tuple[List[str], List[Dict]]]) -> Dict:
+    """
+    Merge per-keyword search results into a graph state update.
+
+    Results are merged in keyword order, so the output is identical
+    regardless of the order in which the searches completed.
+
+    Args:
+        state (ContentState): Current graph state containing existing images.
+        per_keyword (list): Parsed (text_blocks, images) tuples, one per keyword.
+
+    Returns:
+        dict: State update as documented in `web_search`.
+    """
+    aggregated_results = []
+    images = []
+
+    for text_blocks, keyword_images in per_keyword:
+        aggregated_results.extend(text_blocks)
+        images.extend(keyword_images)
+
+    # Guard: no usable content retrieved
+    if not aggregated_results and not images:
+        logger.warning("No meaningful content retrieved from Tavily search")
+        return {
+            "exit_reason": "No meaningful content retrieved from Tavily search."
+        }
+
+    result: Dict = {}
+
+    # Attach aggregated text results
+    if aggregated_results:
+        result["tavily_results"] = "\n\n---\n\n".join(aggregated_results)
+
+    # Merge and deduplicate images
+    if images:
+        all_images = (state.images or []) + images
+
+        seen = set()
+        unique_images = []
+
+        for img in all_images:
+            url = img.get("url")
+            if not url:
+                continue
+            if url not in seen:
+                unique_images.append(img)
+                seen.add(url)
+
+        result["images"] = unique_images
+
+    logger.info(
+        f"Tavily search completed: "
+        f"{len(aggregated_results)} text blocks, "
+        f"{len(images)} images retrieved"
+    )
+
+    return result
+
 def web_search(state: ContentState) -> Dict:
     """
     Perform web search using Tavily based on generated search keywords.
@@ -51,8 +169,7 @@ def web_search(state: ContentState) -> Dict:
         logger.info("No search keywords provided; skipping web search")
         return {}
 
-    aggregated_results = []
-    images = []
+    per_keyword = []
 
     # Execute Tavily search per keyword
     for keyword in state.search_keywords:
@@ -62,78 +179,64 @@ def web_search(state: ContentState) -> Dict:
             tavily_results = web_search_tool.invoke(
                 {"query": keyword}
             )
-
-            # ---------------- TEXT RESULTS ----------------
-            for res in tavily_results.get("results", []):
-                title = res.get("title", "")
-                content = res.get("content", "")
-                url = res.get("url")
-
-                # Filter out low-signal text
-                if content and len(content.strip()) > 100:
-                    block = f"{title}: {content}".strip()
-
-                    if url:
-                        aggregated_results.append(
-                            f"[QUERY: {keyword}]\n[SOURCE: {url}]\n{block}"
-                        )
-                    else:
-                        aggregated_results.append(
-                            f"[QUERY: {keyword}]\n{block}"
-                        )
-
-            # ---------------- IMAGE RESULTS ----------------
-            for img in tavily_results.get("images", []):
-                img_url = img.get("url")
-                img_desc = img.get("description")
-
-                if img_url:
-                    images.append(
-                        {
-                            "url": img_url,
-                            "description": img_desc.strip() if img_desc else "No Description",
-                            "query": keyword,
-                            "source": "tavily"
-                        }
-                    )
+            per_keyword.append(_parse_tavily_results(keyword, tavily_results))
 
         except Exception as e:
             logger.exception(f"Tavily search error for keyword '{keyword}': {e}")
 
-    # Guard: no usable content retrieved
-    if not aggregated_results and not images:
-        logger.warning("No meaningful content retrieved from Tavily search")
-        return {
-            "exit_reason": "No meaningful content retrieved from Tavily search."
-        }
+    return _merge_search_results(state, per_keyword)
 
-    result: Dict = {}
+async def aweb_search(state: ContentState) -> Dict:
+    """
+    Async variant of `web_search` that fans keyword searches out concurrently.
 
-    # Attach aggregated text results
-    if aggregated_results:
-        result["tavily_results"] = "\n\n---\n\n".join(aggregated_results)
+    Searches run in parallel, bounded by `WEB_SEARCH_MAX_CONCURRENCY`, and
+    each keyword is given at most `WEB_SEARCH_TIMEOUT` seconds. A keyword
+    that times out or fails is logged and skipped, exactly like a failed
+    search in the sequential node. Results are merged in keyword order,
+    so the output is deterministic and matches `web_search`.
 
-    # Merge and deduplicate images
-    if images:
-        all_images = (state.images or []) + images
+    Args:
+        state (ContentState): Current graph state containing search keywords
+                              and optional existing images.
 
-        seen = set()
-        unique_images = []
+    Returns:
+        dict: Same state update as `web_search`.
+    """
+    logger.info("--- WEB SEARCH (TAVILY, ASYNC) ---")
 
-        for img in all_images:
-            url = img.get("url")
-            if not url:
-                continue
-            if url not in seen:
-                unique_images.append(img)
-                seen.add(url)
+    # Guard: no keywords available
+    if not state.search_keywords:
+        logger.info("No search keywords provided; skipping web search")
+        return {}
 
-        result["images"] = unique_images
+    semaphore = asyncio.Semaphore(WEB_SEARCH_MAX_CONCURRENCY)
 
-    logger.info(
-        f"Tavily search completed: "
-        f"{len(aggregated_results)} text blocks, "
-        f"{len(images)} images retrieved"
+    async def search_keyword(keyword: str):
+        async with semaphore:
+            try:
+                logger.info(f"Searching Tavily for keyword: {keyword}")
+
+                tavily_results = await asyncio.wait_for(
+                    web_search_tool.ainvoke({"query": keyword}),
+                    timeout=WEB_SEARCH_TIMEOUT
+                )
+                return _parse_tavily_results(keyword, tavily_results)
+
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"Tavily search timed out after {WEB_SEARCH_TIMEOUT}s for keyword '{keyword}'"
+                )
+            except Exception as e:
+                logger.exception(f"Tavily search error for keyword '{keyword}': {e}")
+
+            return None
+
+    # gather preserves input order, independent of completion order
+    results = await asyncio.gather(
+        *(search_keyword(keyword) for keyword in state.search_keywords)
     )
 
-    return result
+    per_keyword = [r for r in results if r is not None]
+
+    return _merge_search_results(state, per_keyword)
@@ -1,8 +1,31 @@
 from logging_config import get_logger
 logger = get_logger("ContentCreationServer")
 
+from typing import Optional
+from langchain_core.runnables import RunnableConfig
 from server_src.content_creation.graph.state import ContentState
-from server_src.content_creation.graph.chains.content_writer_chain import content_writer
+from server_src.content_creation.graph.chains.content_writer_chain import content_writer, content_writer_stream
+
+def _writer_inputs(state: ContentState) -> dict:
+    """
+    Build the content writer inputs, formatting images into a structured block.
+    """
+    images_block = ""
+    if state.images:
+        logger.info(f"Formatting {len(state.images)} images for content generation")
+        images_block = "\n".join(
+            f"- URL: {img.get('url', 'N/A')}\n"
+            f"  Description: {img.get('description', 'No description available')}"
+            for img in state.images
+        )
+    else:
+        logger.info("No images provided for content generation")
+
+    return {
+        "title": state.title,
+        "context": state.compiled_context,
+        "images": images_block
+    }
 
 def write_content(state: ContentState):
     """
@@ -22,28 +45,45 @@ def write_content(state: ContentState):
     """
     logger.info("--- WRITE CONTENT ---")
 
-    # Prepare images block for the model
-    images_block = ""
-    if state.images:
-        logger.info(f"Formatting {len(state.images)} images for content generation")
-        images_block = "\n".join(
-            f"- URL: {img.get('url', 'N/A')}\n"
-            f"  Description: {img.get('description', 'No description available')}"
-            for img in state.images
-        )
-    else:
-        logger.info("No images provided for content generation")
+    inputs = _writer_inputs(state)
 
     # Invoke content writer LLM
     logger.info("Invoking content writer model")
 
-    result = content_writer.invoke(
-        {
-            "title": state.title,
-            "context": state.compiled_context,
-            "images": images_block
-        }
-    )
+    result = content_writer.invoke(inputs)
+
+    logger.info("Content writing completed successfully")
+
+    return {
+        "content": result.content
+    }
+
+async def awrite_content(state: ContentState, config: Optional[RunnableConfig] = None):
+    """
+    Async variant of `write_content`.
+
+    When the run is configured with `{"configurable": {"stream_content": True}}`,
+    the post is generated as plain Markdown text so that LangGraph's
+    `messages` stream mode can emit tokens as they are produced.
+
+    Args:
+        state (ContentState): Current graph state containing the title,
+                              compiled context, and optional images.
+        config (RunnableConfig | None): Run configuration (carries the stream callbacks).
+
+    Returns:
+        dict:
+            - {"content": str} containing the generated Markdown content
+    """
+    logger.info("--- WRITE CONTENT ---")
+
+    inputs = _writer_inputs(state)
+    stream_content = bool((config or {}).get("configurable", {}).get("stream_content"))
+
+    logger.info(f"Invoking content writer model (streaming={stream_content})")
+
+    writer = content_writer_stream if stream_content else content_writer
+    result = await writer.ainvoke(inputs, config)
 
     logger.info("Content writing completed successfully")
 
@@ -0,0 +1,72 @@
+"""
+Per-run cancellation signals shared between parallel graph branches.
+
+Hint validation and link extraction run concurrently. When one branch
+fails validation, it signals the run's cancellation event so the other
+branch can stop in-flight work (downloads, LLM calls) instead of finishing
+work whose result will be discarded.
+"""
+
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+_lock = threading.Lock()
+_cancel_events: Dict[str, threading.Event] = {}
+
+def get_cancel_event(run_id: Optional[str]) -> Optional[threading.Event]:
+    """
+    Return the cancellation event of a run, creating it on first use.
+
+    Args:
+        run_id (str | None): Identifier of the graph run.
+
+    Returns:
+        threading.Event | None: The run's event, or None if no run id is known.
+    """
+    if not run_id:
+        return None
+
+    with _lock:
+        return _cancel_events.setdefault(run_id, threading.Event())
+
+def cancel_run(run_id: Optional[str]) -> None:
+    """
+    Signal all branches of a run to stop in-flight work.
+    """
+    event = get_cancel_event(run_id)
+    if event is not None:
+        event.set()
+
+def is_cancelled(run_id: Optional[str]) -> bool:
+    """
+    Return True if the run has been cancelled by another branch.
+    """
+    event = get_cancel_event(run_id)
+    return event is not None and event.is_set()
+
+def release_run(run_id: Optional[str]) -> None:
+    """
+    Forget a run's cancellation event once its branches have joined.
+    """
+    if not run_id:
+        return
+
+    with _lock:
+        _cancel_events.pop(run_id, None)
+
+@contextmanager
+def run_scope() -> Iterator[str]:
+    """
+    Create a run id for one graph invocation and release its cancellation
+    event when the invocation ends, also if it raises or times out before
+    reaching `join_validations` / `exit`.
+
+    Pass the id in the graph input (`{"run_id": run_id, ...}`).
+    """
+    run_id = uuid.uuid4().hex
+    try:
+        yield run_id
+    finally:
+        release_run(run_id)
@@ -1,6 +1,16 @@
-from typing import List, Dict, Optional
+from typing import Annotated, List, Dict, Optional
 from pydantic import BaseModel, Field
 
+def latest_reason(current: Optional[str], new: Optional[str]) -> Optional[str]:
+    """
+    Reducer for `exit_reason`: keep the most recent non-empty reason.
+
+    Written by the input and link-branch nodes; hint validation, which runs
+    in the same step as link extraction, reports through `hints_exit_reason`
+    instead, so one branch's reason never overwrites the other's.
+    """
+    return new if new else current
+
 class ContentState(BaseModel):
     """
     Central state container for the content creation LangGraph pipeline.
@@ -37,6 +47,14 @@ class ContentState(BaseModel):
         )
     )
 
+    run_id: Optional[str] = Field(
+        None,
+        description=(
+            "Identifier of the current graph run, used to cancel in-flight "
+            "work in parallel branches when one of them fails validation."
+        )
+    )
+
     # Validation flags and exit handling
     title_hints_relevant: Optional[bool] = Field(
         None,
@@ -54,7 +72,16 @@ class ContentState(BaseModel):
         )
     )
 
-    exit_reason: Optional[str] = Field(
+    hints_exit_reason: Optional[str] = Field(
+        None,
+        description=(
+            "Why hint validation failed. Kept apart from `exit_reason` "
+            "(link branch) so the hint failure, which routing gives "
+            "precedence, is the one reported."
+        )
+    )
+
+    exit_reason: Annotated[Optional[str], latest_reason] = Field(
         None,
         description=(
             "Human-readable explanation describing why the graph execution "
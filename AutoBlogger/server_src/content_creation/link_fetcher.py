@@ -0,0 +1,274 @@
+"""
+Parallel, connection-pooled download and extraction of reference links.
+
+Downloads go through a single shared `httpx.Client` (keep-alive, bounded
+pool, per-host concurrency limit) driven by a thread pool. Each finished
+download is immediately handed to a process pool that runs the CPU-heavy
+`trafilatura.extract` step, so fetching and extraction overlap. The whole
+stage is bounded by an overall deadline and results are returned in input order.
+
+When the page cache is enabled, fresh cached extractions skip the network
+entirely and stale ones are revalidated with a conditional request (and
+served as they are if revalidation fails).
+"""
+
+from logging_config import get_logger
+logger = get_logger("ContentCreationServer")
+
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from server_src.content_creation.configs.configs import ConfigLoader
+from server_src.content_creation.extraction_worker import EXTRACT_OPTIONS, extract_markdown
+from server_src.content_creation.page_cache import PageCache, get_page_cache
+
+config_data = ConfigLoader()    # load config yaml file
+LINK_FETCH_MAX_WORKERS = config_data.get("LINK_FETCH_MAX_WORKERS", 16)
+LINK_FETCH_PER_HOST_LIMIT = config_data.get("LINK_FETCH_PER_HOST_LIMIT", 4)
+LINK_FETCH_TIMEOUT = config_data.get("LINK_FETCH_TIMEOUT", 15)
+LINK_FETCH_DEADLINE = config_data.get("LINK_FETCH_DEADLINE", 60)
+LINK_EXTRACT_PROCESSES = config_data.get("LINK_EXTRACT_PROCESSES", os.cpu_count() or 2)
+PAGE_CACHE_ENABLED = config_data.get("PAGE_CACHE_ENABLED", True)
+
+USER_AGENT = os.getenv("USER_AGENT", "agentic-ai/1.0")
+
+_lock = threading.Lock()
+_http_client: Optional[httpx.Client] = None
+_extract_pool: Optional[ProcessPoolExecutor] = None
+_host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+
+def get_http_client() -> httpx.Client:
+    """
+    Return the process-wide shared HTTP client, creating it on first use.
+
+    The client keeps connections alive across calls and graph runs, so
+    repeated requests to the same host reuse the TCP/TLS connection.
+
+    Returns:
+        httpx.Client: Shared, thread-safe HTTP client.
+    """
+    global _http_client
+
+    with _lock:
+        if _http_client is None:
+            _http_client = httpx.Client(
+                headers={"User-Agent": USER_AGENT},
+                follow_redirects=True,
+                timeout=LINK_FETCH_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=LINK_FETCH_MAX_WORKERS,
+                    max_keepalive_connections=LINK_FETCH_MAX_WORKERS,
+                ),
+            )
+        return _http_client
+
+def get_extract_pool() -> ProcessPoolExecutor:
+    """
+    Return the shared process pool used for Trafilatura extraction.
+
+    Returns:
+        ProcessPoolExecutor: Lazily created extraction pool.
+    """
+    global _extract_pool
+
+    with _lock:
+        if _extract_pool is None:
+            _extract_pool = ProcessPoolExecutor(max_workers=LINK_EXTRACT_PROCESSES)
+        return _extract_pool
+
+def close_pools() -> None:
+    """
+    Close the shared HTTP client and shut down the extraction pool.
+    """
+    global _http_client, _extract_pool
+
+    with _lock:
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
+        if _extract_pool is not None:
+            _extract_pool.shutdown(cancel_futures=True)
+            _extract_pool = None
+
+def _host_semaphore(url: str) -> threading.BoundedSemaphore:
+    """
+    Return the semaphore limiting concurrent requests to the URL's host.
+    """
+    host = urlparse(url).netloc.lower()
+
+    with _lock:
+        if host not in _host_semaphores:
+            _host_semaphores[host] = threading.BoundedSemaphore(LINK_FETCH_PER_HOST_LIMIT)
+        return _host_semaphores[host]
+
+def fetch_url(url: str, deadline: float, headers: Optional[Dict[str, str]] = None, cancel_event: Optional[threading.Event] = None) -> Optional[httpx.Response]:
+    """
+    Download a single URL through the shared client.
+
+    Args:
+        url (str): URL to download.
+        deadline (float): `time.monotonic()` value after which the stage gives up.
+        headers (dict, optional): Extra request headers (e.g. cache validators).
+        cancel_event (threading.Event, optional): Skips the download once set.
+
+    Returns:
+        httpx.Response | None: A 200 or 304 response, or None if the download failed.
+    """
+    with _host_semaphore(url):
+        if cancel_event is not None and cancel_event.is_set():
+            return None
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            logger.warning(f"Fetch deadline reached before downloading: {url}")
+            return None
+
+        logger.info(f"Fetching URL: {url}")
+        response = get_http_client().get(url, headers=headers, timeout=min(LINK_FETCH_TIMEOUT, remaining))
+
+        if response.status_code not in (200, 304):
+            logger.warning(f"Failed to download content from URL: {url} (HTTP {response.status_code})")
+            return None
+
+        return response
+
+def _extract(downloaded: bytes) -> Future:
+    """
+    Submit an extraction job, falling back to in-process extraction if the pool is unusable.
+    """
+    try:
+        return get_extract_pool().submit(extract_markdown, downloaded)
+    except (BrokenProcessPool, RuntimeError) as e:
+        logger.warning(f"Extraction pool unavailable ({e}); extracting in-process")
+        future = Future()
+        try:
+            future.set_result(extract_markdown(downloaded))
+        except Exception as exc:
+            future.set_exception(exc)
+        return future
+
+def fetch_and_extract(urls: List[str], cancel_event: Optional[threading.Event] = None) -> List[Optional[str]]:
+    """
+    Download and extract every URL concurrently, preserving input order.
+
+    Args:
+        urls (List[str]): URLs to process.
+        cancel_event (threading.Event, optional): When set (e.g. by a parallel
+            graph branch), pending downloads and extractions are abandoned.
+
+    Returns:
+        List[str | None]: Extracted Markdown per URL (None on failure or timeout;
+                          stale cached content if revalidation failed),
+                          in the same order as `urls`.
+    """
+    deadline = time.monotonic() + LINK_FETCH_DEADLINE
+    results: List[Optional[str]] = [None] * len(urls)
+    extractions = {}
+    validators = {}
+
+    cache = get_page_cache() if PAGE_CACHE_ENABLED else None
+    cached = {}
+
+    # Serve fresh cache entries directly; keep stale ones for revalidation
+    if cache is not None:
+        for i, url in enumerate(urls):
+            entry = cache.get(url, EXTRACT_OPTIONS)
+            if entry is None:
+                continue
+            if entry.fresh:
+                logger.info(f"Page cache hit: {url}")
+                results[i] = entry.content
+            else:
+                cached[i] = entry
+
+    to_fetch = [i for i in range(len(urls)) if results[i] is None]
+
+    # Not used as a context manager: exiting it would block on downloads past the deadline
+    fetch_pool = ThreadPoolExecutor(max_workers=min(LINK_FETCH_MAX_WORKERS, max(len(to_fetch), 1)))
+
+    try:
+        downloads = {
+            fetch_pool.submit(fetch_url, urls[i], deadline, PageCache.conditional_headers(cached.get(i)), cancel_event): i
+            for i in to_fetch
+        }
+        pending = set(downloads)
+
+        # Hand each page to the extraction pool as soon as it arrives,
+        # waking up periodically to honour the deadline and cancellation
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(f"Link fetch deadline of {LINK_FETCH_DEADLINE}s reached; skipping unfinished downloads")
+                break
+            if cancel_event is not None and cancel_event.is_set():
+                logger.info("Link fetching cancelled; abandoning unfinished downloads")
+                break
+
+            done, pending = wait(pending, timeout=min(remaining, 0.25), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                i = downloads[future]
+                try:
+                    response = future.result()
+                except Exception as e:
+                    logger.exception(f"Error fetching content from {urls[i]}: {e}")
+                    continue
+
+                if response is None:
+                    continue
+
+                # Not modified since it was cached: reuse the cached extraction
+                if response.status_code == 304 and i in cached:
+                    logger.info(f"Page cache revalidated: {urls[i]}")
+                    cache.record_revalidated(urls[i], EXTRACT_OPTIONS)
+                    results[i] = cached[i].content
+                    continue
+
+                if response.content:
+                    validators[i] = (response.headers.get("ETag"), response.headers.get("Last-Modified"))
+                    extractions[i] = _extract(response.content)
+
+        # Wait for outstanding extractions within whatever time is left
+        while extractions and not (cancel_event is not None and cancel_event.is_set()):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            _, not_done = wait(extractions.values(), timeout=min(remaining, 0.25))
+            if not not_done:
+                break
+
+        for i, extraction in extractions.items():
+            if not extraction.done():
+                extraction.cancel()
+                logger.warning(f"Extraction abandoned (deadline or cancellation) for: {urls[i]}")
+                continue
+            try:
+                results[i] = extraction.result()
+            except Exception as e:
+                logger.exception(f"Error extracting content from {urls[i]}: {e}")
+                continue
+
+            if cache is not None and results[i]:
+                etag, last_modified = validators[i]
+                cache.put(urls[i], EXTRACT_OPTIONS, results[i], etag, last_modified)
+
+    finally:
+        fetch_pool.shutdown(wait=False, cancel_futures=True)
+
+    # Revalidation failed (error status, exception or deadline): stale content beats none
+    for i, entry in cached.items():
+        if results[i] is None:
+            logger.warning(f"Revalidation failed; serving stale cached content: {urls[i]}")
+            results[i] = entry.content
+
+    if cache is not None:
+        cache.log_stats()
+
+    return results
@@ -0,0 +1,276 @@
+"""
+Local response cache for the content creation LLM chains.
+
+Two lookup modes are supported:
+- exact:    key = hash(model, prompt template, inputs)
+- semantic: exact lookup first, then the closest cached input for the same
+            model and prompt by embedding cosine similarity, accepted above
+            a configurable threshold
+
+Entries live in a local SQLite file and are evicted least-recently-used
+once the entry limit is exceeded. Hit rate and estimated tokens saved are
+reported through the shared logger.
+"""
+
+from logging_config import get_logger
+logger = get_logger("ContentCreationServer")
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Any, Dict, List, Optional, Type
+
+import numpy as np
+from pydantic import BaseModel
+from langchain_core.runnables import Runnable, RunnableConfig
+
+from server_src.content_creation.configs.configs import ConfigLoader
+from server_src.content_creation.utils import count_tokens
+
+config_data = ConfigLoader()    # load config yaml file
+LLM_CACHE_ENABLED = config_data.get("LLM_CACHE_ENABLED", True)
+LLM_CACHE_MODE = config_data.get("LLM_CACHE_MODE", "exact")
+LLM_CACHE_PATH = config_data.get("LLM_CACHE_PATH", ".cache/llm_cache.sqlite")
+LLM_CACHE_MAX_ENTRIES = config_data.get("LLM_CACHE_MAX_ENTRIES", 5000)
+LLM_CACHE_SIMILARITY_THRESHOLD = config_data.get("LLM_CACHE_SIMILARITY_THRESHOLD", 0.97)
+LLM_CACHE_EMBEDDING_MODEL = config_data.get("LLM_CACHE_EMBEDDING_MODEL", "nomic-embed-text")
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+class LLMResponseCache:
+    """
+    SQLite-backed store of structured LLM responses.
+
+    Attributes:
+        path (str): SQLite database file.
+        max_entries (int): Entry limit enforced by LRU eviction.
+        stats (dict): Per-chain lookup / hit / tokens-saved counters for this process.
+    """
+    def __init__(self, path: str = LLM_CACHE_PATH, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                namespace TEXT NOT NULL,
+                response TEXT NOT NULL,
+                tokens INTEGER NOT NULL,
+                embedding BLOB,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_responses_namespace ON responses(namespace)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access)")
+        self._db.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached response for an exact key, if any.
+        """
+        with self._lock:
+            row = self._db.execute("SELECT response, tokens FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+        return {"response": json.loads(row[0]), "tokens": row[1]}
+
+    def get_similar(self, namespace: str, embedding: List[float], threshold: float) -> Optional[Dict[str, Any]]:
+        """
+        Return the most similar cached response within a namespace, if above `threshold`.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, response, tokens, embedding FROM responses WHERE namespace = ? AND embedding IS NOT NULL",
+                (namespace,)
+            ).fetchall()
+
+        query = np.asarray(embedding, dtype=np.float32)
+        # Rows embedded with another model (different dimension) can't match
+        rows = [row for row in rows if len(row[3]) == query.nbytes]
+        if not rows:
+            return None
+
+        # Cosine similarity of the query against every cached embedding at once
+        matrix = np.frombuffer(b"".join(row[3] for row in rows), dtype=np.float32).reshape(len(rows), -1)
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+        scores = np.divide(matrix @ query, norms, out=np.zeros(len(rows), dtype=np.float32), where=norms > 0)
+
+        best = int(np.argmax(scores))
+        best_score = float(scores[best])
+        if best_score < threshold:
+            return None
+        best_key, best_row = rows[best][0], rows[best][1:3]
+
+        with self._lock:
+            self._db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), best_key))
+            self._db.commit()
+
+        return {"response": json.loads(best_row[0]), "tokens": best_row[1], "similarity": best_score}
+
+    def put(self, key: str, namespace: str, response: Dict[str, Any], tokens: int, embedding: Optional[List[float]] = None) -> None:
+        """
+        Store a response and evict the least recently used entries above `max_entries`.
+        """
+        blob = array("f", embedding).tobytes() if embedding is not None else None
+        now = time.time()
+
+        with self._lock:
+            self._db.execute(
+                """
+                INSERT OR REPLACE INTO responses (key, namespace, response, tokens, embedding, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, namespace, json.dumps(response), tokens, blob, now, now)
+            )
+            self._db.execute(
+                """
+                DELETE FROM responses WHERE key IN (
+                    SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,)
+            )
+            self._db.commit()
+
+    def record(self, name: str, hit: bool, tokens: int = 0) -> None:
+        """
+        Update and log the hit-rate / tokens-saved counters for a chain.
+        """
+        with self._lock:
+            stats = self.stats.setdefault(name, {"lookups": 0, "hits": 0, "tokens_saved": 0})
+            stats["lookups"] += 1
+            if hit:
+                stats["hits"] += 1
+                stats["tokens_saved"] += tokens
+
+        logger.info(
+            f"LLM cache [{name}] {'hit' if hit else 'miss'}: "
+            f"hit_rate={stats['hits'] / stats['lookups']:.0%} "
+            f"({stats['hits']}/{stats['lookups']}), tokens_saved={stats['tokens_saved']}"
+        )
+
+class CachedChain(Runnable):
+    """
+    Runnable wrapper that serves `prompt | structured_llm` chains from the response cache.
+
+    Attributes:
+        chain (Runnable): Underlying chain to call on a cache miss.
+        prompt: Prompt template of the chain (part of the cache key, used for token estimates).
+        schema (Type[BaseModel]): Structured output schema used to rebuild cached responses.
+        name (str): Chain name used in logs and as part of the namespace.
+    """
+    def __init__(self, chain: Runnable, prompt, schema: Type[BaseModel], name: str, cache: LLMResponseCache, mode: str = LLM_CACHE_MODE):
+        self.chain = chain
+        self.prompt = prompt
+        self.schema = schema
+        self.name = name
+        self.cache = cache
+        self.mode = mode
+        self._embeddings = None
+
+        model = f"{config_data['LLM_PROVIDER']}:{config_data['LLM_NAME']}"
+        self.namespace = _hash(json.dumps([name, model, prompt.pretty_repr()]))
+
+    def _key(self, inputs: Dict[str, Any]) -> str:
+        return _hash(self.namespace + json.dumps(inputs, sort_keys=True, default=str))
+
+    def _embed(self, inputs: Dict[str, Any]) -> Optional[List[float]]:
+        """
+        Embed the chain inputs for semantic lookup (None when exact mode or embedding fails).
+        """
+        if self.mode != "semantic":
+            return None
+        try:
+            if self._embeddings is None:
+                from langchain_ollama import OllamaEmbeddings
+                self._embeddings = OllamaEmbeddings(model=LLM_CACHE_EMBEDDING_MODEL)
+            return self._embeddings.embed_query(json.dumps(inputs, sort_keys=True, default=str))
+        except Exception as e:
+            logger.warning(f"LLM cache [{self.name}] embedding failed, using exact mode only: {e}")
+            return None
+
+    def _lookup(self, inputs: Dict[str, Any]):
+        key = self._key(inputs)
+        cached = self.cache.get(key)
+
+        embedding = None
+        if cached is None:
+            embedding = self._embed(inputs)
+            if embedding is not None:
+                cached = self.cache.get_similar(self.namespace, embedding, LLM_CACHE_SIMILARITY_THRESHOLD)
+                if cached is not None:
+                    logger.info(f"LLM cache [{self.name}] semantic match (similarity={cached['similarity']:.3f})")
+
+        return key, embedding, cached
+
+    def _store(self, key: str, inputs: Dict[str, Any], embedding, result: BaseModel) -> None:
+        response = result.model_dump()
+        tokens = count_tokens(self.prompt.format(**inputs)) + count_tokens(json.dumps(response))
+        self.cache.put(key, self.namespace, response, tokens, embedding)
+
+    def invoke(self, input: Dict[str, Any], config: Optional[RunnableConfig] = None, **kwargs: Any) -> BaseModel:
+        key, embedding, cached = self._lookup(input)
+        if cached is not None:
+            self.cache.record(self.name, hit=True, tokens=cached["tokens"])
+            return self.schema.model_validate(cached["response"])
+
+        self.cache.record(self.name, hit=False)
+        result = self.chain.invoke(input, config, **kwargs)
+        self._store(key, input, embedding, result)
+        return result
+
+    async def ainvoke(self, input: Dict[str, Any], config: Optional[RunnableConfig] = None, **kwargs: Any) -> BaseModel:
+        # SQLite and the (semantic mode) embedding request block, so they run off the event loop
+        key, embedding, cached = await asyncio.to_thread(self._lookup, input)
+        if cached is not None:
+            self.cache.record(self.name, hit=True, tokens=cached["tokens"])
+            return self.schema.model_validate(cached["response"])
+
+        self.cache.record(self.name, hit=False)
+        result = await self.chain.ainvoke(input, config, **kwargs)
+        await asyncio.to_thread(self._store, key, input, embedding, result)
+        return result
+
+_llm_cache: Optional[LLMResponseCache] = None
+_llm_cache_lock = threading.Lock()
+
+def cached_chain(chain: Runnable, prompt, schema: Type[BaseModel], name: str) -> Runnable:
+    """
+    Wrap a chain with the shared response cache (no-op when `LLM_CACHE_ENABLED` is false).
+
+    Args:
+        chain (Runnable): `prompt | structured_llm` chain to wrap.
+        prompt: Prompt template used by the chain.
+        schema (Type[BaseModel]): Structured output schema of the chain.
+        name (str): Chain name used in logs.
+
+    Returns:
+        Runnable: Cached chain, or the original chain when caching is disabled.
+    """
+    global _llm_cache
+
+    if not LLM_CACHE_ENABLED:
+        return chain
+
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = LLMResponseCache()
+
+    return CachedChain(chain, prompt, schema, name, _llm_cache)
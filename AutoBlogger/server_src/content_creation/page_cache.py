@@ -0,0 +1,251 @@
+"""
+Persistent, content-addressed cache for fetched and extracted web pages.
+
+Entries are keyed by URL plus the extraction options used to produce them.
+Page bodies are stored once per content hash under `objects/`, and a small
+SQLite index tracks per-key metadata (ETag, Last-Modified, fetch and access
+times). Fresh entries are served directly, stale entries are revalidated
+with conditional requests, and the store is kept under a byte budget by
+evicting the least recently used entries.
+"""
+
+from logging_config import get_logger
+logger = get_logger("ContentCreationServer")
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from server_src.content_creation.configs.configs import ConfigLoader
+
+config_data = ConfigLoader()    # load config yaml file
+PAGE_CACHE_DIR = config_data.get("PAGE_CACHE_DIR", ".cache/pages")
+PAGE_CACHE_TTL = config_data.get("PAGE_CACHE_TTL", 24 * 60 * 60)
+PAGE_CACHE_MAX_BYTES = config_data.get("PAGE_CACHE_MAX_BYTES", 256 * 1024 * 1024)
+
+@dataclass
+class CacheEntry:
+    """
+    A cached page together with the validators needed to revalidate it.
+    """
+    content: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+    fresh: bool
+
+class PageCache:
+    """
+    On-disk LRU cache of page content keyed by (URL, extraction options).
+
+    Attributes:
+        cache_dir (str): Root directory of the cache.
+        ttl (float): Seconds an entry is served without revalidation.
+        max_bytes (int): Upper bound on the total size of stored page bodies.
+        stats (dict): Hit / stale / miss / revalidation / eviction counters for this process.
+    """
+    def __init__(self, cache_dir: str = PAGE_CACHE_DIR, ttl: float = PAGE_CACHE_TTL, max_bytes: int = PAGE_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "stale": 0, "misses": 0, "revalidated": 0, "evictions": 0}
+
+        self._objects_dir = os.path.join(cache_dir, "objects")
+        os.makedirs(self._objects_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(cache_dir, "index.sqlite"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_entries_access ON entries(last_access)")
+        self._db.commit()
+
+    @staticmethod
+    def make_key(url: str, options: Optional[Dict] = None) -> str:
+        """
+        Build the cache key for a URL and the options used to extract it.
+        """
+        payload = json.dumps({"url": url, "options": options or {}}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _object_path(self, content_hash: str) -> str:
+        return os.path.join(self._objects_dir, content_hash[:2], content_hash)
+
+    def get(self, url: str, options: Optional[Dict] = None) -> Optional[CacheEntry]:
+        """
+        Look up a cached page.
+
+        Stale entries are returned with `fresh=False` so the caller can
+        revalidate them using `conditional_headers`.
+
+        Returns:
+            CacheEntry | None: Cached entry, or None on a miss.
+        """
+        key = self.make_key(url, options)
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT content_hash, etag, last_modified, fetched_at FROM entries WHERE key = ?",
+                (key,)
+            ).fetchone()
+
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+
+            content_hash, etag, last_modified, fetched_at = row
+            try:
+                with open(self._object_path(content_hash), "r", encoding="utf-8") as f:
+                    content = f.read()
+            except FileNotFoundError:
+                # Index and objects out of sync; drop the entry
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._db.commit()
+                self.stats["misses"] += 1
+                return None
+
+            fresh = (time.time() - fetched_at) < self.ttl
+            self._db.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+
+            self.stats["hits" if fresh else "stale"] += 1
+
+        return CacheEntry(content, etag, last_modified, fetched_at, fresh)
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CacheEntry]) -> Dict[str, str]:
+        """
+        Build If-None-Match / If-Modified-Since headers for revalidating an entry.
+        """
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def record_revalidated(self, url: str, options: Optional[Dict] = None) -> None:
+        """
+        Mark a stale entry as fresh again after a 304 Not Modified response.
+        """
+        key = self.make_key(url, options)
+
+        with self._lock:
+            self._db.execute("UPDATE entries SET fetched_at = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+            self.stats["revalidated"] += 1
+
+    def put(self, url: str, options: Optional[Dict], content: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """
+        Store page content and its validators, then enforce the size budget.
+        """
+        key = self.make_key(url, options)
+        data = content.encode("utf-8")
+        content_hash = hashlib.sha256(data).hexdigest()
+        path = self._object_path(content_hash)
+
+        with self._lock:
+            # Content-addressed: identical bodies are written once
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+
+            previous = self._db.execute("SELECT content_hash FROM entries WHERE key = ?", (key,)).fetchone()
+
+            now = time.time()
+            self._db.execute(
+                """
+                INSERT OR REPLACE INTO entries (key, url, content_hash, size, etag, last_modified, fetched_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, url, content_hash, len(data), etag, last_modified, now, now)
+            )
+
+            if previous and previous[0] != content_hash:
+                self._release_object(previous[0])
+
+            self._evict()
+            self._db.commit()
+
+    def _release_object(self, content_hash: str) -> None:
+        """
+        Delete a page body once no entry references it.
+        """
+        refs = self._db.execute("SELECT COUNT(*) FROM entries WHERE content_hash = ?", (content_hash,)).fetchone()[0]
+        if refs == 0:
+            try:
+                os.remove(self._object_path(content_hash))
+            except FileNotFoundError:
+                pass
+
+    def _evict(self) -> None:
+        """
+        Evict least recently used entries until stored bodies fit in `max_bytes`.
+        """
+        total = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT content_hash, size FROM entries)"
+        ).fetchone()[0]
+
+        if total <= self.max_bytes:
+            return
+
+        for key, content_hash in self._db.execute(
+            "SELECT key, content_hash FROM entries ORDER BY last_access ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+
+            size = self._db.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()[0]
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            refs = self._db.execute("SELECT COUNT(*) FROM entries WHERE content_hash = ?", (content_hash,)).fetchone()[0]
+            if refs == 0:
+                self._release_object(content_hash)
+                total -= size
+
+            self.stats["evictions"] += 1
+            logger.info(f"Evicted page cache entry {key[:12]} (LRU)")
+
+    def log_stats(self) -> None:
+        """
+        Log the cache counters for this process.
+        """
+        logger.info(
+            f"Page cache stats: hits={self.stats['hits']}, stale={self.stats['stale']}, "
+            f"misses={self.stats['misses']}, revalidated={self.stats['revalidated']}, evictions={self.stats['evictions']}"
+        )
+
+_page_cache: Optional[PageCache] = None
+_page_cache_lock = threading.Lock()
+
+def get_page_cache() -> PageCache:
+    """
+    Return the process-wide page cache, creating it on first use.
+    """
+    global _page_cache
+
+    with _page_cache_lock:
+        if _page_cache is None:
+            _page_cache = PageCache()
+        return _page_cache
@@ -11,15 +11,24 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")
 
 # Import the LangGraph workflow and visualization utility
 from server_src.content_creation.graph.graph import content_graph
+from server_src.content_creation.graph_profiler import profile_graph
+from server_src.content_creation.graph.run_control import run_scope
 from server_src.content_creation.utils import draw_stylish_graph
 
 if __name__ == "__main__":
     # draw_stylish_graph(content_graph, output_name="content_graph")
 
+    # Profiled when GRAPH_PROFILING_ENABLED is set in the config yaml
+    graph, profiler = profile_graph(content_graph)
+
     # Invoke the content creation graph with input parameters
-    result = content_graph.invoke(
-        input={"title": "Artificial General Intelligence"}
-    )
+    with run_scope() as run_id:
+        result = graph.invoke(
+            input={"title": "Artificial General Intelligence", "run_id": run_id}
+        )
+
+    if profiler is not None:
+        profiler.save(prefix="content_graph")
 
     # Handle successful content generation
     if result.get("content"):
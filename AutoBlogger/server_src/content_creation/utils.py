@@ -147,3 +147,22 @@ def initialize_llm():
         raise ValueError(f"Unsupported LLM provider: {config_data['LLM_PROVIDER']} and / or name: {config_data['LLM_NAME']}")
 
     return llm
+
+def count_tokens(text: str) -> int:
+    """
+    Estimate the number of LLM tokens in a text.
+
+    Uses tiktoken's `cl100k_base` encoding when available and falls back
+    to a ~4 characters per token approximation otherwise.
+
+    Args:
+        text (str): Text to measure.
+
+    Returns:
+        int: Estimated token count.
+    """
+    try:
+        import tiktoken
+        return len(tiktoken.get_encoding("cl100k_base").encode(text))
+    except Exception:
+        return max(len(text) // 4, 1)
@@ -4,17 +4,27 @@ from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, AIMessageChunk, ToolMessage
 from dotenv import load_dotenv
 from langchain_community.tools.tavily_search import TavilySearchResults
-from fastapi import FastAPI, Query
-from fastapi.responses import StreamingResponse
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from langchain_core.callbacks import adispatch_custom_event
+from langchain_core.runnables import RunnableConfig
+import asyncio
 import json
+import os
+import sys
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from uuid import uuid4
-from langgraph.checkpoint.memory import MemorySaver
 
 load_dotenv()
 
-# Initialize memory saver for checkpointing
-memory = MemorySaver()
+from checkpointer import open_checkpoint_store
+from sse import encode_sse
+
+# The graph profiler lives in 13-debugging/
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "13-debugging")))
+from graph_profiler import profile_graph
 
 class State(TypedDict):
     messages: Annotated[list, add_messages]
@@ -43,34 +53,78 @@ async def tools_router(state: State):
     else: 
         return END
     
-async def tool_node(state):
+# Tool calls run concurrently; identical calls within a thread reuse the first result
+TOOL_TIMEOUT_SECONDS = float(os.getenv("TOOL_TIMEOUT_SECONDS", 20))
+TOOL_CACHE_SIZE = 512
+
+# (thread_id, tool name, args) -> tool output, least recently used first
+tool_results_cache: "OrderedDict[tuple, object]" = OrderedDict()
+
+def tool_cache_key(tool_call, thread_id):
+    return (thread_id, tool_call["name"], json.dumps(tool_call["args"], sort_keys=True))
+
+def forget_tool_results(thread_ids):
+    """Drops the cached tool results of threads deleted by the checkpoint pruner."""
+    pruned = set(thread_ids)
+    for cache_key in [key for key in tool_results_cache if key[0] in pruned]:
+        del tool_results_cache[cache_key]
+
+async def run_tool_call(tool_call, cache_key, config):
+    """Runs one search tool call with a timeout, using the thread's cached result if there is one."""
+    tool_name = tool_call["name"]
+
+    if cache_key in tool_results_cache:
+        tool_results_cache.move_to_end(cache_key)
+        search_results = tool_results_cache[cache_key]
+        # No tool run happens, so tell the stream the (cached) results directly
+        await adispatch_custom_event("tool_cache_hit", {"name": tool_name, "output": search_results}, config=config)
+        return search_results
+
+    try:
+        search_results = await asyncio.wait_for(search_tool.ainvoke(tool_call["args"]), TOOL_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        return f"Error: {tool_name} timed out after {TOOL_TIMEOUT_SECONDS:g}s"
+    except Exception as e:
+        return f"Error: {tool_name} failed: {e}"
+
+    # Tavily reports API errors as a string instead of raising; only cache real results (a list)
+    if not isinstance(search_results, list):
+        return search_results
+
+    tool_results_cache[cache_key] = search_results
+    while len(tool_results_cache) > TOOL_CACHE_SIZE:
+        tool_results_cache.popitem(last=False)
+
+    return search_results
+
+async def tool_node(state, config: RunnableConfig):
     """Custom tool node that handles tool calls from the LLM."""
-    # Get the tool calls from the last message
-    tool_calls = state["messages"][-1].tool_calls
-    
-    # Initialize list to store tool messages
-    tool_messages = []
-    
-    # Process each tool call
-    for tool_call in tool_calls:
-        tool_name = tool_call["name"]
-        tool_args = tool_call["args"]
-        tool_id = tool_call["id"]
-        
-        # Handle the search tool
-        if tool_name == "tavily_search_results_json":
-            # Execute the search tool with the provided arguments
-            search_results = await search_tool.ainvoke(tool_args)
-            
-            # Create a ToolMessage for this result
-            tool_message = ToolMessage(
-                content=str(search_results),
-                tool_call_id=tool_id,
-                name=tool_name
-            )
-            
-            tool_messages.append(tool_message)
-    
+    # Get the tool calls for the search tool from the last message
+    tool_calls = [
+        tool_call for tool_call in state["messages"][-1].tool_calls
+        if tool_call["name"] == "tavily_search_results_json"
+    ]
+    thread_id = config.get("configurable", {}).get("thread_id")
+
+    # Execute all searches at once (identical calls only once); a multi-search turn
+    # takes as long as its slowest call
+    cache_keys = [tool_cache_key(tool_call, thread_id) for tool_call in tool_calls]
+    searches = {}
+    for tool_call, cache_key in zip(tool_calls, cache_keys):
+        if cache_key not in searches:
+            searches[cache_key] = asyncio.ensure_future(run_tool_call(tool_call, cache_key, config))
+    results = await asyncio.gather(*(searches[cache_key] for cache_key in cache_keys))
+
+    # Create a ToolMessage per result, in the same order as the tool calls
+    tool_messages = [
+        ToolMessage(
+            content=str(search_results),
+            tool_call_id=tool_call["id"],
+            name=tool_call["name"]
+        )
+        for tool_call, search_results in zip(tool_calls, results)
+    ]
+
     # Add the tool messages to the state
     return {"messages": tool_messages}
 
@@ -83,9 +137,30 @@ graph_builder.set_entry_point("model")
 graph_builder.add_conditional_edges("model", tools_router)
 graph_builder.add_edge("tool_node", "model")
 
-graph = graph_builder.compile(checkpointer=memory)
+# Compiled in lifespan, once the checkpoint store (SQLite by default, see checkpointer.py) is open
+graph = None
+checkpoints = None
+# Set when GRAPH_PROFILING=1: per-node latency, tokens and state size of every chat turn
+profiler = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global graph, checkpoints, profiler
+
+    checkpoints = await open_checkpoint_store()
+    checkpoints.prune_listeners.append(forget_tool_results)
+    graph, profiler = profile_graph(graph_builder.compile(checkpointer=checkpoints.saver))
+    pruner = asyncio.create_task(checkpoints.run_pruning())
 
-app = FastAPI()
+    try:
+        yield
+    finally:
+        pruner.cancel()
+        await checkpoints.close()
+        if profiler is not None:
+            profiler.save(prefix="chat_api")
+
+app = FastAPI(lifespan=lifespan)
 
 # Add CORS middleware with settings that match frontend requirements
 app.add_middleware(
@@ -118,6 +193,8 @@ async def generate_chat_responses(message: str, checkpoint_id: Optional[str] = N
             }
         }
         
+        await checkpoints.touch(new_checkpoint_id)
+
         # Initialize with first message
         events = graph.astream_events(
             {"messages": [HumanMessage(content=message)]},
@@ -126,13 +203,15 @@ async def generate_chat_responses(message: str, checkpoint_id: Optional[str] = N
         )
         
         # First send the checkpoint ID
-        yield f"data: {{\"type\": \"checkpoint\", \"checkpoint_id\": \"{new_checkpoint_id}\"}}\n\n"
+        yield {"type": "checkpoint", "checkpoint_id": new_checkpoint_id}
     else:
         config = {
             "configurable": {
                 "thread_id": checkpoint_id
             }
         }
+        await checkpoints.touch(checkpoint_id)
+
         # Continue existing conversation
         events = graph.astream_events(
             {"messages": [HumanMessage(content=message)]},
@@ -140,52 +219,60 @@ async def generate_chat_responses(message: str, checkpoint_id: Optional[str] = N
             config=config
         )
 
-    async for event in events:
-        event_type = event["event"]
+    # Closing the stream (e.g. on client disconnect) stops the graph run
+    try:
+        async for event in events:
+            event_type = event["event"]
         
-        if event_type == "on_chat_model_stream":
-            chunk_content = serialise_ai_message_chunk(event["data"]["chunk"])
-            # Escape single quotes and newlines for safe JSON parsing
-            safe_content = chunk_content.replace("'", "\\'").replace("\n", "\\n")
-            
-            yield f"data: {{\"type\": \"content\", \"content\": \"{safe_content}\"}}\n\n"
+            if event_type == "on_chat_model_stream":
+                chunk_content = serialise_ai_message_chunk(event["data"]["chunk"])
+                # Tiny chunks are coalesced into larger frames by encode_sse
+                yield {"type": "content", "content": chunk_content}
             
-        elif event_type == "on_chat_model_end":
-            # Check if there are tool calls for search
-            tool_calls = event["data"]["output"].tool_calls if hasattr(event["data"]["output"], "tool_calls") else []
-            search_calls = [call for call in tool_calls if call["name"] == "tavily_search_results_json"]
+            elif event_type == "on_chat_model_end":
+                # Check if there are tool calls for search
+                tool_calls = event["data"]["output"].tool_calls if hasattr(event["data"]["output"], "tool_calls") else []
+                search_calls = [call for call in tool_calls if call["name"] == "tavily_search_results_json"]
             
-            if search_calls:
-                # Signal that a search is starting
-                search_query = search_calls[0]["args"].get("query", "")
-                # Escape quotes and special characters
-                safe_query = search_query.replace('"', '\\"').replace("'", "\\'").replace("\n", "\\n")
-                yield f"data: {{\"type\": \"search_start\", \"query\": \"{safe_query}\"}}\n\n"
+                if search_calls:
+                    # Signal that a search is starting
+                    search_query = search_calls[0]["args"].get("query", "")
+                    yield {"type": "search_start", "query": search_query}
                 
-        elif event_type == "on_tool_end" and event["name"] == "tavily_search_results_json":
-            # Search completed - send results or error
-            output = event["data"]["output"]
+            elif (
+                (event_type == "on_tool_end" and event["name"] == "tavily_search_results_json")
+                or (event_type == "on_custom_event" and event["name"] == "tool_cache_hit")
+            ):
+                # Search completed (or was answered from the thread's cache) - send results or error
+                output = event["data"]["output"]
             
-            # Check if output is a list 
-            if isinstance(output, list):
-                # Extract URLs from list of search results
-                urls = []
-                for item in output:
-                    if isinstance(item, dict) and "url" in item:
-                        urls.append(item["url"])
+                # Check if output is a list 
+                if isinstance(output, list):
+                    # Extract URLs from list of search results
+                    urls = []
+                    for item in output:
+                        if isinstance(item, dict) and "url" in item:
+                            urls.append(item["url"])
                 
-                # Convert URLs to JSON and yield them
-                urls_json = json.dumps(urls)
-                yield f"data: {{\"type\": \"search_results\", \"urls\": {urls_json}}}\n\n"
-    
+                    yield {"type": "search_results", "urls": urls}
+    finally:
+        await events.aclose()
+
     # Send an end event
-    yield f"data: {{\"type\": \"end\"}}\n\n"
+    yield {"type": "end"}
 
 @app.get("/chat_stream/{message}")
-async def chat_stream(message: str, checkpoint_id: Optional[str] = Query(None)):
+async def chat_stream(message: str, request: Request, checkpoint_id: Optional[str] = Query(None)):
     return StreamingResponse(
-        generate_chat_responses(message, checkpoint_id), 
+        encode_sse(generate_chat_responses(message, checkpoint_id), request), 
         media_type="text/event-stream"
     )
 
+@app.get("/profile", response_class=PlainTextResponse)
+async def profile():
+    """Summary table of the profiled chat turns (GRAPH_PROFILING=1)."""
+    if profiler is None:
+        return "Profiling is disabled; start the server with GRAPH_PROFILING=1."
+    return profiler.format_summary()
+
 # SSE - server-sent events 
\ No newline at end of file
@@ -0,0 +1,187 @@
+"""
+Checkpointer backends for the chat API.
+
+`open_checkpoint_store()` returns a `CheckpointStore`: a LangGraph checkpointer
+(`store.saver`, passed to `graph_builder.compile`) plus a record of when each
+thread was last used, so idle conversations can be evicted:
+
+- threads idle for longer than `THREAD_TTL_SECONDS` are deleted,
+- beyond `MAX_THREADS`, the least recently used threads are deleted.
+
+Backends (`CHECKPOINTER_BACKEND` environment variable):
+
+- "sqlite" (default): `AsyncSqliteSaver` on a WAL-mode database file. WAL and a
+  busy timeout let several uvicorn workers share the file, and conversations
+  survive restarts:  uvicorn app:app --workers 4
+- "memory": process-local `MemorySaver`, for tests and single-worker runs.
+"""
+
+import asyncio
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, List
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import MemorySaver
+
+CHECKPOINTER_BACKEND = os.getenv("CHECKPOINTER_BACKEND", "sqlite")
+CHECKPOINT_DB_PATH = os.getenv("CHECKPOINT_DB_PATH", "checkpoints.sqlite")
+THREAD_TTL_SECONDS = float(os.getenv("THREAD_TTL_SECONDS", 24 * 60 * 60))
+MAX_THREADS = int(os.getenv("MAX_THREADS", 1000))
+PRUNE_INTERVAL_SECONDS = float(os.getenv("PRUNE_INTERVAL_SECONDS", 5 * 60))
+SQLITE_BUSY_TIMEOUT_MS = 5000
+
+class CheckpointStore(ABC):
+    """
+    A checkpointer plus last-use tracking for TTL / LRU eviction of idle threads.
+
+    Attributes:
+        saver (BaseCheckpointSaver): Checkpointer to compile the graph with.
+        ttl (float): Seconds a thread may stay idle before it is deleted.
+        max_threads (int): Most threads kept; older ones are deleted first.
+        prune_listeners (List[Callable]): Called with the ids of every batch of
+            deleted threads, to drop per-thread data kept elsewhere (caches).
+    """
+    def __init__(self, saver: BaseCheckpointSaver, ttl: float = THREAD_TTL_SECONDS, max_threads: int = MAX_THREADS):
+        self.saver = saver
+        self.ttl = ttl
+        self.max_threads = max_threads
+        self.prune_listeners: List[Callable[[List[str]], None]] = []
+
+    @abstractmethod
+    async def touch(self, thread_id: str) -> None:
+        """Record that `thread_id` is in use now."""
+
+    @abstractmethod
+    async def _evictable(self, now: float) -> List[str]:
+        """Threads to delete: idle longer than `ttl`, then the least recently used beyond `max_threads`."""
+
+    @abstractmethod
+    async def _forget(self, thread_ids: List[str]) -> None:
+        """Drop the usage records of deleted threads."""
+
+    async def prune(self) -> int:
+        """
+        Delete the checkpoints of expired and least recently used threads.
+
+        Returns:
+            int: Number of threads deleted.
+        """
+        thread_ids = await self._evictable(time.time())
+        for thread_id in thread_ids:
+            await self.saver.adelete_thread(thread_id)
+        await self._forget(thread_ids)
+
+        if thread_ids:
+            for listener in self.prune_listeners:
+                listener(thread_ids)
+            print(f"Checkpointer: pruned {len(thread_ids)} idle threads")
+        return len(thread_ids)
+
+    async def run_pruning(self, interval: float = PRUNE_INTERVAL_SECONDS) -> None:
+        """Prune every `interval` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.prune()
+            except Exception as e:
+                print(f"Checkpointer: pruning failed: {e}")
+
+    async def close(self) -> None:
+        pass
+
+class MemoryCheckpointStore(CheckpointStore):
+    """Process-local store backed by `MemorySaver`."""
+    def __init__(self, ttl: float = THREAD_TTL_SECONDS, max_threads: int = MAX_THREADS):
+        super().__init__(MemorySaver(), ttl, max_threads)
+        self._last_used: "OrderedDict[str, float]" = OrderedDict()
+
+    async def touch(self, thread_id: str) -> None:
+        self._last_used[thread_id] = time.time()
+        self._last_used.move_to_end(thread_id)
+
+    async def _evictable(self, now: float) -> List[str]:
+        # Oldest first, so everything before the newest `max_threads` goes, plus anything expired
+        overflow = max(0, len(self._last_used) - self.max_threads)
+        return [
+            thread_id for i, (thread_id, last_used) in enumerate(self._last_used.items())
+            if i < overflow or now - last_used > self.ttl
+        ]
+
+    async def _forget(self, thread_ids: List[str]) -> None:
+        for thread_id in thread_ids:
+            self._last_used.pop(thread_id, None)
+
+class SqliteCheckpointStore(CheckpointStore):
+    """
+    Store backed by `AsyncSqliteSaver` on a WAL-mode SQLite file shared by all workers.
+
+    Last use is kept in a `thread_activity` table next to the checkpoints,
+    so any worker can prune threads used by another.
+    """
+    def __init__(self, saver: BaseCheckpointSaver, ttl: float = THREAD_TTL_SECONDS, max_threads: int = MAX_THREADS):
+        super().__init__(saver, ttl, max_threads)
+        self.conn = saver.conn
+
+    @classmethod
+    async def open(cls, path: str = CHECKPOINT_DB_PATH, **kwargs) -> "SqliteCheckpointStore":
+        import aiosqlite
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+        conn = await aiosqlite.connect(path)
+        await conn.execute("PRAGMA journal_mode=WAL")
+        await conn.execute("PRAGMA synchronous=NORMAL")
+        await conn.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        await conn.execute(
+            "CREATE TABLE IF NOT EXISTS thread_activity (thread_id TEXT PRIMARY KEY, last_used REAL NOT NULL)"
+        )
+        await conn.commit()
+
+        saver = AsyncSqliteSaver(conn)
+        await saver.setup()
+        return cls(saver, **kwargs)
+
+    async def touch(self, thread_id: str) -> None:
+        async with self.saver.lock:
+            await self.conn.execute(
+                "INSERT INTO thread_activity (thread_id, last_used) VALUES (?, ?) "
+                "ON CONFLICT(thread_id) DO UPDATE SET last_used = excluded.last_used",
+                (thread_id, time.time())
+            )
+            await self.conn.commit()
+
+    async def _evictable(self, now: float) -> List[str]:
+        async with self.saver.lock:
+            async with self.conn.execute(
+                """
+                SELECT thread_id FROM thread_activity WHERE last_used < ?
+                UNION
+                SELECT thread_id FROM (
+                    SELECT thread_id FROM thread_activity ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (now - self.ttl, self.max_threads)
+            ) as cursor:
+                return [row[0] for row in await cursor.fetchall()]
+
+    async def _forget(self, thread_ids: List[str]) -> None:
+        if not thread_ids:
+            return
+        async with self.saver.lock:
+            await self.conn.executemany("DELETE FROM thread_activity WHERE thread_id = ?", [(t,) for t in thread_ids])
+            await self.conn.commit()
+
+    async def close(self) -> None:
+        await self.conn.close()
+
+async def open_checkpoint_store(backend: str = CHECKPOINTER_BACKEND) -> CheckpointStore:
+    """
+    Open the checkpoint store for `backend` ("sqlite" or "memory").
+    """
+    if backend == "memory":
+        return MemoryCheckpointStore()
+    if backend == "sqlite":
+        return await SqliteCheckpointStore.open()
+    raise ValueError(f"Unknown CHECKPOINTER_BACKEND: {backend!r} (expected 'sqlite' or 'memory')")
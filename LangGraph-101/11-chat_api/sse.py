@@ -0,0 +1,136 @@
+"""
+Server-sent events encoding for the chat API.
+
+`encode_sse(events, request)` turns an async iterator of event dicts into
+SSE frames (`data: <json>\\n\\n`, as bytes):
+
+- events are serialized with orjson when installed (stdlib json otherwise),
+- consecutive "content" events are coalesced into one frame, flushed after
+  `SSE_FLUSH_INTERVAL` seconds or `SSE_FLUSH_CHARS` characters, or before any
+  other event,
+- at most `SSE_QUEUE_SIZE` events are read ahead of the client (backpressure),
+- when the client disconnects, the event source (the graph run) is cancelled
+  instead of being left to finish generating for nobody.
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from fastapi import Request
+
+try:
+    import orjson
+
+    def dumps(event: Dict[str, Any]) -> bytes:
+        return orjson.dumps(event)
+except ImportError:
+    import json
+
+    def dumps(event: Dict[str, Any]) -> bytes:
+        return json.dumps(event, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+SSE_FLUSH_INTERVAL = float(os.getenv("SSE_FLUSH_INTERVAL", 0.05))
+SSE_FLUSH_CHARS = int(os.getenv("SSE_FLUSH_CHARS", 256))
+SSE_QUEUE_SIZE = 256    # events read ahead of a slow client before the graph run is paused
+
+_DONE = object()
+
+def sse_frame(event: Dict[str, Any]) -> bytes:
+    return b"data: " + dumps(event) + b"\n\n"
+
+async def _pump(events: AsyncIterator[Dict[str, Any]], queue: asyncio.Queue) -> None:
+    cancelled = False
+    try:
+        async for event in events:
+            await queue.put(event)
+    except asyncio.CancelledError:
+        # encode_sse has stopped reading: putting _DONE on a full queue would block forever
+        cancelled = True
+        raise
+    finally:
+        # Runs on cancellation too, closing the underlying graph stream
+        aclose = getattr(events, "aclose", None)
+        if aclose is not None:
+            await aclose()
+        if not cancelled:
+            await queue.put(_DONE)
+
+async def encode_sse(
+    events: AsyncIterator[Dict[str, Any]],
+    request: Optional[Request] = None,
+    flush_interval: float = SSE_FLUSH_INTERVAL,
+    flush_chars: int = SSE_FLUSH_CHARS,
+) -> AsyncIterator[bytes]:
+    """
+    Encode chat events as SSE frames, coalescing streamed content.
+
+    Args:
+        events: Event dicts with a "type" key; "content" events carry a "content" string.
+        request: Incoming request, polled for client disconnects.
+        flush_interval: Longest time (seconds) buffered content waits before it is sent.
+        flush_chars: Buffered content size that triggers an immediate send.
+
+    Yields:
+        bytes: One SSE frame per flushed event.
+    """
+    # Events are read by a separate task, so waiting for the next one can time out
+    # (to flush buffered content) without cancelling the source
+    queue: asyncio.Queue = asyncio.Queue(maxsize=SSE_QUEUE_SIZE)
+    pump = asyncio.create_task(_pump(events, queue))
+
+    buffer: List[str] = []
+    buffered_chars = 0
+    deadline = None
+
+    def flush() -> bytes:
+        nonlocal buffer, buffered_chars, deadline
+        frame = sse_frame({"type": "content", "content": "".join(buffer)})
+        buffer, buffered_chars, deadline = [], 0, None
+        return frame
+
+    try:
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                event = None
+
+            if request is not None and await request.is_disconnected():
+                print("Client disconnected, cancelling chat stream")
+                return
+
+            if event is None:
+                yield flush()
+                continue
+
+            if event is _DONE:
+                if buffer:
+                    yield flush()
+                # Surface errors from the event source
+                await pump
+                return
+
+            if event.get("type") == "content":
+                if not event["content"]:
+                    continue
+                buffer.append(event["content"])
+                buffered_chars += len(event["content"])
+                if deadline is None:
+                    deadline = time.monotonic() + flush_interval
+                if buffered_chars >= flush_chars:
+                    yield flush()
+                continue
+
+            if buffer:
+                yield flush()
+            yield sse_frame(event)
+    finally:
+        if not pump.done():
+            pump.cancel()
+            try:
+                await pump
+            except asyncio.CancelledError:
+                pass
@@ -0,0 +1,461 @@
+"""
+Callback-based execution profiler for compiled LangGraph graphs.
+
+`GraphProfiler` is a LangChain callback handler. Attached to a graph
+(`profiler.attach(graph)`, or `config={"callbacks": [profiler]}` on a call) it
+records, for every graph run and every node execution inside it:
+
+- wall time (start / end of the run and of each node),
+- LLM calls with prompt and completion tokens,
+- tool calls and their latency,
+- approximate state size in bytes (JSON size of the state a node receives
+  and of the update it returns).
+
+Nested runs (chains, LLMs, tools) are attributed to the innermost node that
+started them, so nodes of subgraphs show up as children of the outer node.
+
+Results can be exported as:
+- a Chrome trace (`export_chrome_trace`), for chrome://tracing, Perfetto or
+  speedscope (timeline view, parallel branches on separate lanes),
+- folded stacks (`export_folded`), for flamegraph.pl / speedscope
+  (aggregated flame graph, weights in microseconds of self time),
+- a per-node and per-run summary table (`format_summary`).
+
+When profiling is not enabled, `profile_graph` returns the graph unchanged, so
+a disabled profiler adds no callbacks and no overhead. The module defaults come
+from environment variables (GRAPH_PROFILING, GRAPH_PROFILE_DIR); `enabled`,
+`max_runs`, `measure_state`, `directory` and the report `sink` (print by
+default) can also be passed in. Used by the 8-rag-agent graphs and 11-chat_api:
+
+    GRAPH_PROFILING=1 python main.py
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+from langchain_core.callbacks import BaseCallbackHandler
+
+GRAPH_PROFILING_ENABLED = os.getenv("GRAPH_PROFILING", "").lower() in ("1", "true", "yes")
+GRAPH_PROFILE_DIR = os.getenv("GRAPH_PROFILE_DIR", ".cache/profiles")
+GRAPH_PROFILE_MAX_RUNS = 100
+GRAPH_PROFILE_STATE_SIZE = True
+
+RUN, NODE, LLM, TOOL = "run", "node", "llm", "tool"
+
+def state_size(value: Any) -> int:
+    """
+    Approximate size of a state (or state update) in bytes, as compact JSON.
+    """
+    try:
+        return len(json.dumps(value, default=str, separators=(",", ":")).encode("utf-8"))
+    except (TypeError, ValueError):
+        return 0
+
+def _token_usage(response) -> Tuple[int, int]:
+    """
+    Prompt and completion tokens of an LLMResult (message usage metadata, else provider `token_usage`).
+    """
+    prompt = completion = 0
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                prompt += usage.get("input_tokens", 0)
+                completion += usage.get("output_tokens", 0)
+
+    if not (prompt or completion):
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        prompt = usage.get("prompt_tokens", 0)
+        completion = usage.get("completion_tokens", 0)
+
+    return prompt, completion
+
+def _node_entry() -> Dict[str, Any]:
+    return {
+        "latency_s": [], "llm_calls": 0, "prompt_tokens": 0, "completion_tokens": 0,
+        "tool_calls": 0, "tool_s": 0.0, "state_bytes": [], "update_bytes": [], "errors": 0,
+    }
+
+class _Span:
+    __slots__ = (
+        "kind", "name", "parent", "node", "start", "end", "error",
+        "prompt_tokens", "completion_tokens", "state_bytes", "update_bytes",
+    )
+
+    def __init__(self, kind: str, name: str, parent: Optional["_Span"], node: Optional["_Span"]):
+        self.kind = kind
+        self.name = name
+        self.parent = parent
+        self.node = node    # innermost enclosing node span (self for nodes)
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.error = False
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.state_bytes = 0
+        self.update_bytes = 0
+
+    @property
+    def duration(self) -> float:
+        return (self.end or time.perf_counter()) - self.start
+
+class _Run:
+    __slots__ = ("root", "spans")
+
+    def __init__(self, root: _Span):
+        self.root = root
+        self.spans: List[_Span] = [root]
+
+class GraphProfiler(BaseCallbackHandler):
+    """
+    Records per-run and per-node timings, LLM tokens, tool latency and state size.
+
+    Attributes:
+        runs (deque): The last `max_runs` graph runs.
+        measure_state (bool): Whether node state / update sizes are measured
+            (each measurement serializes the state once).
+        directory (str): Default output directory of `save`.
+        sink (Callable): Receives the report written by `save` (print, logger.info, ...).
+    """
+    run_inline = True    # called directly in the event loop / worker thread, no executor hop
+
+    def __init__(
+        self,
+        max_runs: int = GRAPH_PROFILE_MAX_RUNS,
+        measure_state: bool = GRAPH_PROFILE_STATE_SIZE,
+        directory: str = GRAPH_PROFILE_DIR,
+        sink: Callable[[str], Any] = print,
+    ):
+        self.runs: "deque[_Run]" = deque(maxlen=max_runs)
+        self.measure_state = measure_state
+        self.directory = directory
+        self.sink = sink
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        # run_id -> (run, span, recorded): the run's own span if it is recorded,
+        # else the enclosing span (nested chains, edge functions)
+        self._active: Dict[UUID, Tuple[_Run, _Span, bool]] = {}
+
+    def attach(self, graph):
+        """
+        Return `graph` bound to this profiler (every invoke / stream call is recorded).
+        """
+        return graph.with_config(callbacks=[self])
+
+    def reset(self) -> None:
+        with self._lock:
+            self.runs.clear()
+            self._active.clear()
+
+    # ---- recording -------------------------------------------------------
+
+    def _open(self, run_id: UUID, parent_run_id: Optional[UUID], kind: str, name: str) -> Optional[_Span]:
+        # Caller holds self._lock
+        parent = self._active.get(parent_run_id) if parent_run_id else None
+        if parent is None:
+            if kind != RUN:
+                return None     # LLM / tool call outside a profiled graph
+            span = _Span(RUN, name, None, None)
+            run = _Run(span)
+            self.runs.append(run)
+        else:
+            run, owner, _ = parent
+            span = _Span(kind, name, owner, owner.node)
+            if kind == NODE:
+                span.node = span
+            run.spans.append(span)
+
+        self._active[run_id] = (run, span, True)
+        return span
+
+    def _close(self, run_id: UUID, error: bool = False) -> Optional[_Span]:
+        # Caller holds self._lock
+        entry = self._active.pop(run_id, None)
+        if entry is None or not entry[2]:
+            return None
+        span = entry[1]
+        span.end = time.perf_counter()
+        span.error = error
+        return span
+
+    def on_chain_start(self, serialized, inputs, *, run_id: UUID, parent_run_id: Optional[UUID] = None, tags=None, metadata: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name") or "chain"
+        node = (metadata or {}).get("langgraph_node")
+
+        with self._lock:
+            parent = self._active.get(parent_run_id) if parent_run_id else None
+
+            if parent is None:
+                span = self._open(run_id, None, RUN, name)
+            elif node and name == node and not (parent[1].kind == NODE and parent[1].name == name):
+                # The node's own run, not a runnable of the same name nested inside it
+                span = self._open(run_id, parent_run_id, NODE, name)
+            else:
+                # Nested chain, edge function etc.: owned by the enclosing span
+                self._active[run_id] = (parent[0], parent[1], False)
+                return
+
+        if self.measure_state:
+            span.state_bytes = state_size(inputs)
+
+    def on_chain_end(self, outputs, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            span = self._close(run_id)
+        if span is not None and self.measure_state:
+            span.update_bytes = state_size(outputs)
+
+    def on_chain_error(self, error, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            self._close(run_id, error=True)
+
+    def _llm_name(self, serialized, kwargs) -> str:
+        serialized = serialized or {}
+        return kwargs.get("name") or serialized.get("name") or (serialized.get("id") or ["llm"])[-1]
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, parent_run_id: Optional[UUID] = None, **kwargs: Any) -> None:
+        with self._lock:
+            self._open(run_id, parent_run_id, LLM, self._llm_name(serialized, kwargs))
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, parent_run_id: Optional[UUID] = None, **kwargs: Any) -> None:
+        with self._lock:
+            self._open(run_id, parent_run_id, LLM, self._llm_name(serialized, kwargs))
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            span = self._close(run_id)
+        if span is not None:
+            span.prompt_tokens, span.completion_tokens = _token_usage(response)
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            self._close(run_id, error=True)
+
+    def on_tool_start(self, serialized, input_str, *, run_id: UUID, parent_run_id: Optional[UUID] = None, **kwargs: Any) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name") or "tool"
+        with self._lock:
+            self._open(run_id, parent_run_id, TOOL, name)
+
+    def on_tool_end(self, output, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            self._close(run_id)
+
+    def on_tool_error(self, error, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            self._close(run_id, error=True)
+
+    # ---- reports ---------------------------------------------------------
+
+    def _finished_runs(self) -> List[_Run]:
+        with self._lock:
+            return [run for run in self.runs if run.root.end is not None]
+
+    def run_summaries(self) -> List[Dict[str, Any]]:
+        """
+        Totals of each finished run: wall time, nodes, LLM calls, tokens, tool calls and peak state size.
+        """
+        summaries = []
+        for run in self._finished_runs():
+            llms = [s for s in run.spans if s.kind == LLM]
+            tools = [s for s in run.spans if s.kind == TOOL]
+            summaries.append({
+                "name": run.root.name,
+                "wall_s": run.root.duration,
+                "nodes": sum(1 for s in run.spans if s.kind == NODE),
+                "llm_calls": len(llms),
+                "prompt_tokens": sum(s.prompt_tokens for s in llms),
+                "completion_tokens": sum(s.completion_tokens for s in llms),
+                "tool_calls": len(tools),
+                "tool_s": sum(s.duration for s in tools),
+                "peak_state_bytes": max((s.state_bytes for s in run.spans), default=0),
+                "error": run.root.error,
+            })
+        return summaries
+
+    def node_summaries(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per node name, over all finished runs: calls, latency, LLM / tool usage and state size.
+        """
+        nodes: Dict[str, Dict[str, Any]] = {}
+        for run in self._finished_runs():
+            for span in run.spans:
+                if span.kind == NODE and span.end is not None:
+                    entry = nodes.setdefault(span.name, _node_entry())
+                    entry["latency_s"].append(span.duration)
+                    entry["state_bytes"].append(span.state_bytes)
+                    entry["update_bytes"].append(span.update_bytes)
+                    entry["errors"] += span.error
+                elif span.kind in (LLM, TOOL) and span.node is not None:
+                    entry = nodes.setdefault(span.node.name, _node_entry())
+                    if span.kind == LLM:
+                        entry["llm_calls"] += 1
+                        entry["prompt_tokens"] += span.prompt_tokens
+                        entry["completion_tokens"] += span.completion_tokens
+                    else:
+                        entry["tool_calls"] += 1
+                        entry["tool_s"] += span.duration
+        return nodes
+
+    def format_summary(self) -> str:
+        """
+        Per-node and per-run summary tables.
+        """
+        runs = self.run_summaries()
+        if not runs:
+            return "No finished graph runs recorded."
+
+        lines = [
+            f"Graph profile: {len(runs)} runs",
+            f"{'node':<24} {'calls':>5} {'total s':>8} {'mean ms':>8} {'p95 ms':>8} {'llm':>4} "
+            f"{'prompt':>7} {'compl':>6} {'tools':>5} {'tool s':>7} {'state KiB':>9} {'update KiB':>10}",
+        ]
+        for name, n in self.node_summaries().items():
+            latency = 1000 * np.array(n["latency_s"] or [0.0])
+            lines.append(
+                f"{name:<24} {len(n['latency_s']):5d} {latency.sum() / 1000:8.2f} {latency.mean():8.1f} "
+                f"{np.percentile(latency, 95):8.1f} {n['llm_calls']:4d} {n['prompt_tokens']:7d} "
+                f"{n['completion_tokens']:6d} {n['tool_calls']:5d} {n['tool_s']:7.2f} "
+                f"{np.mean(n['state_bytes'] or [0]) / 1024:9.1f} {np.mean(n['update_bytes'] or [0]) / 1024:10.1f}"
+            )
+
+        lines.append(
+            f"{'run':<24} {'wall s':>8} {'nodes':>5} {'llm':>4} {'prompt':>7} {'compl':>6} "
+            f"{'tools':>5} {'tool s':>7} {'peak state KiB':>14}"
+        )
+        for i, r in enumerate(runs):
+            label = f"{i + 1}. {r['name']}" + (" (error)" if r["error"] else "")
+            lines.append(
+                f"{label[:24]:<24} {r['wall_s']:8.2f} {r['nodes']:5d} {r['llm_calls']:4d} {r['prompt_tokens']:7d} "
+                f"{r['completion_tokens']:6d} {r['tool_calls']:5d} {r['tool_s']:7.2f} {r['peak_state_bytes'] / 1024:14.1f}"
+            )
+
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """
+        Trace Event Format of the finished runs: one process per run, overlapping spans on separate lanes.
+        """
+        events = []
+        for pid, run in enumerate(self._finished_runs(), start=1):
+            events.append({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": f"{pid}. {run.root.name}"}})
+
+            # Complete events on one lane must nest: put each span on its parent's lane
+            # if the parent is the innermost open span there, else on a free lane
+            lanes: List[List[_Span]] = []
+            lane_of: Dict[int, int] = {}
+            for span in sorted((s for s in run.spans if s.end is not None), key=lambda s: (s.start, -s.end)):
+                for stack in lanes:
+                    while stack and stack[-1].end <= span.start:
+                        stack.pop()
+
+                preferred = lane_of.get(id(span.parent))
+                if preferred is not None and lanes[preferred] and lanes[preferred][-1] is span.parent:
+                    lane = preferred
+                else:
+                    lane = next((i for i, stack in enumerate(lanes) if not stack), None)
+                    if lane is None:
+                        lanes.append([])
+                        lane = len(lanes) - 1
+                lanes[lane].append(span)
+                lane_of[id(span)] = lane
+
+                args = {"kind": span.kind}
+                if span.kind == LLM:
+                    args.update(prompt_tokens=span.prompt_tokens, completion_tokens=span.completion_tokens)
+                elif span.kind in (RUN, NODE):
+                    args.update(state_bytes=span.state_bytes, update_bytes=span.update_bytes)
+                if span.error:
+                    args["error"] = True
+
+                events.append({
+                    "name": span.name,
+                    "cat": span.kind,
+                    "ph": "X",
+                    "ts": round((span.start - self._origin) * 1e6, 1),
+                    "dur": round((span.end - span.start) * 1e6, 1),
+                    "pid": pid,
+                    "tid": lane,
+                    "args": args,
+                })
+
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def folded_stacks(self) -> Dict[str, int]:
+        """
+        Self time in microseconds per call stack (`run;node;llm:name`), summed over the finished runs.
+        """
+        stacks: Dict[str, int] = {}
+        for run in self._finished_runs():
+            spans = [s for s in run.spans if s.end is not None]
+            child_time: Dict[int, float] = {}
+            for span in spans:
+                if span.parent is not None:
+                    child_time[id(span.parent)] = child_time.get(id(span.parent), 0.0) + span.duration
+
+            for span in spans:
+                frames, current = [], span
+                while current is not None:
+                    frames.append(current.name if current.kind in (RUN, NODE) else f"{current.kind}:{current.name}")
+                    current = current.parent
+                stack = ";".join(reversed(frames))
+
+                # Concurrent children can add up to more than the parent's wall time
+                self_us = int(max(0.0, span.duration - child_time.get(id(span), 0.0)) * 1e6)
+                if self_us:
+                    stacks[stack] = stacks.get(stack, 0) + self_us
+        return stacks
+
+    def export_chrome_trace(self, path: str) -> str:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+        return path
+
+    def export_folded(self, path: str) -> str:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(f"{stack} {weight}\n" for stack, weight in self.folded_stacks().items())
+        return path
+
+    def save(self, directory: Optional[str] = None, prefix: str = "graph") -> Dict[str, str]:
+        """
+        Write the Chrome trace and folded stacks to `directory` (default: `self.directory`)
+        and send the summary table to the sink.
+
+        Returns:
+            dict: Paths of the `trace` (.json) and `folded` (.folded) files.
+        """
+        directory = directory or self.directory
+        stamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        paths = {
+            "trace": self.export_chrome_trace(os.path.join(directory, f"{prefix}_{stamp}.trace.json")),
+            "folded": self.export_folded(os.path.join(directory, f"{prefix}_{stamp}.folded")),
+        }
+        self.sink(f"Graph profile written to {paths['trace']} and {paths['folded']}\n{self.format_summary()}")
+        return paths
+
+def profile_graph(graph, profiler: Optional[GraphProfiler] = None, enabled: bool = GRAPH_PROFILING_ENABLED, **options: Any):
+    """
+    Attach a profiler to a compiled graph when profiling is enabled.
+
+    Args:
+        graph: Compiled graph.
+        profiler (GraphProfiler | None): Profiler to attach (a new one if None).
+        enabled (bool): If False, `graph` is returned unchanged and no profiler is created.
+        **options: `GraphProfiler` arguments (max_runs, measure_state, directory, sink)
+            for a new profiler.
+
+    Returns:
+        Tuple: (graph to run, GraphProfiler or None).
+    """
+    if not enabled:
+        return graph, None
+
+    profiler = profiler or GraphProfiler(**options)
+    return profiler.attach(graph), profiler
@@ -1,41 +1,72 @@
 import json
-from typing import List
+import time
+from typing import Any, Dict, List
 from langchain_core.messages import AIMessage, BaseMessage, ToolMessage, HumanMessage
 from langchain_community.tools import TavilySearchResults
 
 # Create the Tavily search tool
 tavily_tool = TavilySearchResults(max_results=5)
 
+# Searches run in parallel threads, at most this many at a time
+SEARCH_MAX_CONCURRENCY = 5
+SEARCH_FAILED = "Search failed:"
+
+def previous_results(state: List[BaseMessage]) -> Dict[str, Any]:
+    """Search results already returned in earlier revision rounds, by query"""
+    results = {}
+    for message in state:
+        if isinstance(message, ToolMessage):
+            try:
+                content = json.loads(message.content)
+            except (TypeError, ValueError):
+                continue
+            # Only successful searches (a list of results) are reused; failed ones are retried
+            results.update({query: result for query, result in content.items() if isinstance(result, list)})
+    return results
+
 # Function to execute search queries from AnswerQuestion tool calls
 def execute_tool(state: List[BaseMessage]) -> List[BaseMessage]:
+    start = time.perf_counter()
     last_ai_message: AIMessage = state[-1]
     
     # Extract tool calls from the AI message
     if not hasattr(last_ai_message, "tool_calls") or not last_ai_message.tool_calls:
         return []
     
-    # Process the AnswerQuestion or ReviseAnswer tool calls to extract search queries
-    tool_messages = []
-    
-    for tool_call in last_ai_message.tool_calls:
-        if tool_call["name"] in ["AnswerQuestion", "ReviseAnswer"]:
-            call_id = tool_call["id"]
-            search_queries = tool_call["args"].get("search_queries", [])
-            
-            # Execute each search query using the tavily tool
-            query_results = {}
-            for query in search_queries:
-                result = tavily_tool.invoke(query)
-                query_results[query] = result
-            
-            # Create a tool message with the results
-            tool_messages.append(
-                ToolMessage(
-                    content=json.dumps(query_results),
-                    tool_call_id=call_id
-                )
-            )
-    
+    # Collect the search queries of all AnswerQuestion or ReviseAnswer tool calls
+    tool_calls = [
+        tool_call for tool_call in last_ai_message.tool_calls
+        if tool_call["name"] in ["AnswerQuestion", "ReviseAnswer"]
+    ]
+    all_queries = [query for tool_call in tool_calls for query in tool_call["args"].get("search_queries", [])]
+
+    # Only search queries that were not answered in an earlier round (or twice in this one)
+    results = previous_results(state[:-1])
+    new_queries = list(dict.fromkeys(query for query in all_queries if query not in results))
+
+    # Execute the new queries concurrently using the tavily tool
+    if new_queries:
+        outputs = tavily_tool.batch(
+            new_queries, config={"max_concurrency": SEARCH_MAX_CONCURRENCY}, return_exceptions=True
+        )
+        # Tavily returns API errors as a string (repr of the error) rather than raising,
+        # so anything but a list of results counts as a failed search
+        for query, output in zip(new_queries, outputs):
+            results[query] = output if isinstance(output, list) else f"{SEARCH_FAILED} {output}"
+
+    # Create a tool message with the results for each tool call
+    tool_messages = [
+        ToolMessage(
+            content=json.dumps({query: results[query] for query in tool_call["args"].get("search_queries", [])}),
+            tool_call_id=tool_call["id"]
+        )
+        for tool_call in tool_calls
+    ]
+
+    print(
+        f"execute_tool: {len(new_queries)} searches run, {len(all_queries) - len(new_queries)} reused, "
+        f"{time.perf_counter() - start:.2f}s"
+    )
     return tool_messages
 
 # Example usage
@@ -1,10 +1,11 @@
 from langchain_ollama import ChatOllama
-from langchain.agents import tool, create_react_agent
+from langchain.agents import tool, create_tool_calling_agent
 import datetime
 from langchain_community.tools import TavilySearchResults
-from langchain import hub
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 
-llm = ChatOllama(model='llama3:8b', temperature=0.1)
+# Tool-calling model: one reasoning step may request several tool calls at once
+llm = ChatOllama(model='llama3-groq-tool-use', temperature=0.1)
 
 search_tool = TavilySearchResults(search_depth="basic")
 
@@ -17,6 +18,15 @@ def get_system_time(input: str = None):
 
 tools = [search_tool, get_system_time]
 
-react_prompt = hub.pull("hwchase17/react")
+react_prompt = ChatPromptTemplate.from_messages([
+    ("system", "You are a helpful assistant. Use the tools to look up what you don't know. "
+               "When several independent lookups are needed, request them together in one step."),
+    ("human", "{input}"),
+    MessagesPlaceholder("agent_scratchpad"),
+])
 
-react_agent_runnable = create_react_agent(tools=tools, llm=llm, prompt=react_prompt)
+def build_react_agent(llm, tools):
+    # Returns an AgentFinish, or a list of ToolAgentActions (one per tool call)
+    return create_tool_calling_agent(llm=llm, tools=tools, prompt=react_prompt)
+
+react_agent_runnable = build_react_agent(llm, tools)
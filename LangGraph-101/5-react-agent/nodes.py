@@ -1,32 +1,64 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
 from dotenv import load_dotenv
+from langchain_core.agents import AgentAction
 
 from agent_reason_runable import react_agent_runnable, tools
 from react_state import AgentState
 
 load_dotenv()
 
+# Looked up by name for every action
+tools_by_name = {tool.name: tool for tool in tools}
+
+def _actions(state: AgentState) -> List[AgentAction]:
+    # The tool-calling agent returns a list of actions, one per tool call of the step
+    agent_outcome = state['agent_outcome']
+    return list(agent_outcome) if isinstance(agent_outcome, list) else [agent_outcome]
+
+def _run_action(agent_action: AgentAction) -> str:
+    tool_function = tools_by_name.get(agent_action.tool)
+    if tool_function is None:
+        return f"Tool '{agent_action.tool}' not found"
+    try:
+        return str(tool_function.invoke(agent_action.tool_input))
+    except Exception as e:
+        return f"Tool '{agent_action.tool}' failed: {e}"
+
+async def _arun_action(agent_action: AgentAction) -> str:
+    tool_function = tools_by_name.get(agent_action.tool)
+    if tool_function is None:
+        return f"Tool '{agent_action.tool}' not found"
+    try:
+        # Native async for async tools; sync tools run in the default thread pool
+        return str(await tool_function.ainvoke(agent_action.tool_input))
+    except Exception as e:
+        return f"Tool '{agent_action.tool}' failed: {e}"
+
 def reason_node(state:AgentState):
     agent_outcome = react_agent_runnable.invoke(state)
-    return {"agent_outcome": agent_outcome}
+    # iteration counts reasoning rounds (added by the state reducer), not tool calls
+    return {"agent_outcome": agent_outcome, "iteration": 1}
+
+async def areason_node(state: AgentState):
+    agent_outcome = await react_agent_runnable.ainvoke(state)
+    return {"agent_outcome": agent_outcome, "iteration": 1}
 
 def act_node(state: AgentState):
-    agent_action = state['agent_outcome']
-
-    tool_name = agent_action.tool
-    tool_input = agent_action.tool_input
-
-    tool_function = None
-    for tool in tools:
-        if tool.name == tool_name:
-            tool_function = tool
-            break
-
-    if tool_function:
-        if isinstance(tool_input, dict):
-            output = tool_function.invoke(**tool_input)
-        else:
-            output = tool_function.invoke(tool_input)
-    else:
-        output = f"Tool '{tool_name}' not found"
-
-    return {"intermediate_steps": [(agent_action, str(output))], "iteration": state["iteration"] + 1}
\ No newline at end of file
+    actions = _actions(state)
+
+    # Execute all actions of this step concurrently, keeping their order
+    with ThreadPoolExecutor(max_workers=max(1, len(actions))) as executor:
+        outputs = list(executor.map(_run_action, actions))
+
+    return {"intermediate_steps": list(zip(actions, outputs))}
+
+async def aact_node(state: AgentState):
+    actions = _actions(state)
+
+    # Execute all actions of this step concurrently, keeping their order
+    outputs = await asyncio.gather(*(_arun_action(agent_action) for agent_action in actions))
+
+    return {"intermediate_steps": list(zip(actions, outputs))}
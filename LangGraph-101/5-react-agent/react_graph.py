@@ -1,27 +1,31 @@
+import asyncio
+
 from dotenv import load_dotenv
 
 load_dotenv()
 
 from langchain_core.agents import AgentAction, AgentFinish
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import START, END, StateGraph
 
-from nodes import reason_node, act_node
+from nodes import reason_node, areason_node, act_node, aact_node
 from react_state import AgentState
 
 REASON_NODE = "reason_node"
 ACT_NODE = "act_node"
-MAX_ITERATIONS = 5
+MAX_ITERATIONS = 5    # reasoning rounds, however many tools each one calls
 
 def should_continue(state: AgentState) -> str:
-    if isinstance(state["agent_outcome"], AgentFinish) or state['iteration'] > MAX_ITERATIONS:
+    if isinstance(state["agent_outcome"], AgentFinish) or state['iteration'] >= MAX_ITERATIONS:
         return END
     else:
         return ACT_NODE
 
 graph = StateGraph(AgentState)
 
-graph.add_node(REASON_NODE, reason_node)
-graph.add_node(ACT_NODE, act_node)
+# ainvoke runs both nodes natively async; act runs all actions of a step concurrently
+graph.add_node(REASON_NODE, RunnableLambda(reason_node, afunc=areason_node, name=REASON_NODE))
+graph.add_node(ACT_NODE, RunnableLambda(act_node, afunc=aact_node, name=ACT_NODE))
 
 graph.add_edge(START, REASON_NODE)
 graph.add_conditional_edges(REASON_NODE, should_continue)
@@ -31,14 +35,14 @@ app = graph.compile()
 
 app.get_graph().draw_mermaid_png(output_file_path="graph.png")
 
-result = app.invoke(
+result = asyncio.run(app.ainvoke(
     {
         "input": "How many days ago was the latest SpaceX launch?",
         "agent_outcome": None,
         "intermediate_steps": [],
         "iteration": 0
     }
-)
+))
 
 print(result)
 
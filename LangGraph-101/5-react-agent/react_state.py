@@ -1,10 +1,10 @@
 import operator
-from typing import Annotated, Union, TypedDict
+from typing import Annotated, List, Union, TypedDict
 
 from langchain_core.agents import AgentAction, AgentFinish
 
 class AgentState(TypedDict):
     input: str
-    agent_outcome: Union[AgentAction, AgentFinish, None]
+    agent_outcome: Union[AgentAction, List[AgentAction], AgentFinish, None]
     intermediate_steps: Annotated[list[tuple[AgentAction, str]], operator.add]
     iteration: Annotated[int, operator.add]
@@ -0,0 +1,86 @@
+import asyncio
+import os
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+os.environ.setdefault("TAVILY_API_KEY", "test")   # the search tool is never called here
+
+from langchain_core.agents import AgentFinish
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.tools import StructuredTool, tool
+
+import nodes
+from agent_reason_runable import build_react_agent
+
+class FakeToolCallingModel(GenericFakeChatModel):
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+@tool
+def lookup(query: str) -> str:
+    """Looks up a query (slowly)."""
+    time.sleep(0.5)
+    return f"result for {query}"
+
+def _sync_lookup(query: str) -> str:
+    time.sleep(0.5)
+    return f"async result for {query}"
+
+async def _async_lookup(query: str) -> str:
+    await asyncio.sleep(0.5)
+    return f"async result for {query}"
+
+# Awaited natively by aact_node, called in a thread by act_node
+alookup = StructuredTool.from_function(
+    func=_sync_lookup, coroutine=_async_lookup, name="alookup",
+    description="Looks up a query asynchronously (slowly).",
+)
+
+def _agent(monkeypatch):
+    llm = FakeToolCallingModel(messages=iter([
+        AIMessage(content="", tool_calls=[
+            {"name": "lookup", "args": {"query": "launch"}, "id": "call_1"},
+            {"name": "alookup", "args": {"query": "today"}, "id": "call_2"},
+        ]),
+        AIMessage(content="3 days ago"),
+    ]))
+    monkeypatch.setattr(nodes, "react_agent_runnable", build_react_agent(llm, [lookup, alookup]))
+    monkeypatch.setattr(nodes, "tools_by_name", {"lookup": lookup, "alookup": alookup})
+
+def _state():
+    return {"input": "How many days ago was the latest launch?", "agent_outcome": None,
+            "intermediate_steps": [], "iteration": 0}
+
+def test_two_actions_run_concurrently_in_order(monkeypatch)->None:
+    _agent(monkeypatch)
+    state = _state()
+
+    state.update(asyncio.run(nodes.areason_node(state)))
+    assert [action.tool for action in state["agent_outcome"]] == ["lookup", "alookup"]
+
+    start = time.perf_counter()
+    steps = asyncio.run(nodes.aact_node(state))["intermediate_steps"]
+    assert time.perf_counter() - start < 0.9
+
+    assert [(action.tool_call_id, output) for action, output in steps] == [
+        ("call_1", "result for launch"), ("call_2", "async result for today"),
+    ]
+
+    # The next step sees both results in its scratchpad
+    state["intermediate_steps"] += steps
+    outcome = asyncio.run(nodes.areason_node(state))["agent_outcome"]
+    assert isinstance(outcome, AgentFinish)
+    assert outcome.return_values["output"] == "3 days ago"
+
+def test_sync_act_node_runs_actions_concurrently(monkeypatch)->None:
+    _agent(monkeypatch)
+    state = _state()
+    state.update(nodes.reason_node(state))
+
+    start = time.perf_counter()
+    steps = nodes.act_node(state)["intermediate_steps"]
+    assert time.perf_counter() - start < 0.9
+    assert [output for _, output in steps] == ["result for launch", "async result for today"]
@@ -5,6 +5,7 @@ from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage
 from langgraph.checkpoint.memory import MemorySaver
 from dotenv import load_dotenv
+from history import HistoryCompactor
 
 load_dotenv()
 
@@ -13,11 +14,19 @@ config = {"configurable": {"thread_id": str(uuid.uuid4())}}
 
 llm = ChatGroq(model="llama-3.1-8b-instant")
 
+# The prompt keeps the first user message, a rolling summary and the latest turns
+# within the token budget, so it stays flat as the conversation grows (see history.py)
+history = HistoryCompactor(llm, max_tokens=2000)
+
 class BasicChatState(TypedDict):
     messages: Annotated[list, add_messages]
+    summary: str             # rolling summary of turns evicted from the prompt (and state)
 
 def chatbot(state: BasicChatState):
-    return {"messages": [llm.invoke(state["messages"])]}
+    # compaction["messages"] removes the evicted messages; the reply is added after them
+    prompt, compaction = history.compact(state)
+    compaction["messages"].append(llm.invoke(prompt))
+    return compaction
 
 graph = StateGraph(BasicChatState)
 
@@ -2,23 +2,31 @@ from typing import TypedDict, Annotated
 from langgraph.graph import add_messages, StateGraph, START, END
 from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage
-from langgraph.checkpoint.sqlite import SqliteSaver
 from dotenv import load_dotenv
-import sqlite3
+from history import HistoryCompactor
+from sqlite_checkpointer import TunedSqliteSaver
 
 load_dotenv()
 
-sqlite_conn = sqlite3.connect("checkpoints.sqlite", check_same_thread=False)
-memory = SqliteSaver(sqlite_conn)
+# WAL mode, batched commits, and only the newest 20 checkpoints kept per thread (see sqlite_checkpointer.py)
+memory = TunedSqliteSaver.from_path("checkpoints.sqlite", keep_last=20)
 config = {"configurable": {"thread_id": 1}}
 
 llm = ChatGroq(model="llama-3.1-8b-instant")
 
+# The prompt keeps the first user message, a rolling summary and the latest turns
+# within the token budget, so it stays flat as the conversation grows (see history.py)
+history = HistoryCompactor(llm, max_tokens=2000)
+
 class BasicChatState(TypedDict):
     messages: Annotated[list, add_messages]
+    summary: str             # rolling summary of turns evicted from the prompt (and state)
 
 def chatbot(state: BasicChatState):
-    return {"messages": [llm.invoke(state["messages"])]}
+    # compaction["messages"] removes the evicted messages; the reply is added after them
+    prompt, compaction = history.compact(state)
+    compaction["messages"].append(llm.invoke(prompt))
+    return compaction
 
 graph = StateGraph(BasicChatState)
 
@@ -36,5 +44,7 @@ while True:
         break
     else:
         result = app.invoke({"messages": [HumanMessage(content=user_input)]}, config=config)
+        # Commit the turn's checkpoints in one transaction
+        memory.flush()
 
         print("AI:", result['messages'][-1].content)
@@ -0,0 +1,98 @@
+"""
+Checkpoint write latency and database size: SqliteSaver vs TunedSqliteSaver.
+
+Runs a chat-shaped graph (messages channel, one echo node, no LLM) for
+`--turns` turns spread over `--threads` conversations, once per saver
+configuration, each on a fresh database file, and reports per-turn latency
+(mean / p50 / p95 / p99) and the final file size (database + WAL).
+
+Usage:
+    python checkpoint_benchmark.py                        # 10k turns over 100 threads
+    python checkpoint_benchmark.py --turns 2000 --threads 20
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+from typing import Annotated, Callable, Dict, TypedDict
+
+import numpy as np
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.graph import END, START, StateGraph, add_messages
+
+from sqlite_checkpointer import TunedSqliteSaver, configure_connection
+
+class ChatState(TypedDict):
+    messages: Annotated[list, add_messages]
+
+def echo(state: ChatState):
+    return {"messages": [AIMessage(content=f"You said: {state['messages'][-1].content}")]}
+
+builder = StateGraph(ChatState)
+builder.add_node("echo", echo)
+builder.add_edge(START, "echo")
+builder.add_edge("echo", END)
+
+def default_saver(path: str):
+    return SqliteSaver(sqlite3.connect(path, check_same_thread=False))
+
+def wal_saver(path: str):
+    return SqliteSaver(configure_connection(sqlite3.connect(path, check_same_thread=False)))
+
+def tuned_saver(path: str, keep_last: int):
+    return TunedSqliteSaver(configure_connection(sqlite3.connect(path, check_same_thread=False)), keep_last=keep_last)
+
+def file_size(path: str) -> int:
+    return sum(os.path.getsize(p) for p in (path, path + "-wal") if os.path.exists(p))
+
+def run(make_saver: Callable, path: str, turns: int, threads: int) -> Dict[str, float]:
+    saver = make_saver(path)
+    app = builder.compile(checkpointer=saver)
+    latencies = []
+
+    for turn in range(turns):
+        config = {"configurable": {"thread_id": str(turn % threads)}}
+        start = time.perf_counter()
+        app.invoke({"messages": [HumanMessage(content=f"message {turn}")]}, config=config)
+        # One commit per turn, as in 4_chat_with_sqlite_checkpointer.py
+        if hasattr(saver, "flush"):
+            saver.flush()
+        latencies.append(time.perf_counter() - start)
+
+    size = file_size(path)
+    saver.conn.close()
+
+    ms = 1000 * np.array(latencies)
+    return {
+        "mean": ms.mean(),
+        "p50": np.percentile(ms, 50),
+        "p95": np.percentile(ms, 95),
+        "p99": np.percentile(ms, 99),
+        "size_mib": size / 2**20,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite checkpointer benchmark")
+    parser.add_argument("--turns", type=int, default=10_000, help="total chat turns")
+    parser.add_argument("--threads", type=int, default=100, help="conversations the turns are spread over")
+    parser.add_argument("--keep-last", type=int, default=20, help="checkpoints kept per thread by the tuned saver")
+    args = parser.parse_args()
+
+    configs = {
+        "default": default_saver,
+        "wal": wal_saver,
+        f"tuned (keep {args.keep_last})": lambda path: tuned_saver(path, args.keep_last),
+    }
+
+    print(f"{args.turns} turns over {args.threads} threads (per-turn latency, ms)")
+    print(f"{'saver':<18} {'mean':>7} {'p50':>7} {'p95':>7} {'p99':>7} {'size':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, make_saver in configs.items():
+            m = run(make_saver, os.path.join(tmp, f"{name.split()[0]}.sqlite"), args.turns, args.threads)
+            print(f"{name:<18} {m['mean']:7.2f} {m['p50']:7.2f} {m['p95']:7.2f} {m['p99']:7.2f} {m['size_mib']:8.1f}MiB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Token-budgeted chat history for long-running chatbots.
+
+`HistoryCompactor.compact(state)` builds the prompt for a turn from:
+
+1. pinned messages: leading system messages and the first user message,
+2. a rolling summary of older turns, as one system message,
+3. a sliding window of the most recent turns that fits `max_tokens`.
+
+When the window overflows, the oldest turns are evicted down to
+`low_water * max_tokens` (so this happens every few turns, not every turn) and
+folded into the summary with one LLM call over just the evicted messages. The
+summary is returned as a state update, so it lives in the checkpoint and is
+never recomputed, together with a `RemoveMessage` per evicted message: state
+(and every checkpoint write) holds only the pinned messages and the window, so
+per-turn cost stays flat however long the conversation gets.
+"""
+
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from langchain_core.messages import BaseMessage, HumanMessage, RemoveMessage, SystemMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+
+MAX_HISTORY_TOKENS = 2000
+LOW_WATER = 0.6     # fraction of the budget the window is trimmed to on eviction
+
+SUMMARY_PROMPT = (
+    "You maintain a running summary of a conversation between a user and an AI assistant. "
+    "Extend the existing summary with the new messages below. Keep names, facts, decisions "
+    "and open questions; drop small talk. Answer with the updated summary only.\n\n"
+    "Existing summary:\n{summary}\n\nNew messages:\n{messages}"
+)
+
+def _pinned_count(messages: Sequence[BaseMessage]) -> int:
+    """Number of leading messages that are always kept: system messages plus the first user message."""
+    i = 0
+    while i < len(messages) and isinstance(messages[i], SystemMessage):
+        i += 1
+    if i < len(messages) and isinstance(messages[i], HumanMessage):
+        i += 1
+    return i
+
+class HistoryCompactor:
+    """
+    Sliding token window plus incrementally updated summary of evicted turns.
+
+    Attributes:
+        llm: Chat model used to update the summary.
+        max_tokens (int): Token budget of the prompt history (pinned + summary + window).
+        low_water (float): Fraction of `max_tokens` the window is trimmed to when it overflows.
+        token_counter (Callable): Counts the tokens of a list of messages.
+    """
+    def __init__(
+        self,
+        llm,
+        max_tokens: int = MAX_HISTORY_TOKENS,
+        low_water: float = LOW_WATER,
+        token_counter: Callable[[Sequence[BaseMessage]], int] = count_tokens_approximately,
+    ):
+        self.llm = llm
+        self.max_tokens = max_tokens
+        self.low_water = low_water
+        self.token_counter = token_counter
+
+    def _summary_message(self, summary: str) -> List[BaseMessage]:
+        return [SystemMessage(content=f"Summary of the earlier conversation:\n{summary}")] if summary else []
+
+    def _window_start(self, messages: Sequence[BaseMessage], start: int, budget: int) -> int:
+        """First index from which messages[start:] fits within `budget` tokens, on a turn boundary."""
+        used, i = 0, len(messages)
+        while i > start:
+            cost = self.token_counter([messages[i - 1]])
+            if used + cost > budget:
+                break
+            used += cost
+            i -= 1
+
+        # Never start the window with a tool result separated from its tool call
+        while i < len(messages) and isinstance(messages[i], ToolMessage):
+            i += 1
+        return i
+
+    def summarize(self, summary: str, messages: Sequence[BaseMessage]) -> str:
+        transcript = "\n".join(f"{message.type}: {message.content}" for message in messages)
+        response = self.llm.invoke([HumanMessage(content=SUMMARY_PROMPT.format(summary=summary or "(none)", messages=transcript))])
+        return response.content
+
+    def compact(self, state: Dict[str, Any], messages_key: str = "messages") -> Tuple[List[BaseMessage], Dict[str, Any]]:
+        """
+        Build the prompt messages for this turn.
+
+        Args:
+            state (dict): Graph state with the message list, and the `summary` of
+                earlier turns (if any).
+            messages_key (str): State key of the message list (an `add_messages` channel).
+
+        Returns:
+            Tuple[List[BaseMessage], dict]: Prompt messages, and state updates: under
+            `messages_key`, a `RemoveMessage` per evicted message (append the reply to
+            this list), and the new `summary` if anything was evicted.
+        """
+        messages = state[messages_key]
+        summary = state.get("summary") or ""
+
+        pinned = list(messages[:_pinned_count(messages)])
+        start = len(pinned)
+
+        fixed = self.token_counter(pinned + self._summary_message(summary))
+        if fixed + self.token_counter(messages[start:]) <= self.max_tokens:
+            return pinned + self._summary_message(summary) + list(messages[start:]), {messages_key: []}
+
+        # Over budget: evict the oldest turns down to the low-water mark and fold them into the summary
+        new_start = self._window_start(messages, start, int(self.low_water * self.max_tokens) - fixed)
+        new_start = min(new_start, len(messages) - 1)   # always keep the latest message
+        if new_start <= start:
+            return pinned + self._summary_message(summary) + list(messages[start:]), {messages_key: []}
+
+        summary = self.summarize(summary, messages[start:new_start])
+
+        # Evicted messages now live only in the summary: drop them from state
+        updates = {messages_key: [RemoveMessage(id=message.id) for message in messages[start:new_start]], "summary": summary}
+        return pinned + self._summary_message(summary) + list(messages[new_start:]), updates
@@ -0,0 +1,102 @@
+"""
+Per-turn latency of a long chat: full history vs HistoryCompactor.
+
+Runs the chatbot graph of 4_chat_with_sqlite_checkpointer.py for `--turns`
+turns on one thread with an in-memory checkpointer and a simulated LLM whose
+latency grows with the prompt (`--ms-per-1k-tokens`, plus a fixed overhead),
+once sending the full history and once the compacted prompt. Reports latency
+and prompt tokens at a few turns, the p95 over all turns, and the growth of the
+median latency from turns 51-100 to the last 50 turns. Exits with an error if
+the compacted run's growth exceeds `--max-growth` (latency is not flat).
+
+Usage:
+    python history_benchmark.py                    # 500 turns
+    python history_benchmark.py --turns 200 --max-tokens 1000
+"""
+
+import argparse
+import time
+from typing import Annotated, Dict, List, TypedDict
+
+import numpy as np
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, START, StateGraph, add_messages
+
+from history import HistoryCompactor
+
+REPORT_TURNS = (1, 100, 250, 500)
+BASE_LATENCY_MS = 2.0
+GROWTH_WINDOW = 50      # turns per median in the growth ratio (after the first window fills up)
+
+class SimulatedLLM:
+    """Chat model stand-in: sleeps in proportion to the prompt size and answers with a fixed-size reply."""
+    def __init__(self, ms_per_1k_tokens: float):
+        self.ms_per_1k_tokens = ms_per_1k_tokens
+        self.last_prompt_tokens = 0
+
+    def invoke(self, messages):
+        self.last_prompt_tokens = count_tokens_approximately(messages)
+        time.sleep((BASE_LATENCY_MS + self.ms_per_1k_tokens * self.last_prompt_tokens / 1000) / 1000)
+        return AIMessage(content="Here is a reasonably detailed answer to your question. " * 4)
+
+class ChatState(TypedDict):
+    messages: Annotated[list, add_messages]
+    summary: str
+
+def build(llm: SimulatedLLM, history: HistoryCompactor = None):
+    def chatbot(state: ChatState):
+        if history is None:
+            return {"messages": [llm.invoke(state["messages"])]}
+        prompt, compaction = history.compact(state)
+        compaction["messages"].append(llm.invoke(prompt))
+        return compaction
+
+    builder = StateGraph(ChatState)
+    builder.add_node("chatbot", chatbot)
+    builder.add_edge(START, "chatbot")
+    builder.add_edge("chatbot", END)
+    return builder.compile(checkpointer=MemorySaver())
+
+def run(app, llm: SimulatedLLM, turns: int) -> Dict[str, List[float]]:
+    config = {"configurable": {"thread_id": "benchmark"}}
+    latencies, prompt_tokens = [], []
+    for turn in range(turns):
+        start = time.perf_counter()
+        app.invoke({"messages": [HumanMessage(content=f"Question {turn}: tell me more about topic {turn % 7}.")]}, config=config)
+        latencies.append(1000 * (time.perf_counter() - start))
+        prompt_tokens.append(llm.last_prompt_tokens)
+    return {"latency": latencies, "prompt_tokens": prompt_tokens}
+
+def growth(latencies: List[float]) -> float:
+    """Median latency of the last GROWTH_WINDOW turns over that of turns GROWTH_WINDOW+1 .. 2*GROWTH_WINDOW."""
+    return float(np.median(latencies[-GROWTH_WINDOW:]) / np.median(latencies[GROWTH_WINDOW:2 * GROWTH_WINDOW]))
+
+def main():
+    parser = argparse.ArgumentParser(description="Chat history trimming benchmark")
+    parser.add_argument("--turns", type=int, default=500, help="chat turns on one thread")
+    parser.add_argument("--max-tokens", type=int, default=2000, help="HistoryCompactor token budget")
+    parser.add_argument("--ms-per-1k-tokens", type=float, default=5.0, help="simulated LLM latency per 1k prompt tokens")
+    parser.add_argument("--max-growth", type=float, default=1.25, help="allowed latency growth of the compacted run")
+    args = parser.parse_args()
+
+    results = {}
+    llm = SimulatedLLM(args.ms_per_1k_tokens)
+    results["full history"] = run(build(llm), llm, args.turns)
+    llm = SimulatedLLM(args.ms_per_1k_tokens)
+    compacted = results[f"compacted ({args.max_tokens})"] = run(build(llm, HistoryCompactor(llm, max_tokens=args.max_tokens)), llm, args.turns)
+
+    turns = [t for t in REPORT_TURNS if t <= args.turns]
+    print(f"{args.turns} turns, per-turn latency in ms (prompt tokens)")
+    check = args.turns >= 3 * GROWTH_WINDOW
+    print(f"{'history':<18}" + "".join(f"{'turn ' + str(t):>16}" for t in turns) + f"{'p95':>9}" + (f"{'growth':>9}" if check else ""))
+    for name, r in results.items():
+        cells = "".join(f"{r['latency'][t - 1]:8.1f} ({r['prompt_tokens'][t - 1]:>5})" for t in turns)
+        print(f"{name:<18}{cells}{np.percentile(r['latency'], 95):9.1f}" + (f"{growth(r['latency']):8.2f}x" if check else ""))
+
+    if check and growth(compacted["latency"]) > args.max_growth:
+        raise SystemExit(f"Compacted latency grew {growth(compacted['latency']):.2f}x (limit {args.max_growth}x)")
+
+if __name__ == "__main__":
+    main()
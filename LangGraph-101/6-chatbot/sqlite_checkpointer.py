@@ -0,0 +1,185 @@
+"""
+SqliteSaver tuned for long-running chats.
+
+`TunedSqliteSaver` is a drop-in `SqliteSaver` that:
+
+- opens the database in WAL mode with synchronous=NORMAL (no fsync per commit),
+- batches writes: checkpoints and pending writes of several super-steps are
+  committed together, every `commit_every` writes or `commit_interval`
+  seconds, or when `flush()` is called (e.g. once per chat turn),
+- prunes history: only the newest `keep_last` checkpoints of each thread are
+  kept (older ones and their writes are deleted at commit time). Pruned
+  checkpoints are no longer available to get_state_history / time travel.
+
+Writes not yet committed are visible to this process but lost if it crashes;
+`flush()` / `close()` (also registered at exit) commit them.
+
+Offline compaction of an existing database (prune every thread, then VACUUM):
+    python sqlite_checkpointer.py compact checkpoints.sqlite --keep-last 20
+"""
+
+import argparse
+import atexit
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional, Set, Tuple
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+COMMIT_EVERY = 32         # writes per commit
+COMMIT_INTERVAL = 1.0     # seconds an uncommitted write may wait
+KEEP_LAST = 20            # checkpoints kept per thread (None keeps all)
+
+def configure_connection(conn: sqlite3.Connection) -> sqlite3.Connection:
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+def prune_thread(conn: sqlite3.Connection, thread_id: str, checkpoint_ns: str, keep_last: int) -> int:
+    """Delete all but the newest `keep_last` checkpoints (and their writes) of one thread namespace."""
+    row = conn.execute(
+        "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+        "ORDER BY checkpoint_id DESC LIMIT 1 OFFSET ?",
+        (thread_id, checkpoint_ns, keep_last - 1)
+    ).fetchone()
+    if row is None:
+        return 0
+
+    # Checkpoint ids are time-ordered, so everything older than the cutoff goes
+    cutoff = row[0]
+    deleted = conn.execute(
+        "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?",
+        (thread_id, checkpoint_ns, cutoff)
+    ).rowcount
+    conn.execute(
+        "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?",
+        (thread_id, checkpoint_ns, cutoff)
+    )
+    return deleted
+
+class TunedSqliteSaver(SqliteSaver):
+    """
+    SqliteSaver with batched commits and per-thread checkpoint pruning.
+
+    Attributes:
+        commit_every (int): Writes buffered before a commit.
+        commit_interval (float): Seconds after which buffered writes are committed on the next write.
+        keep_last (int | None): Checkpoints kept per thread; None disables pruning.
+    """
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        *,
+        commit_every: int = COMMIT_EVERY,
+        commit_interval: float = COMMIT_INTERVAL,
+        keep_last: Optional[int] = KEEP_LAST,
+        serde=None,
+    ):
+        super().__init__(conn, serde=serde)
+        self.commit_every = commit_every
+        self.commit_interval = commit_interval
+        self.keep_last = keep_last
+
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+        self._dirty_threads: Set[Tuple[str, str]] = set()
+
+    @classmethod
+    def from_path(cls, path: str, **kwargs) -> "TunedSqliteSaver":
+        """
+        Open `path` in WAL mode and return a saver that is flushed at interpreter exit.
+        """
+        conn = configure_connection(sqlite3.connect(path, check_same_thread=False))
+        saver = cls(conn, **kwargs)
+        atexit.register(saver.close)
+        return saver
+
+    @contextmanager
+    def cursor(self, transaction: bool = True) -> Iterator[sqlite3.Cursor]:
+        # Same as SqliteSaver.cursor, but a write only commits when the batch is due
+        with self.lock:
+            self.setup()
+            cur = self.conn.cursor()
+            try:
+                yield cur
+            finally:
+                cur.close()
+                if transaction:
+                    self._uncommitted += 1
+                    if (
+                        self._uncommitted >= self.commit_every
+                        or time.monotonic() - self._last_commit >= self.commit_interval
+                    ):
+                        self._commit()
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        next_config = super().put(config, checkpoint, metadata, new_versions)
+        self._dirty_threads.add((str(config["configurable"]["thread_id"]), config["configurable"].get("checkpoint_ns", "")))
+        return next_config
+
+    def _commit(self) -> None:
+        # Caller holds self.lock
+        if self.keep_last is not None:
+            for thread_id, checkpoint_ns in self._dirty_threads:
+                prune_thread(self.conn, thread_id, checkpoint_ns, self.keep_last)
+        self._dirty_threads.clear()
+
+        self.conn.commit()
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+
+    def flush(self) -> None:
+        """Commit buffered writes now."""
+        with self.lock:
+            if self._uncommitted or self._dirty_threads:
+                self._commit()
+
+    def close(self) -> None:
+        """Flush and close the connection (safe to call more than once)."""
+        try:
+            self.flush()
+            self.conn.close()
+        except sqlite3.ProgrammingError:
+            pass    # already closed
+
+def compact(path: str, keep_last: int) -> None:
+    """
+    Prune every thread to its newest `keep_last` checkpoints, then VACUUM the file.
+    Run it while no process has the database open.
+    """
+    def size() -> int:
+        return sum(os.path.getsize(p) for p in (path, path + "-wal") if os.path.exists(p))
+
+    before = size()
+    conn = configure_connection(sqlite3.connect(path))
+
+    threads = conn.execute("SELECT DISTINCT thread_id, checkpoint_ns FROM checkpoints").fetchall()
+    deleted = sum(prune_thread(conn, thread_id, checkpoint_ns, keep_last) for thread_id, checkpoint_ns in threads)
+    conn.commit()
+
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.execute("VACUUM")
+    conn.close()
+
+    print(
+        f"Compacted {path}: {deleted} checkpoints deleted across {len(threads)} threads, "
+        f"{before / 1024:.0f} KiB -> {size() / 1024:.0f} KiB"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Checkpoint database maintenance")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    compact_parser = subcommands.add_parser("compact", help="prune old checkpoints and VACUUM")
+    compact_parser.add_argument("path", help="SQLite checkpoint database")
+    compact_parser.add_argument("--keep-last", type=int, default=KEEP_LAST, help="checkpoints kept per thread")
+
+    args = parser.parse_args()
+    if args.command == "compact":
+        compact(args.path, args.keep_last)
+
+if __name__ == "__main__":
+    main()
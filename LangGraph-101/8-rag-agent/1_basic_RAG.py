@@ -1,10 +1,12 @@
 from langchain.schema import Document
-from langchain_ollama import OllamaEmbeddings, ChatOllama
+from langchain_ollama import ChatOllama
 from langchain_community.vectorstores import Chroma
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
+from embedding_service import get_embeddings
 
-embedding_function = OllamaEmbeddings(model="llama3:8b")
+# Shared, disk-cached, micro-batched embeddings (see embedding_service.py)
+embedding_function = get_embeddings("llama3:8b")
 
 docs = [
     Document(
@@ -1,13 +1,17 @@
 from langchain.schema import Document
-from langchain_ollama import OllamaEmbeddings, ChatOllama
+from langchain_ollama import ChatOllama
 from langchain_community.vectorstores import Chroma
 from langchain_core.prompts import ChatPromptTemplate
 from typing import TypedDict
 from langgraph.graph import START, END, StateGraph
 from langchain_core.messages import AIMessage, HumanMessage, BaseMessage
 from pydantic import BaseModel, Field
+from embedding_service import get_embeddings
+from hybrid_retriever import HybridRetriever
+from topic_classifier import gym_topic_classifier
 
-embedding_function = OllamaEmbeddings(model="llama3:8b")
+# Shared, disk-cached, micro-batched embeddings (see embedding_service.py)
+embedding_function = get_embeddings("llama3:8b")
 
 docs = [
     Document(
@@ -39,7 +43,15 @@ docs = [
 db = Chroma.from_documents(docs, embedding_function)
 
 # Retrieve
-retriever = db.as_retriever(search_type="mmr", search_kwargs={"k": 3})
+vector_retriever = db.as_retriever(search_type="mmr", search_kwargs={"k": 3})
+
+# BM25 catches exact terms (prices, names, times); fused with vector results by reciprocal rank
+retriever = HybridRetriever.from_documents(docs, vector_retriever, k=3)
+
+# Embedding-centroid fast path for question_classifier: questions clearly on or
+# off topic skip the LLM call. The margins are calibrated on labelled gym
+# questions at start-up (see topic_classifier.py); uncertain questions fall back to the LLM
+topic_classifier = gym_topic_classifier(embedding_function, docs)
 
 template = """
 Answer the question based only on the following context: {context}
@@ -80,6 +92,11 @@ def question_classifier(state: AgenticState):
 
     question = state["messages"][-1].content  # get last human message - which is question in this case
 
+    on_topic = topic_classifier.classify(question)
+    if on_topic is not None:
+        state["on_topic"] = on_topic
+        return state
+
     grade_prompt = ChatPromptTemplate.from_messages([("system", system), ("human", "User question: {question}")])
 
     grader_llm = grade_prompt | structured_llm
@@ -1,5 +1,5 @@
 from langchain.schema import Document
-from langchain_ollama import OllamaEmbeddings, ChatOllama
+from langchain_ollama import ChatOllama
 from langchain_community.vectorstores import Chroma
 from typing import TypedDict, Annotated, Sequence
 from langgraph.graph import START, END, StateGraph, add_messages
@@ -7,8 +7,10 @@ from langchain_core.messages import HumanMessage, BaseMessage
 from langchain.tools.retriever import create_retriever_tool
 from langchain_core.tools import tool
 from langgraph.prebuilt import ToolNode
+from embedding_service import get_embeddings
 
-embedding_function = OllamaEmbeddings(model="llama3-groq-tool-use")
+# Shared, disk-cached, micro-batched embeddings (see embedding_service.py)
+embedding_function = get_embeddings("llama3-groq-tool-use")
 
 docs = [
     Document(
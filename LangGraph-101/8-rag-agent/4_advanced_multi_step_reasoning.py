@@ -1,5 +1,5 @@
 from langchain.schema import Document
-from langchain_ollama import OllamaEmbeddings, ChatOllama
+from langchain_ollama import ChatOllama
 from langchain_community.vectorstores import Chroma
 from typing import TypedDict, List
 from langgraph.graph import START, END, StateGraph
@@ -7,8 +7,12 @@ from langchain_core.messages import HumanMessage, BaseMessage, SystemMessage, AI
 from langchain_core.prompts import ChatPromptTemplate
 from langgraph.checkpoint.memory import MemorySaver
 from pydantic import BaseModel, Field
+from embedding_service import get_embeddings
+from hybrid_retriever import HybridRetriever
+from topic_classifier import gym_topic_classifier
 
-embedding_function = OllamaEmbeddings(model="llama3-groq-tool-use")
+# Shared, disk-cached, micro-batched embeddings (see embedding_service.py)
+embedding_function = get_embeddings("llama3-groq-tool-use")
 
 docs = [
     Document(
@@ -40,7 +44,15 @@ docs = [
 db = Chroma.from_documents(docs, embedding_function)
 
 # Retrieve
-retriever = db.as_retriever(search_type="mmr", search_kwargs={"k": 4})
+vector_retriever = db.as_retriever(search_type="mmr", search_kwargs={"k": 4})
+
+# BM25 catches exact terms (prices, names, times); fused with vector results by reciprocal rank
+retriever = HybridRetriever.from_documents(docs, vector_retriever, k=4)
+
+# Embedding-centroid fast path for question_classifier: questions clearly on or
+# off topic skip the LLM call. The margins are calibrated on labelled gym
+# questions at start-up (see topic_classifier.py); uncertain questions fall back to the LLM
+topic_classifier = gym_topic_classifier(embedding_function, docs)
 
 llm = ChatOllama(model="llama3:8b")
 
@@ -112,6 +124,13 @@ def question_rewriter(state: AgentState):
 
 def question_classifier(state: AgentState):
     print(f"Entering question_classifier")
+
+    on_topic = topic_classifier.classify(state["rephrased_question"])
+    if on_topic is not None:
+        state["on_topic"] = on_topic
+        print(f"question_classifier: on_topic: {state['on_topic']}")
+        return state
+
     system_message = SystemMessage(content=""" You are a classifier that determines whether a user's question is about one of the following topics 
     
     1. Gym History & Founder
@@ -156,32 +175,73 @@ class GradeDocument(BaseModel):
         description="Document is relevant to the question? If yes -> 'Yes' if not -> 'No'. Expected answer is only Yes or No"
     )
 
-def retrieval_grader(state: AgentState):
-    print("Entering retrieval_grader")
-    system_message = SystemMessage(
-        content="""You are a grader assessing the relevance of a retrieved document to a user question.
+class GradeDocumentList(BaseModel):
+    relevant: List[str] = Field(
+        description="For each numbered document, in order: is it relevant to the question? 'Yes' or 'No'"
+    )
+
+# "concurrent": one grader call per document, run in parallel; "single": one call grades all documents
+GRADING_MODE = "concurrent"
+GRADER_MAX_CONCURRENCY = 4
+
+grader_prompt = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            """You are a grader assessing the relevance of a retrieved document to a user question.
         Only answer with 'Yes' or 'No'.
 
         If the document contains information relevant to the user's question, respond with 'Yes'.
-        Otherwise, respond with 'No'."""
-    )
-    structured_llm = llm.with_structured_output(GradeDocument)
+        Otherwise, respond with 'No'.""",
+        ),
+        ("human", "User question: {question}\n\n Retrieved Document: {document}"),
+    ]
+)
+grader_llm = grader_prompt | llm.with_structured_output(GradeDocument)
 
-    relevant_docs = []
-    for doc in state["documents"]:
-        human_message = HumanMessage(
-            content=f"User question: {state['rephrased_question']}\n\n Retrieved Document: {doc.page_content}"
-        )
-        grader_prompt = ChatPromptTemplate.from_messages(
-            [system_message, human_message]
+list_grader_prompt = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            """You are a grader assessing the relevance of each retrieved document to a user question.
+        The documents are numbered. For each document, in order, answer only with 'Yes' or 'No'.
+
+        If the document contains information relevant to the user's question, respond with 'Yes'.
+        Otherwise, respond with 'No'.""",
+        ),
+        ("human", "User question: {question}\n\n Retrieved Documents:\n{documents}"),
+    ]
+)
+list_grader_llm = list_grader_prompt | llm.with_structured_output(GradeDocumentList)
+
+def retrieval_grader(state: AgentState):
+    print("Entering retrieval_grader")
+    docs = state["documents"]
+    grades = None
+
+    if GRADING_MODE == "single" and docs:
+        numbered = "\n\n".join(f"[{i}] {doc.page_content}" for i, doc in enumerate(docs, start=1))
+        result = list_grader_llm.invoke({"question": state["rephrased_question"], "documents": numbered})
+        # None when the structured output could not be parsed
+        if result is not None and len(result.relevant) == len(docs):
+            grades = result.relevant
+        else:
+            print("Single-call grading failed or returned the wrong number of results, grading per document")
+
+    if grades is None:
+        results = grader_llm.batch(
+            [{"question": state["rephrased_question"], "document": doc.page_content} for doc in docs],
+            config={"max_concurrency": GRADER_MAX_CONCURRENCY},
         )
-        grader_llm = grader_prompt | structured_llm
-        result = grader_llm.invoke()
+        grades = [result.relevant for result in results]
+
+    relevant_docs = []
+    for doc, grade in zip(docs, grades):
         print(
-            f"Grader document: {doc.page_content[:30]}... Result: {result.relevant.strip()}"
+            f"Grader document: {doc.page_content[:30]}... Result: {grade.strip()}"
         )
 
-        if result.relevant.strip().lower() == "yes":
+        if grade.strip().lower() == "yes":
             relevant_docs.append(doc)
 
     state["documents"] = relevant_docs
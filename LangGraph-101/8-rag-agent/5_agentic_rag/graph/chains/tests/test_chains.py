@@ -3,7 +3,7 @@ from pprint import pprint
 
 load_dotenv()
 
-from graph.chains.retrieval_grader import GradeDocuments, retrieval_grader
+from graph.chains.retrieval_grader import GradeDocuments, GradeDocumentsBatch, retrieval_grader, batch_retrieval_grader
 from graph.chains.generation import generation_chain
 from ingestion import retriever
 
@@ -31,6 +31,18 @@ def test_retrieval_grader_answer_no()->None:
 
     assert res.binary_score == "no"
 
+def test_batch_retrieval_grader_one_score_per_document()->None:
+    question = "agent memory"
+    docs = retriever.invoke(question)
+    documents = "\n\n".join(f"[{i}] {doc.page_content}" for i, doc in enumerate(docs, start=1))
+
+    res: GradeDocumentsBatch = batch_retrieval_grader.invoke({
+        "documents": documents,
+        "question":question
+    })
+
+    assert len(res.binary_scores) == len(docs)
+
 def test_generation_chain()->None:
     question = "agent memory"
     docs = retriever.invoke(question)
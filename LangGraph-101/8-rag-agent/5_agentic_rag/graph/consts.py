@@ -1,4 +1,9 @@
 RETRIEVE = "retrieve"
 GRADE_DOCUMENTS = "grade_documents"
 GENERATE = "generate"
-WEBSEARCH = "websearch"
\ No newline at end of file
+WEBSEARCH = "websearch"
+
+# Document grading: "concurrent" grades each document in its own call, run in parallel;
+# "single" grades all documents in one structured-output call
+GRADING_MODE = "concurrent"
+GRADER_MAX_CONCURRENCY = 4
\ No newline at end of file
@@ -1,10 +1,11 @@
 from dotenv import load_dotenv
 load_dotenv()
 
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import START, END, StateGraph
 
 from graph.consts import RETRIEVE, GRADE_DOCUMENTS, GENERATE, WEBSEARCH
-from graph.nodes import generate, grade_documents, retrieve, web_search
+from graph.nodes import generate, grade_documents, agrade_documents, retrieve, web_search
 from graph.state import GraphState
 
 def decide_to_generate(state: GraphState):
@@ -20,7 +21,8 @@ def decide_to_generate(state: GraphState):
 workflow = StateGraph(GraphState)
 
 workflow.add_node(RETRIEVE, retrieve)
-workflow.add_node(GRADE_DOCUMENTS, grade_documents)
+# invoke grades documents with batch (threads), ainvoke with abatch
+workflow.add_node(GRADE_DOCUMENTS, RunnableLambda(grade_documents, afunc=agrade_documents, name=GRADE_DOCUMENTS))
 workflow.add_node(GENERATE, generate)
 workflow.add_node(WEBSEARCH, web_search)
 
@@ -1,26 +1,28 @@
-from graph.chains.retrieval_grader import retrieval_grader
+from typing import List, Optional
+
+from graph.chains.retrieval_grader import retrieval_grader, batch_retrieval_grader, GradeDocumentsBatch
+from graph.consts import GRADING_MODE, GRADER_MAX_CONCURRENCY
 from graph.state import GraphState
 
-def grade_documents(state: GraphState)->GraphState:
-    """Determines whether the retrieved documents are relevant to the question
-    If any document is not relevant, we will set a flag to run web search
+def _grader_inputs(state: GraphState) -> List[dict]:
+    return [{"document": doc.page_content, "question": state['question']} for doc in state['documents']]
 
-    Args:
-        state (GraphState): Current state of graph
+def _batch_input(state: GraphState) -> dict:
+    documents = "\n\n".join(f"[{i}] {doc.page_content}" for i, doc in enumerate(state['documents'], start=1))
+    return {"documents": documents, "question": state['question']}
 
-    Returns:
-        GraphState: Filtered out irrelevant documents and updated web_search state
-    """
-    print('---CHECK DOCUMENT RELEVANCE TO QUESTION---')
+def _batch_grades(result: Optional[GradeDocumentsBatch], expected: int) -> Optional[List[str]]:
+    """Return the single-call verdicts, or None if they don't match the documents one-to-one"""
+    if result is None or len(result.binary_scores) != expected:
+        print('---SINGLE-CALL GRADING RETURNED WRONG NUMBER OF SCORES, GRADING PER DOCUMENT---')
+        return None
+    return result.binary_scores
+
+def _apply_grades(state: GraphState, grades: List[str]) -> GraphState:
     filtered_docs = []
     web_search = False
 
-    for doc in state['documents']:
-        score =  retrieval_grader.invoke({
-        "document": doc.page_content,
-        "question": state['question']})
-
-        grade = score.binary_score
+    for doc, grade in zip(state['documents'], grades):
         if grade.lower() == 'yes':
             print('---GRADE: DOCUMENT RELEVANT---')
             filtered_docs.append(doc)
@@ -31,4 +33,52 @@ def grade_documents(state: GraphState)->GraphState:
     state['documents'] = filtered_docs
     state['web_search'] = web_search
 
-    return state
\ No newline at end of file
+    return state
+
+def grade_documents(state: GraphState)->GraphState:
+    """Determines whether the retrieved documents are relevant to the question
+    If any document is not relevant, we will set a flag to run web search
+
+    Documents are graded concurrently (up to GRADER_MAX_CONCURRENCY calls at once),
+    or all in one call when GRADING_MODE is "single".
+
+    Args:
+        state (GraphState): Current state of graph
+
+    Returns:
+        GraphState: Filtered out irrelevant documents and updated web_search state
+    """
+    print('---CHECK DOCUMENT RELEVANCE TO QUESTION---')
+    inputs = _grader_inputs(state)
+    grades = None
+
+    if GRADING_MODE == "single" and inputs:
+        grades = _batch_grades(batch_retrieval_grader.invoke(_batch_input(state)), len(inputs))
+
+    if grades is None:
+        scores = retrieval_grader.batch(inputs, config={"max_concurrency": GRADER_MAX_CONCURRENCY})
+        grades = [score.binary_score for score in scores]
+
+    return _apply_grades(state, grades)
+
+async def agrade_documents(state: GraphState)->GraphState:
+    """Async version of grade_documents, grading documents concurrently with abatch
+
+    Args:
+        state (GraphState): Current state of graph
+
+    Returns:
+        GraphState: Filtered out irrelevant documents and updated web_search state
+    """
+    print('---CHECK DOCUMENT RELEVANCE TO QUESTION---')
+    inputs = _grader_inputs(state)
+    grades = None
+
+    if GRADING_MODE == "single" and inputs:
+        grades = _batch_grades(await batch_retrieval_grader.ainvoke(_batch_input(state)), len(inputs))
+
+    if grades is None:
+        scores = await retrieval_grader.abatch(inputs, config={"max_concurrency": GRADER_MAX_CONCURRENCY})
+        grades = [score.binary_score for score in scores]
+
+    return _apply_grades(state, grades)
@@ -1,3 +1,4 @@
+from typing import List
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
 from langchain_ollama import ChatOllama
@@ -18,4 +19,21 @@ grade_prompt = ChatPromptTemplate.from_messages([
     ("system", system),
     ("human", "Retrieved Document : \n\n {document} \n\n User question : {question}")])
 
-retrieval_grader = grade_prompt | structured_llm
\ No newline at end of file
+retrieval_grader = grade_prompt | structured_llm
+
+class GradeDocumentsBatch(BaseModel):
+    """Binary scores for relevance check on a numbered list of retrieved documents."""
+    binary_scores: List[str] = Field(description="One score per document, in the order given: 'yes' or 'no'")
+
+batch_structured_llm = llm.with_structured_output(GradeDocumentsBatch)
+
+batch_system = """You are a grader assessing relevance of each retrieved document to a user question.\n
+The documents are numbered. If a document contains keyword(s) or semantic meaning related to the question, grade it as relevant.\n
+Return exactly one binary score 'yes' or 'no' per document, in the same order as the documents."""
+
+batch_grade_prompt = ChatPromptTemplate.from_messages([
+    ("system", batch_system),
+    ("human", "Retrieved Documents : \n\n {documents} \n\n User question : {question}")])
+
+# Grades all documents in a single call
+batch_retrieval_grader = batch_grade_prompt | batch_structured_llm
@@ -1,4 +1,15 @@
 RETRIEVE = "retrieve"
 GRADE_DOCUMENTS = "grade_documents"
 GENERATE = "generate"
-WEBSEARCH = "websearch"
\ No newline at end of file
+WEBSEARCH = "websearch"
+
+# Document grading: "concurrent" grades each document in its own call, run in parallel;
+# "single" grades all documents in one structured-output call
+GRADING_MODE = "concurrent"
+GRADER_MAX_CONCURRENCY = 4
+
+# Generate loop: generations allowed per run before the last one is returned as is,
+# whether the hallucination and answer graders run concurrently, and how many verdicts are cached
+MAX_GENERATIONS = 3
+GRADE_GENERATION_CONCURRENTLY = True
+VERDICT_CACHE_SIZE = 256
\ No newline at end of file
@@ -1,12 +1,14 @@
 from dotenv import load_dotenv
 load_dotenv()
 
+from typing import Optional
+
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import START, END, StateGraph
 
-from graph.chains.answer_grader import answer_grader
-from graph.chains.hallucination_grader import hallucination_grader
-from graph.consts import RETRIEVE, GRADE_DOCUMENTS, GENERATE, WEBSEARCH
-from graph.nodes import generate, grade_documents, retrieve, web_search
+from graph.chains.generation_grader import grade_generation, agrade_generation
+from graph.consts import RETRIEVE, GRADE_DOCUMENTS, GENERATE, WEBSEARCH, MAX_GENERATIONS
+from graph.nodes import generate, grade_documents, agrade_documents, retrieve, web_search
 from graph.state import GraphState
 
 def decide_to_generate(state: GraphState):
@@ -19,39 +21,56 @@ def decide_to_generate(state: GraphState):
         print('---DECISION: GENERATE---')
         return GENERATE
 
-def grade_generation_grounded_in_documents_and_question(state: GraphState):
-    print('---CHECK HALLUCINATIONS---')
-    question = state['question']
-    documents = state['documents']
-    generation = state['generation']
-
-    score = hallucination_grader.invoke({"documents":documents, "generation":generation})
+def _route_generation(state: GraphState, grounded: bool, answers_question: Optional[bool]) -> str:
+    retries_left = state.get('generation_count', 0) < MAX_GENERATIONS
 
-    if score.binary_score: # if true
+    if grounded:
         print('---DECISION: GENERATION IS GROUNDED IN DOCUMENTS---')
-        print('---GRADE GENERATION Vs QUESTION---')
-        score = answer_grader.invoke({"question":question, "generation":generation})
-        if score.binary_score:  # if true
+        if answers_question:
             print('---DECISION: GENERATION ADDRESSES QUESTION---')
             return "useful"
-        else:
-            print('---DECISION: GENERATION DOES NOT ADDRESS QUESTION---')
-            return "not useful"
+        print('---DECISION: GENERATION DOES NOT ADDRESS QUESTION---')
+        route = "not useful"
     else:
         print('---DECISION: GENERATION IS NOT GROUNDED IN DOCUMENTS---')
-        return "not supported"
+        route = "not supported"
+
+    if not retries_left:
+        print(f'---DECISION: {MAX_GENERATIONS} GENERATIONS REACHED, RETURNING LAST GENERATION---')
+        return "max generations"
+    return route
+
+def grade_generation_grounded_in_documents_and_question(state: GraphState):
+    print('---CHECK HALLUCINATIONS AND GRADE GENERATION Vs QUESTION---')
+    grounded, answers_question = grade_generation(state['question'], state['documents'], state['generation'])
+    return _route_generation(state, grounded, answers_question)
+
+async def agrade_generation_grounded_in_documents_and_question(state: GraphState):
+    print('---CHECK HALLUCINATIONS AND GRADE GENERATION Vs QUESTION---')
+    grounded, answers_question = await agrade_generation(state['question'], state['documents'], state['generation'])
+    return _route_generation(state, grounded, answers_question)
 
 workflow = StateGraph(GraphState)
 
 workflow.add_node(RETRIEVE, retrieve)
-workflow.add_node(GRADE_DOCUMENTS, grade_documents)
+# invoke grades documents with batch (threads), ainvoke with abatch
+workflow.add_node(GRADE_DOCUMENTS, RunnableLambda(grade_documents, afunc=agrade_documents, name=GRADE_DOCUMENTS))
 workflow.add_node(GENERATE, generate)
 workflow.add_node(WEBSEARCH, web_search)
 
 workflow.add_edge(START, RETRIEVE)
 workflow.add_edge(RETRIEVE, GRADE_DOCUMENTS)
 workflow.add_conditional_edges(GRADE_DOCUMENTS, decide_to_generate, {WEBSEARCH:WEBSEARCH, GENERATE:GENERATE})
-workflow.add_conditional_edges(GENERATE, grade_generation_grounded_in_documents_and_question,{"not supported":GENERATE, "not useful":WEBSEARCH, "useful":END})
+# Retries are bounded by MAX_GENERATIONS; graders run concurrently and verdicts are cached
+workflow.add_conditional_edges(
+    GENERATE,
+    RunnableLambda(
+        grade_generation_grounded_in_documents_and_question,
+        afunc=agrade_generation_grounded_in_documents_and_question,
+        name="grade_generation",
+    ),
+    {"not supported":GENERATE, "not useful":WEBSEARCH, "useful":END, "max generations":END},
+)
 
 workflow.add_edge(WEBSEARCH, GENERATE)
 workflow.add_edge(GENERATE, END)
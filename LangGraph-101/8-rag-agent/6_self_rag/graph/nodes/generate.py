@@ -7,4 +7,5 @@ def generate(state: GraphState)-> GraphState:
     documents = state['documents']
 
     state['generation'] = generation_chain.invoke({"context": documents, "question":question})
+    state['generation_count'] = state.get('generation_count', 0) + 1
     return state
\ No newline at end of file
@@ -1,32 +1,52 @@
+import os
+import sys
 from dotenv import load_dotenv
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.document_loaders import WebBaseLoader
 from langchain_chroma import Chroma
-from langchain_ollama.embeddings import OllamaEmbeddings
 
 load_dotenv()
 
+# Shared helpers live one level up in 8-rag-agent/
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from page_cache import CachedWebBaseLoader, get_page_cache
+from incremental_index import sync_vectorstore
+from embedding_service import get_embeddings
+
+EMBEDDING_MODEL = 'llama3:8b'
+COLLECTION_NAME = 'rag-chroma'
+PERSIST_DIRECTORY = './.chroma'
+CHUNK_SIZE = 250
+CHUNK_OVERLAP = 0
+
 urls = [
     'https://lilianweng.github.io/posts/2023-06-23-agent/',
     'https://lilianweng.github.io/posts/2023-03-15-prompt-engineering/',
     'https://lilianweng.github.io/posts/2023-10-25-adv-attack-llm/',
 ]
 
-docs = [WebBaseLoader(url).load() for url in urls]
+# Pages are served from the on-disk page cache when fresh (revalidated otherwise)
+docs = [CachedWebBaseLoader(url).load() for url in urls]
+get_page_cache().log_stats()
 docs_list = [item for sublist in docs for item in sublist]
 
-text_splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(chunk_size=250, chunk_overlap=0)
+text_splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+
+# Shared, disk-cached, micro-batched embeddings (see embedding_service.py)
+embeddings = get_embeddings(EMBEDDING_MODEL)
 
-doc_splits = text_splitter.split_documents(docs_list)
+vectorstore = Chroma(
+    collection_name=COLLECTION_NAME,
+    persist_directory=PERSIST_DIRECTORY,
+    embedding_function=embeddings)
 
-vectorstore = Chroma.from_documents(
-    documents=doc_splits,
-    collection_name='rag-chroma',
-    persist_directory='./.chroma',
-    embedding=OllamaEmbeddings(model='llama3:8b'))
+# Embed only new / changed chunks and drop stale ones; a warm start embeds nothing
+sync_vectorstore(
+    vectorstore,
+    docs_list,
+    text_splitter,
+    embedding_model=EMBEDDING_MODEL,
+    manifest_path=os.path.join(PERSIST_DIRECTORY, f'{COLLECTION_NAME}.manifest.json'),
+    splitter_settings={"chunk_size": CHUNK_SIZE, "chunk_overlap": CHUNK_OVERLAP, "encoding": "tiktoken"})
+embeddings.log_stats()
 
-retriever = Chroma(
-    collection_name='rag-chroma',
-    persist_directory='./.chroma',
-    embedding_function=OllamaEmbeddings(model='llama3:8b')
-    ).as_retriever()
+retriever = vectorstore.as_retriever()
@@ -0,0 +1,111 @@
+import hashlib
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+from langchain_core.runnables import RunnableParallel
+
+from graph.chains.answer_grader import answer_grader
+from graph.chains.hallucination_grader import hallucination_grader
+from graph.consts import GRADE_GENERATION_CONCURRENTLY, VERDICT_CACHE_SIZE
+
+# Runs both graders at once (threads for invoke, asyncio for ainvoke)
+generation_graders = RunnableParallel(grounded=hallucination_grader, answers_question=answer_grader)
+
+# LRU of verdicts: ("grounded", documents hash, generation hash) and
+# ("answers_question", question hash, generation hash) -> bool
+_verdicts: "OrderedDict[Tuple[str, str, str], bool]" = OrderedDict()
+
+def _hash(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+def _keys(question: str, documents: List[Any], generation: str) -> Tuple[Tuple[str, str, str], Tuple[str, str, str]]:
+    documents_hash = _hash(*(getattr(doc, "page_content", str(doc)) for doc in documents))
+    generation_hash = _hash(generation)
+    return ("grounded", documents_hash, generation_hash), ("answers_question", _hash(question), generation_hash)
+
+def _lookup(key: Tuple[str, str, str]) -> Optional[bool]:
+    verdict = _verdicts.get(key)
+    if verdict is not None:
+        _verdicts.move_to_end(key)
+    return verdict
+
+def _store(key: Tuple[str, str, str], verdict: bool) -> bool:
+    _verdicts[key] = verdict
+    _verdicts.move_to_end(key)
+    while len(_verdicts) > VERDICT_CACHE_SIZE:
+        _verdicts.popitem(last=False)
+    return verdict
+
+def _result(grounded: bool, answers_question: Optional[bool]) -> Tuple[bool, Optional[bool]]:
+    # The answer verdict only counts for a grounded generation
+    return grounded, (answers_question if grounded else None)
+
+def grade_generation(question: str, documents: List[Any], generation: str) -> Tuple[bool, Optional[bool]]:
+    """Grades a generation for grounding in the documents and for answering the question
+
+    Verdicts already computed for the same documents / question and generation are reused.
+    With GRADE_GENERATION_CONCURRENTLY both graders run at once when neither verdict is cached,
+    otherwise the answer grader only runs for a grounded generation.
+
+    Args:
+        question (str): User question
+        documents (List): Documents the generation should be grounded in
+        generation (str): LLM generation
+
+    Returns:
+        Tuple[bool, Optional[bool]]: Grounded verdict, and answer verdict (None if not grounded)
+    """
+    grounded_key, answer_key = _keys(question, documents, generation)
+    grounded, answers_question = _lookup(grounded_key), _lookup(answer_key)
+    inputs = {"question": question, "documents": documents, "generation": generation}
+
+    if grounded is not None and (answers_question is not None or not grounded):
+        print('---GENERATION VERDICTS REUSED FROM CACHE---')
+        return _result(grounded, answers_question)
+
+    if grounded is None and answers_question is None and GRADE_GENERATION_CONCURRENTLY:
+        scores = generation_graders.invoke(inputs)
+        grounded = _store(grounded_key, scores["grounded"].binary_score)
+        answers_question = _store(answer_key, scores["answers_question"].binary_score)
+        return _result(grounded, answers_question)
+
+    if grounded is None:
+        grounded = _store(grounded_key, hallucination_grader.invoke(inputs).binary_score)
+    if grounded and answers_question is None:
+        answers_question = _store(answer_key, answer_grader.invoke(inputs).binary_score)
+    return _result(grounded, answers_question)
+
+async def agrade_generation(question: str, documents: List[Any], generation: str) -> Tuple[bool, Optional[bool]]:
+    """Async version of grade_generation
+
+    Args:
+        question (str): User question
+        documents (List): Documents the generation should be grounded in
+        generation (str): LLM generation
+
+    Returns:
+        Tuple[bool, Optional[bool]]: Grounded verdict, and answer verdict (None if not grounded)
+    """
+    grounded_key, answer_key = _keys(question, documents, generation)
+    grounded, answers_question = _lookup(grounded_key), _lookup(answer_key)
+    inputs = {"question": question, "documents": documents, "generation": generation}
+
+    if grounded is not None and (answers_question is not None or not grounded):
+        print('---GENERATION VERDICTS REUSED FROM CACHE---')
+        return _result(grounded, answers_question)
+
+    if grounded is None and answers_question is None and GRADE_GENERATION_CONCURRENTLY:
+        scores = await generation_graders.ainvoke(inputs)
+        grounded = _store(grounded_key, scores["grounded"].binary_score)
+        answers_question = _store(answer_key, scores["answers_question"].binary_score)
+        return _result(grounded, answers_question)
+
+    if grounded is None:
+        grounded = _store(grounded_key, (await hallucination_grader.ainvoke(inputs)).binary_score)
+    if grounded and answers_question is None:
+        answers_question = _store(answer_key, (await answer_grader.ainvoke(inputs)).binary_score)
+    return _result(grounded, answers_question)
@@ -3,9 +3,10 @@ from pprint import pprint
 
 load_dotenv()
 
-from graph.chains.retrieval_grader import GradeDocuments, retrieval_grader
+from graph.chains.retrieval_grader import GradeDocuments, GradeDocumentsBatch, retrieval_grader, batch_retrieval_grader
 from graph.chains.generation import generation_chain
 from graph.chains.hallucination_grader import hallucination_grader
+from graph.chains.generation_grader import grade_generation
 from graph.chains.router import question_router
 from ingestion import retriever
 
@@ -33,6 +34,18 @@ def test_retrieval_grader_answer_no()->None:
 
     assert res.binary_score == "no"
 
+def test_batch_retrieval_grader_one_score_per_document()->None:
+    question = "agent memory"
+    docs = retriever.invoke(question)
+    documents = "\n\n".join(f"[{i}] {doc.page_content}" for i, doc in enumerate(docs, start=1))
+
+    res: GradeDocumentsBatch = batch_retrieval_grader.invoke({
+        "documents": documents,
+        "question":question
+    })
+
+    assert len(res.binary_scores) == len(docs)
+
 def test_generation_chain()->None:
     question = "agent memory"
     docs = retriever.invoke(question)
@@ -56,6 +69,17 @@ def test_hallucination_grader_answer_no()->None:
 
     assert res.binary_score == False
 
+def test_grade_generation_discards_answer_verdict_when_not_grounded()->None:
+    question = "agent memory"
+    docs = retriever.invoke(question)
+    generation = "In order to make dosa we need to start wth batter."
+
+    first = grade_generation(question, docs, generation)
+    second = grade_generation(question, docs, generation)
+
+    assert first == (False, None)
+    assert second == first
+
 def test_router_to_vectorstore()->None:
     question = "agent memory"
     
@@ -1,6 +1,6 @@
 from graph.nodes.retrieve import retrieve
-from graph.nodes.grade_documents import grade_documents
+from graph.nodes.grade_documents import grade_documents, agrade_documents
 from graph.nodes.websearch import web_search
 from graph.nodes.generate import generate
 
-__all__ = ['retrieve', 'grade_documents', 'web_search', 'generate']
\ No newline at end of file
+__all__ = ['retrieve', 'grade_documents', 'agrade_documents', 'web_search', 'generate']
\ No newline at end of file
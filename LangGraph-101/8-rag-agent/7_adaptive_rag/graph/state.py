@@ -8,8 +8,10 @@ class GraphState(TypedDict):
         generation: LLM generation
         web_search: whether to add search (boolean)
         documents: List of documents
+        generation_count: number of generations in this run
     """
     question: str
     generation: str
     web_search: bool
-    documents: List[str]
\ No newline at end of file
+    documents: List[str]
+    generation_count: int
\ No newline at end of file
@@ -1,8 +1,21 @@
 from dotenv import load_dotenv
 load_dotenv()
 
+import os
+import sys
+
 from graph.graph import app
 
+# The graph profiler lives in 13-debugging/
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "13-debugging")))
+from graph_profiler import profile_graph
+
 if __name__=='__main__':
+    # GRAPH_PROFILING=1 records per-node latency, tokens and state size (see graph_profiler.py)
+    graph, profiler = profile_graph(app)
+
     print('Hello Advanced RAG')
-    print(app.invoke(input={"question":"what is agent memory?"}))
+    print(graph.invoke(input={"question":"what is agent memory?"}))
+
+    if profiler is not None:
+        profiler.save()
@@ -0,0 +1,243 @@
+"""
+Shared embedding layer for the Ollama-backed RAG samples.
+
+`CachedEmbeddings` is a drop-in LangChain `Embeddings` that wraps a base
+model (`OllamaEmbeddings` by default) and:
+
+- deduplicates identical texts within a request,
+- serves repeated texts from a disk cache keyed by (model, text hash),
+  storing vectors as float32 NumPy arrays in SQLite,
+- micro-batches the remaining texts: concurrent callers that arrive within
+  a short window are embedded together, in batches of at most `batch_size`,
+- keeps throughput counters that can be printed with `log_stats()`.
+
+Use `get_embeddings(model)` so all retrievers in a process share one
+instance (and therefore one batcher and one cache connection).
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+EMBEDDING_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "embeddings.sqlite")
+EMBEDDING_BATCH_SIZE = 32
+EMBEDDING_BATCH_WAIT = 0.01    # seconds a batch waits for concurrent callers to join
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+class EmbeddingCache:
+    """
+    SQLite store of float32 embedding vectors keyed by (model, text hash).
+
+    Attributes:
+        path (str): SQLite database file.
+    """
+    def __init__(self, path: str = EMBEDDING_CACHE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            )
+            """
+        )
+        self._db.commit()
+
+    def get_many(self, model: str, hashes: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Return the cached vectors among `hashes` (missing hashes are absent from the result).
+        """
+        found = {}
+        with self._lock:
+            # Stay below SQLite's bound-parameter limit
+            for i in range(0, len(hashes), 500):
+                chunk = hashes[i:i + 500]
+                rows = self._db.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({','.join('?' * len(chunk))})",
+                    (model, *chunk)
+                ).fetchall()
+                found.update({h: np.frombuffer(blob, dtype=np.float32) for h, blob in rows})
+        return found
+
+    def put_many(self, model: str, vectors: Dict[str, np.ndarray]) -> None:
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector) VALUES (?, ?, ?)",
+                [(model, h, np.asarray(v, dtype=np.float32).tobytes()) for h, v in vectors.items()]
+            )
+            self._db.commit()
+
+class MicroBatcher:
+    """
+    Coalesce concurrent embedding requests into batched calls.
+
+    The first caller to find no batch in progress becomes the leader: it waits
+    up to `max_wait` seconds for other callers to queue texts (or until a full
+    batch is queued), then embeds the queue in batches of `max_batch`. Other
+    callers block on their futures. A text already queued or being embedded
+    is not queued again; its callers share one future.
+    """
+    def __init__(self, embed_batch: Callable[[List[str]], List[List[float]]], max_batch: int, max_wait: float):
+        self._embed_batch = embed_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[str, Future]] = []
+        self._in_flight: Dict[str, Future] = {}
+        self._leader_active = False
+
+    def submit(self, texts: List[str]) -> List[Future]:
+        futures = []
+
+        with self._lock:
+            for text in texts:
+                future = self._in_flight.get(text)
+                if future is None:
+                    future = self._in_flight[text] = Future()
+                    self._pending.append((text, future))
+                futures.append(future)
+
+            leader = not self._leader_active
+            self._leader_active = True
+
+        if leader:
+            self._drain()
+
+        return futures
+
+    def _drain(self) -> None:
+        deadline = time.monotonic() + self.max_wait
+        while time.monotonic() < deadline:
+            with self._lock:
+                if len(self._pending) >= self.max_batch:
+                    break
+            time.sleep(self.max_wait / 10)
+
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._leader_active = False
+                    return
+                batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+
+            try:
+                vectors = self._embed_batch([text for text, _ in batch])
+                for (_, future), vector in zip(batch, vectors):
+                    future.set_result(vector)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            finally:
+                with self._lock:
+                    for text, _ in batch:
+                        self._in_flight.pop(text, None)
+
+class CachedEmbeddings(Embeddings):
+    """
+    Deduplicating, disk-cached, micro-batched wrapper around an `Embeddings` model.
+
+    Attributes:
+        model (str): Model name (part of the cache key).
+        base (Embeddings): Model used for cache misses.
+        stats (dict): Request / text / cache / batch counters for this process.
+    """
+    def __init__(
+        self,
+        model: str,
+        base: Optional[Embeddings] = None,
+        cache: Optional[EmbeddingCache] = None,
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        batch_wait: float = EMBEDDING_BATCH_WAIT,
+    ):
+        if base is None:
+            from langchain_ollama import OllamaEmbeddings
+            base = OllamaEmbeddings(model=model)
+
+        self.model = model
+        self.base = base
+        self.cache = cache or EmbeddingCache()
+        self.stats = {"requests": 0, "texts": 0, "duplicates": 0, "cache_hits": 0, "embedded": 0, "batches": 0, "embed_seconds": 0.0}
+
+        self._stats_lock = threading.Lock()
+        self._batcher = MicroBatcher(self._embed_batch, batch_size, batch_wait)
+
+    def _count(self, **increments) -> None:
+        with self._stats_lock:
+            for key, value in increments.items():
+                self.stats[key] += value
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        start = time.perf_counter()
+        vectors = self.base.embed_documents(texts)
+        self._count(batches=1, embedded=len(texts), embed_seconds=time.perf_counter() - start)
+        return vectors
+
+    def _embed(self, texts: List[str]) -> List[np.ndarray]:
+        hashes = [_text_hash(t) for t in texts]
+
+        # Deduplicate, keeping the first occurrence of each text
+        unique = dict(zip(hashes, texts))
+        cached = self.cache.get_many(self.model, list(unique))
+        missing = [h for h in unique if h not in cached]
+
+        self._count(requests=1, texts=len(texts), duplicates=len(texts) - len(unique), cache_hits=len(cached))
+
+        if missing:
+            futures = self._batcher.submit([unique[h] for h in missing])
+            fresh = {h: np.asarray(f.result(), dtype=np.float32) for h, f in zip(missing, futures)}
+            self.cache.put_many(self.model, fresh)
+            cached.update(fresh)
+
+        return [cached[h] for h in hashes]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [v.tolist() for v in self._embed(texts)]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed([text])[0].tolist()
+
+    def throughput(self) -> float:
+        """
+        Texts embedded per second of model time (cache hits excluded).
+        """
+        return self.stats["embedded"] / self.stats["embed_seconds"] if self.stats["embed_seconds"] else 0.0
+
+    def log_stats(self) -> None:
+        """
+        Print the embedding counters for this process.
+        """
+        s = self.stats
+        print(
+            f"---EMBEDDINGS [{self.model}]--- requests={s['requests']}, texts={s['texts']}, "
+            f"duplicates={s['duplicates']}, cache_hits={s['cache_hits']}, embedded={s['embedded']}, "
+            f"batches={s['batches']}, throughput={self.throughput():.1f} texts/s"
+        )
+
+_embeddings: Dict[str, CachedEmbeddings] = {}
+_embeddings_lock = threading.Lock()
+
+def get_embeddings(model: str) -> CachedEmbeddings:
+    """
+    Return the process-wide cached embeddings for an Ollama model, creating them on first use.
+    """
+    with _embeddings_lock:
+        if model not in _embeddings:
+            _embeddings[model] = CachedEmbeddings(model)
+        return _embeddings[model]
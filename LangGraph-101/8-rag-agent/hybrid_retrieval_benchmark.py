@@ -0,0 +1,133 @@
+"""
+Retrieval quality and latency benchmark: vector vs BM25 vs hybrid (RRF).
+
+Runs a small labelled question set against the Peak Performance Gym
+documents used by `2_classification_driven_rag.py` and
+`4_advanced_multi_step_reasoning.py`, and reports hit@1, hit@k, MRR and
+mean latency per retriever.
+
+Usage (from 8-rag-agent/, Ollama running):
+    python hybrid_retrieval_benchmark.py --k 3
+    python hybrid_retrieval_benchmark.py --fake-embeddings    # no Ollama; vector scores are meaningless
+"""
+
+import argparse
+import time
+from typing import Dict, List
+
+from langchain_core.documents import Document
+from langchain_core.vectorstores import InMemoryVectorStore
+
+from hybrid_retriever import BM25Index, HybridRetriever
+
+docs = [
+    Document(
+        page_content="Peak Performance Gym was founded in 2015 by former Olympic athlete Marcus Chen. With over 15 years of experience in professional athletics, Marcus established the gym to provide personalized fitness solutions for people of all levels. The gym spans 10,000 square feet and features state-of-the-art equipment.",
+        metadata={"source": "about.txt"},
+    ),
+    Document(
+        page_content="Peak Performance Gym is open Monday through Friday from 5:00 AM to 11:00 PM. On weekends, our hours are 7:00 AM to 9:00 PM. We remain closed on major national holidays. Members with Premium access can enter using their key cards 24/7, including holidays.",
+        metadata={"source": "hours.txt"},
+    ),
+    Document(
+        page_content="Our membership plans include: Basic (₹1,500/month) with access to gym floor and basic equipment; Standard (₹2,500/month) adds group classes and locker facilities; Premium (₹4,000/month) includes 24/7 access, personal training sessions, and spa facilities. We offer student and senior citizen discounts of 15% on all plans. Corporate partnerships are available for companies with 10+ employees joining.",
+        metadata={"source": "membership.txt"},
+    ),
+    Document(
+        page_content="Group fitness classes at Peak Performance Gym include Yoga (beginner, intermediate, advanced), HIIT, Zumba, Spin Cycling, CrossFit, and Pilates. Beginner classes are held every Monday and Wednesday at 6:00 PM. Intermediate and advanced classes are scheduled throughout the week. The full schedule is available on our mobile app or at the reception desk.",
+        metadata={"source": "classes.txt"},
+    ),
+    Document(
+        page_content="Personal trainers at Peak Performance Gym are all certified professionals with minimum 5 years of experience. Each new member receives a complimentary fitness assessment and one free session with a trainer. Our head trainer, Neha Kapoor, specializes in rehabilitation fitness and sports-specific training. Personal training sessions can be booked individually (₹800/session) or in packages of 10 (₹7,000) or 20 (₹13,000).",
+        metadata={"source": "trainers.txt"},
+    ),
+    Document(
+        page_content="Peak Performance Gym's facilities include a cardio zone with 30+ machines, strength training area, functional fitness space, dedicated yoga studio, spin class room, swimming pool (25m), sauna and steam rooms, juice bar, and locker rooms with shower facilities. Our equipment is replaced or upgraded every 3 years to ensure members have access to the latest fitness technology.",
+        metadata={"source": "facilities.txt"},
+    ),
+]
+
+# (question, source of the document that answers it)
+labelled_questions = [
+    ("Who founded Peak Performance Gym?", "about.txt"),
+    ("Is Marcus Chen an Olympic athlete?", "about.txt"),
+    ("How big is the gym in square feet?", "about.txt"),
+    ("What time does the gym open on weekdays?", "hours.txt"),
+    ("Are you open on national holidays?", "hours.txt"),
+    ("When can I come in on Saturday?", "hours.txt"),
+    ("How much is the Standard plan?", "membership.txt"),
+    ("Which plan costs ₹4,000 per month?", "membership.txt"),
+    ("Is there a student discount?", "membership.txt"),
+    ("Do you have Zumba or Pilates?", "classes.txt"),
+    ("When are the beginner yoga classes?", "classes.txt"),
+    ("Who is Neha Kapoor?", "trainers.txt"),
+    ("How much does a package of 10 training sessions cost?", "trainers.txt"),
+    ("Is the first session with a trainer free?", "trainers.txt"),
+    ("Is there a swimming pool?", "facilities.txt"),
+    ("How often is the equipment replaced?", "facilities.txt"),
+]
+
+class _BM25Retriever:
+    """BM25-only baseline with the same `invoke` interface."""
+    def __init__(self, index: BM25Index, k: int):
+        self.index, self.k = index, k
+
+    def invoke(self, query: str) -> List[Document]:
+        return [doc for doc, _ in self.index.search(query, self.k)]
+
+def evaluate(retriever, k: int) -> Dict[str, float]:
+    hits_1, hits_k, reciprocal_ranks, latencies = 0, 0, [], []
+
+    for question, source in labelled_questions:
+        start = time.perf_counter()
+        results = retriever.invoke(question)[:k]
+        latencies.append(time.perf_counter() - start)
+
+        sources = [doc.metadata.get("source") for doc in results]
+        rank = sources.index(source) + 1 if source in sources else None
+        hits_1 += rank == 1
+        hits_k += rank is not None
+        reciprocal_ranks.append(1 / rank if rank else 0.0)
+
+    n = len(labelled_questions)
+    return {
+        "hit@1": hits_1 / n,
+        f"hit@{k}": hits_k / n,
+        "mrr": sum(reciprocal_ranks) / n,
+        "latency_ms": 1000 * sum(latencies) / n,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Vector vs BM25 vs hybrid retrieval benchmark")
+    parser.add_argument("--k", type=int, default=3, help="documents retrieved per question")
+    parser.add_argument("--model", default="llama3:8b", help="Ollama embedding model")
+    parser.add_argument("--fake-embeddings", action="store_true", help="use random embeddings instead of Ollama")
+    args = parser.parse_args()
+
+    if args.fake_embeddings:
+        from langchain_core.embeddings import DeterministicFakeEmbedding
+        embeddings = DeterministicFakeEmbedding(size=256)
+    else:
+        from embedding_service import get_embeddings
+        embeddings = get_embeddings(args.model)
+
+    vector_retriever = InMemoryVectorStore.from_documents(docs, embeddings).as_retriever(search_kwargs={"k": args.k})
+
+    # Warm up the embedding cache so latency reflects retrieval, not first-time embedding
+    for question, _ in labelled_questions:
+        embeddings.embed_query(question)
+
+    retrievers = {
+        "vector": vector_retriever,
+        "bm25": _BM25Retriever(BM25Index(docs), args.k),
+        "hybrid (rrf)": HybridRetriever.from_documents(docs, vector_retriever, k=args.k),
+    }
+
+    print(f"{len(labelled_questions)} labelled questions, k={args.k}, embeddings={'fake' if args.fake_embeddings else args.model}")
+    print(f"{'retriever':<14} {'hit@1':>6} {f'hit@{args.k}':>6} {'mrr':>6} {'latency':>10}")
+    for name, retriever in retrievers.items():
+        m = evaluate(retriever, args.k)
+        print(f"{name:<14} {m['hit@1']:6.2f} {m[f'hit@{args.k}']:6.2f} {m['mrr']:6.2f} {m['latency_ms']:8.2f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Hybrid lexical + vector retrieval for the RAG samples.
+
+`BM25Index` is a small in-process inverted index scored with BM25, which
+finds exact terms (prices, names, times) that embeddings tend to blur.
+`HybridRetriever` runs it next to an existing vector retriever and fuses
+both rankings with reciprocal-rank fusion (RRF):
+
+    score(d) = sum over rankings of 1 / (rrf_k + rank(d))
+
+It is a LangChain `BaseRetriever`, so it is a drop-in replacement for the
+vector retriever (`retriever.invoke(question)`).
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from pydantic import ConfigDict
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+def _doc_key(doc: Document) -> Tuple[str, str]:
+    return (str(doc.metadata.get("source", "")), doc.page_content)
+
+class BM25Index:
+    """
+    Inverted index over a fixed document set, scored with BM25.
+
+    Attributes:
+        documents (List[Document]): Indexed documents.
+        postings (dict): term -> list of (document index, term frequency).
+    """
+    def __init__(self, documents: List[Document], k1: float = 1.5, b: float = 0.75):
+        self.documents = documents
+        self.k1 = k1
+        self.b = b
+
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+        self.lengths: List[int] = []
+
+        for i, doc in enumerate(documents):
+            terms = tokenize(doc.page_content)
+            self.lengths.append(len(terms))
+            for term, tf in Counter(terms).items():
+                self.postings.setdefault(term, []).append((i, tf))
+
+        self.avg_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 1.0
+        n = len(documents)
+        self.idf = {
+            term: math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+            for term, posting in self.postings.items()
+        }
+
+    def search(self, query: str, k: int = 4) -> List[Tuple[Document, float]]:
+        """
+        Return the top `k` documents for `query` with their BM25 scores.
+
+        Only the postings of the query terms are visited.
+        """
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for i, tf in self.postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[i] / self.avg_length)
+                scores[i] = scores.get(i, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: -item[1])[:k]
+        return [(self.documents[i], score) for i, score in ranked]
+
+def reciprocal_rank_fusion(rankings: List[List[Document]], k: int, rrf_k: int = 60) -> List[Document]:
+    """
+    Fuse several ranked document lists into one with reciprocal-rank fusion.
+
+    Args:
+        rankings (List[List[Document]]): Ranked results of each retriever.
+        k (int): Number of documents to return.
+        rrf_k (int): RRF damping constant (60 in the original paper).
+
+    Returns:
+        List[Document]: Top `k` documents by fused score.
+    """
+    scores: Dict[Tuple[str, str], float] = {}
+    first_seen: Dict[Tuple[str, str], Document] = {}
+
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking, start=1):
+            key = _doc_key(doc)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank)
+            first_seen.setdefault(key, doc)
+
+    ranked = sorted(scores, key=lambda key: -scores[key])[:k]
+    return [first_seen[key] for key in ranked]
+
+class HybridRetriever(BaseRetriever):
+    """
+    Retriever fusing BM25 and vector search results with reciprocal-rank fusion.
+
+    Attributes:
+        vector_retriever (BaseRetriever): Existing embedding-based retriever.
+        bm25 (BM25Index): Lexical index over the same documents.
+        k (int): Number of documents returned.
+        bm25_k (int): BM25 candidates considered before fusion.
+        rrf_k (int): RRF damping constant.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    vector_retriever: BaseRetriever
+    bm25: BM25Index
+    k: int = 4
+    bm25_k: int = 4
+    rrf_k: int = 60
+
+    @classmethod
+    def from_documents(cls, documents: List[Document], vector_retriever: BaseRetriever, k: int = 4, **kwargs) -> "HybridRetriever":
+        """
+        Build a hybrid retriever over `documents`, which must be the documents behind `vector_retriever`.
+        """
+        return cls(vector_retriever=vector_retriever, bm25=BM25Index(documents), k=k, bm25_k=kwargs.pop("bm25_k", k), **kwargs)
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        vector_docs = self.vector_retriever.invoke(query, config={"callbacks": run_manager.get_child()})
+        bm25_docs = [doc for doc, _ in self.bm25.search(query, self.bm25_k)]
+        return reciprocal_rank_fusion([bm25_docs, vector_docs], self.k, self.rrf_k)
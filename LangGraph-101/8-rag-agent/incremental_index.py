@@ -0,0 +1,146 @@
+"""
+Incremental ingestion into a persistent Chroma collection, shared by the
+`ingestion.py` modules of the RAG samples.
+
+Every chunk gets a content-derived id (hash of its source and text), so a
+chunk that is already in the collection is never embedded again. On each
+run only new or changed chunks are embedded and upserted, and chunks whose
+source changed or disappeared are deleted.
+
+A JSON manifest next to the collection records the embedding model, the
+splitter settings and a hash per source. Unchanged sources are not re-split,
+and a different embedding model or splitter rebuilds the collection. So does a
+non-empty collection without a manifest: the model its vectors came from is
+unknown, and mixing models in one collection would break similarity search.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional
+
+from langchain_core.documents import Document
+
+MANIFEST_VERSION = 1
+
+def _hash(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+def load_manifest(path: str) -> Dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+def save_manifest(path: str, manifest: Dict) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+def sync_vectorstore(
+    vectorstore,
+    documents: List[Document],
+    text_splitter,
+    embedding_model: str,
+    manifest_path: str,
+    splitter_settings: Optional[Dict] = None,
+    source_key: str = "source",
+) -> Dict[str, int]:
+    """
+    Bring a Chroma collection in line with `documents`, embedding only what changed.
+
+    Args:
+        vectorstore: Persistent `Chroma` instance to update.
+        documents (List[Document]): Source documents (one or more per source).
+        text_splitter: Splitter used to chunk changed sources.
+        embedding_model (str): Name of the embedding model (a change, or an existing
+            collection without a manifest, triggers a rebuild).
+        manifest_path (str): JSON manifest file for this collection.
+        splitter_settings (dict | None): Splitter parameters (a change triggers a rebuild).
+        source_key (str): Metadata key identifying a document's source.
+
+    Returns:
+        dict: Counts of sources re-split and chunks kept / added / deleted.
+    """
+    manifest = load_manifest(manifest_path)
+    settings = {
+        "version": MANIFEST_VERSION,
+        "embedding_model": embedding_model,
+        "splitter": splitter_settings or {},
+    }
+
+    if manifest and any(manifest.get(k) != v for k, v in settings.items()):
+        print(f"Index settings changed ({manifest.get('embedding_model')} -> {embedding_model}), rebuilding collection")
+        vectorstore.reset_collection()
+        manifest = {}
+    elif not manifest and vectorstore.get(limit=1, include=[])["ids"]:
+        print(f"Collection has no index manifest (embedding model unknown), rebuilding it with {embedding_model}")
+        vectorstore.reset_collection()
+
+    previous_sources = manifest.get("sources", {})
+
+    # Group documents by source and hash each source's content
+    by_source: Dict[str, List[Document]] = {}
+    for doc in documents:
+        by_source.setdefault(str(doc.metadata.get(source_key, "")), []).append(doc)
+
+    sources, wanted, resplit = {}, {}, 0
+    for source, docs in by_source.items():
+        source_hash = _hash(*(doc.page_content for doc in docs))
+        previous = previous_sources.get(source)
+
+        if previous and previous["hash"] == source_hash:
+            # Unchanged source: reuse its chunk ids without re-splitting
+            sources[source] = previous
+            wanted.update({chunk_id: None for chunk_id in previous["chunks"]})
+            continue
+
+        resplit += 1
+        chunk_ids = []
+        for chunk in text_splitter.split_documents(docs):
+            chunk_id = _hash(source, chunk.page_content)
+            if chunk_id not in wanted:
+                wanted[chunk_id] = chunk
+                chunk_ids.append(chunk_id)
+        sources[source] = {"hash": source_hash, "chunks": chunk_ids}
+
+    # The collection (not the manifest) is the source of truth for what is embedded
+    existing = set(vectorstore.get(include=[])["ids"])
+
+    to_delete = [chunk_id for chunk_id in existing if chunk_id not in wanted]
+    to_add = [chunk_id for chunk_id in wanted if chunk_id not in existing]
+
+    # A chunk listed for an unchanged source but missing from the collection
+    # (e.g. the collection was wiped) needs its source re-split
+    missing_sources = {s for s, entry in sources.items() if any(wanted[c] is None and c in to_add for c in entry["chunks"])}
+    for source in missing_sources:
+        resplit += 1
+        for chunk in text_splitter.split_documents(by_source[source]):
+            chunk_id = _hash(source, chunk.page_content)
+            if chunk_id in wanted and wanted[chunk_id] is None:
+                wanted[chunk_id] = chunk
+
+    if to_delete:
+        vectorstore.delete(ids=to_delete)
+    if to_add:
+        vectorstore.add_documents([wanted[chunk_id] for chunk_id in to_add], ids=to_add)
+
+    save_manifest(manifest_path, {**settings, "sources": sources})
+
+    stats = {
+        "sources_resplit": resplit,
+        "chunks_kept": len(wanted) - len(to_add),
+        "chunks_added": len(to_add),
+        "chunks_deleted": len(to_delete),
+    }
+    print(
+        f"Vector index: {stats['chunks_added']} chunks embedded, {stats['chunks_deleted']} deleted, "
+        f"{stats['chunks_kept']} reused ({resplit}/{len(by_source)} sources re-split)"
+    )
+    return stats
@@ -0,0 +1,216 @@
+"""
+Embedding-centroid fast path for on/off-topic question classification.
+
+Each topic is represented by the centroid of its example texts' embeddings,
+and a set of off-topic examples forms one more centroid. A question is
+embedded once and compared to all centroids with a single matrix product.
+The decision uses the margin between the best topic and the off-topic
+centroid:
+
+    margin >= accept_margin  ->  "Yes" (on topic)
+    margin <= reject_margin  ->  "No"  (off topic)
+    otherwise                ->  None  (uncertain: ask the LLM classifier)
+
+Thresholds depend on the embedding model, so they are not hard-coded: until
+margins are given or derived with `calibrate()` from a labelled set of
+questions, every question goes to the LLM classifier. `calibrate()` places
+the accept margin above every off-topic calibration question and the reject
+margin below every on-topic one (plus a safety gap), so no calibration
+question is misrouted by the fast path. The per-question margins and the
+fallback rate are printed so they can be checked.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+# Generic questions outside any sample's domain, used for the off-topic centroid
+GENERAL_OFF_TOPIC_EXAMPLES = [
+    "What is the capital of France?",
+    "Who won the last football world cup?",
+    "How do I bake sourdough bread?",
+    "What's the weather like tomorrow?",
+    "Explain how quantum computers work.",
+    "Recommend a good science fiction novel.",
+    "How do I fix a bug in my Python code?",
+    "What is the stock price of Apple today?",
+]
+
+# Safety gap between the calibration margins and the thresholds derived from them
+CALIBRATION_GAP = 0.02
+
+GYM_TOPICS = [
+    "Gym History & Founder",
+    "Operating Hours",
+    "Membership Plans",
+    "Fitness Classes",
+    "Personal Trainers",
+    "Facilities & Equipment",
+]
+
+# Labelled questions (on topic?) for the Peak Performance Gym samples; kept
+# separate from GENERAL_OFF_TOPIC_EXAMPLES so the thresholds are not fit to the centroid itself
+GYM_CALIBRATION_SET = [
+    ("Who founded Peak Performance Gym?", True),
+    ("When did the gym open?", True),
+    ("What time does the gym open on Saturday?", True),
+    ("Are you open on public holidays?", True),
+    ("How much is the premium membership?", True),
+    ("Is there a student discount?", True),
+    ("When are the beginner yoga classes?", True),
+    ("Do you offer spin or HIIT classes?", True),
+    ("How much does a personal training session cost?", True),
+    ("Who is the head trainer?", True),
+    ("Does the gym have a swimming pool?", True),
+    ("Is there a sauna?", True),
+    ("What is the tallest mountain in the world?", False),
+    ("Can you translate this sentence into Spanish?", False),
+    ("Who wrote Pride and Prejudice?", False),
+    ("How do I change a flat tyre?", False),
+    ("What is the best way to learn piano?", False),
+    ("How do interest rates affect inflation?", False),
+    ("Write a poem about the ocean.", False),
+    ("What is the population of Tokyo?", False),
+]
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+class CentroidTopicClassifier:
+    """
+    Classify questions as on / off topic by cosine similarity to topic centroids.
+
+    Attributes:
+        topics (List[str]): Topic names, in centroid order.
+        accept_margin (float | None): Margin at or above which a question is on topic.
+        reject_margin (float | None): Margin at or below which a question is off topic.
+            While either is None (not calibrated) every question falls back to the LLM.
+        stats (dict): Fast-path accept / reject and fallback counters.
+    """
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        topics: Dict[str, List[str]],
+        accept_margin: Optional[float] = None,
+        reject_margin: Optional[float] = None,
+        off_topic_examples: Optional[List[str]] = None,
+    ):
+        self.embeddings = embeddings
+        self.topics = list(topics)
+        self.accept_margin = self.reject_margin = None
+        if accept_margin is not None or reject_margin is not None:
+            self.set_margins(accept_margin, reject_margin)
+        self.stats = {"accepted": 0, "rejected": 0, "fallbacks": 0}
+
+        # Embed all examples in one call, then average per topic
+        groups = list(topics.values()) + [off_topic_examples or GENERAL_OFF_TOPIC_EXAMPLES]
+        texts = [text for group in groups for text in group]
+        vectors = _normalize(np.asarray(embeddings.embed_documents(texts), dtype=np.float32))
+
+        centroids, start = [], 0
+        for group in groups:
+            centroids.append(vectors[start:start + len(group)].mean(axis=0))
+            start += len(group)
+
+        centroids = _normalize(np.stack(centroids))
+        self._topic_centroids = centroids[:-1]
+        self._off_topic_centroid = centroids[-1]
+
+    @property
+    def calibrated(self) -> bool:
+        return self.accept_margin is not None and self.reject_margin is not None
+
+    def set_margins(self, accept_margin: float, reject_margin: float) -> None:
+        if accept_margin is None or reject_margin is None:
+            raise ValueError("accept_margin and reject_margin must be set together")
+        if not reject_margin < accept_margin:
+            raise ValueError(f"reject_margin ({reject_margin}) must be below accept_margin ({accept_margin})")
+        self.accept_margin = accept_margin
+        self.reject_margin = reject_margin
+
+    def _margins(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Best-topic index and margin (best topic minus off-topic similarity) per question vector."""
+        vectors = _normalize(vectors)
+        topic_scores = vectors @ self._topic_centroids.T
+        best = np.argmax(topic_scores, axis=-1)
+        margins = np.take_along_axis(topic_scores, best[..., None], axis=-1)[..., 0] - vectors @ self._off_topic_centroid
+        return best, margins
+
+    def calibrate(self, labelled: Sequence[Tuple[str, bool]], gap: float = CALIBRATION_GAP) -> Tuple[float, float]:
+        """
+        Derive the margins from labelled questions (question, on_topic).
+
+        The accept margin is set `gap` above the highest off-topic margin and the
+        reject margin `gap` below the lowest on-topic margin. If the two classes
+        are further apart than that, the thresholds meet around the midpoint with
+        a `gap`-wide uncertainty band.
+
+        Returns:
+            Tuple[float, float]: (accept_margin, reject_margin).
+        """
+        on_topic = [question for question, label in labelled if label]
+        off_topic = [question for question, label in labelled if not label]
+        if not on_topic or not off_topic:
+            raise ValueError("calibration needs both on-topic and off-topic questions")
+
+        vectors = np.asarray(self.embeddings.embed_documents(on_topic + off_topic), dtype=np.float32)
+        _, margins = self._margins(vectors)
+        on_margins, off_margins = margins[:len(on_topic)], margins[len(on_topic):]
+
+        accept = float(off_margins.max()) + gap
+        reject = float(on_margins.min()) - gap
+        if reject >= accept:
+            midpoint = (accept + reject) / 2
+            accept, reject = midpoint + gap / 2, midpoint - gap / 2
+
+        self.set_margins(accept, reject)
+
+        decided = int((on_margins >= accept).sum() + (off_margins <= reject).sum())
+        print(
+            f"topic_classifier: calibrated on {len(labelled)} questions -> accept_margin={accept:+.3f}, "
+            f"reject_margin={reject:+.3f} (on-topic margins {on_margins.min():+.3f}..{on_margins.max():+.3f}, "
+            f"off-topic {off_margins.min():+.3f}..{off_margins.max():+.3f}); fast path decides {decided}/{len(labelled)}"
+        )
+        return accept, reject
+
+    def classify(self, question: str) -> Optional[str]:
+        """
+        Return "Yes" / "No" when the margin is outside the uncertainty band, else None.
+        """
+        if not self.calibrated:
+            self.stats["fallbacks"] += 1
+            return None
+
+        q = np.asarray(self.embeddings.embed_query(question), dtype=np.float32)
+        best, margin = self._margins(q)
+        best, margin = int(best), float(margin)
+
+        if margin >= self.accept_margin:
+            decision, counter = "Yes", "accepted"
+        elif margin <= self.reject_margin:
+            decision, counter = "No", "rejected"
+        else:
+            decision, counter = None, "fallbacks"
+
+        self.stats[counter] += 1
+        total = sum(self.stats.values())
+        print(
+            f"topic_classifier: margin={margin:+.3f} (best topic: {self.topics[best]}) -> "
+            f"{decision or 'uncertain, LLM fallback'} | fallback rate {self.stats['fallbacks']}/{total} "
+            f"({self.stats['fallbacks'] / total:.0%})"
+        )
+        return decision
+
+def gym_topic_classifier(embeddings: Embeddings, docs) -> CentroidTopicClassifier:
+    """
+    Classifier for the Peak Performance Gym samples: one centroid per topic
+    (topic name + its document), calibrated on GYM_CALIBRATION_SET.
+    """
+    classifier = CentroidTopicClassifier(
+        embeddings,
+        topics={topic: [topic, doc.page_content] for topic, doc in zip(GYM_TOPICS, docs)},
+    )
+    classifier.calibrate(GYM_CALIBRATION_SET)
+    return classifier
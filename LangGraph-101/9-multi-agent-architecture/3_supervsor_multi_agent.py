@@ -1,24 +1,36 @@
+import hashlib
+import json
 import pprint
+from collections import OrderedDict
 from typing import Literal
 from pydantic import BaseModel, Field
 from langchain_core.messages import HumanMessage
 from langchain_community.tools.tavily_search import TavilySearchResults
-from langgraph.types import Command
+from langgraph.types import Command, Send
 from langgraph.graph import START, END, StateGraph, MessagesState
 from langgraph.prebuilt import create_react_agent
 from dotenv import load_dotenv
 from langchain_groq.chat_models import ChatGroq
-from langchain_experimental.tools import PythonREPLTool # tool to run python code
+from python_sandbox import PythonSandboxTool, SandboxPool # pooled, sandboxed tool to run python code
 
 load_dotenv()
 
 llm = ChatGroq(model='llama-3.1-8b-instant')
 
 tavily_search = TavilySearchResults(max_results=2)
-python_repl_tool = PythonREPLTool()
+# Pre-forked worker processes with CPU / memory limits and a hard timeout (see python_sandbox.py)
+python_repl_tool = PythonSandboxTool(pool=SandboxPool(size=2, cpu_seconds=10, memory_mb=1024, timeout=15))
 
 # print(python_repl_tool.invoke("x = 5; print(x**2)"))
 
+# Let the supervisor dispatch researcher and coder at once (Send fan-out); their
+# answers are merged for the validator
+PARALLEL_SPECIALISTS = True
+
+# Supervisor decisions for identical message histories are reused (LRU)
+ROUTING_CACHE_SIZE = 256
+routing_cache = OrderedDict()
+
 class Supervisor(BaseModel):
     next: Literal["enhancer", "researcher", "coder"] = Field(
         description="Determines which specialist to activate next in the workflow sequence: "
@@ -30,10 +42,46 @@ class Supervisor(BaseModel):
         description="Detailed justification for the routing decision, explaining the rationale behind selecting the particular specialist and how this advances the task toward completion."
     )
 
+class ParallelSupervisor(Supervisor):
+    next: Literal["enhancer", "researcher", "coder", "researcher_and_coder"] = Field(
+        description="Determines which specialist to activate next in the workflow sequence: "
+                    "'enhancer' when user input requires clarification, expansion, or refinement, "
+                    "'researcher' when additional facts, context, or data collection is necessary, "
+                    "'coder' when implementation, computation, or technical problem-solving is required, "
+                    "'researcher_and_coder' when the task needs both, so they can work at the same time."
+    )
+
 class Validator(BaseModel):
     next: Literal["supervisor", "FINISH"] = Field(description="Specifies the next worker in the pipeline: 'supervisor' to continue or 'FINISH' to terminate.")
     reason: str = Field(description="The reason for the decision.")
 
+# Specialist agents are compiled once and reused on every call
+research_agent = create_react_agent(
+    llm,  
+    tools=[tavily_search],  
+    state_modifier= "You are an Information Specialist with expertise in comprehensive research. Your responsibilities include:\n\n"
+        "1. Identifying key information needs based on the query context\n"
+        "2. Gathering relevant, accurate, and up-to-date information from reliable sources\n"
+        "3. Organizing findings in a structured, easily digestible format\n"
+        "4. Citing sources when possible to establish credibility\n"
+        "5. Focusing exclusively on information gathering - avoid analysis or implementation\n\n"
+        "Provide thorough, factual responses without speculation where information is unavailable."
+)
+
+code_agent = create_react_agent(
+    llm,
+    tools=[python_repl_tool],
+    state_modifier=(
+        "You are a coder and analyst. Focus on mathematical calculations, analyzing, solving math questions, "
+        "and executing code. Handle technical problem-solving and data tasks."
+    )
+)
+
+def routing_cache_key(messages) -> str:
+    """Hash of the message history the supervisor decides on"""
+    history = [(message.type, message.name, message.content) for message in messages]
+    return hashlib.sha256(json.dumps(history, default=str).encode("utf-8")).hexdigest()
+
 def supervisor_node(state: MessagesState) -> Command[Literal["enhancer", "researcher", "coder"]]:
 
     system_prompt = ('''
@@ -55,16 +103,39 @@ def supervisor_node(state: MessagesState) -> Command[Literal["enhancer", "resear
                  
     ''')
 
-    messages = [{"role": "system", "content": system_prompt}] + state['messages']
+    if PARALLEL_SPECIALISTS:
+        system_prompt += (
+            "\n        When a task needs both research and computation, choose 'researcher_and_coder' "
+            "to run the Researcher and Coder at the same time."
+        )
 
-    response = llm.with_structured_output(Supervisor).invoke(messages)
+    cache_key = routing_cache_key(state['messages'])
+    if cache_key in routing_cache:
+        routing_cache.move_to_end(cache_key)
+        goto, reason = routing_cache[cache_key]
+        print("--- Supervisor decision reused from routing cache ---")
+    else:
+        messages = [{"role": "system", "content": system_prompt}] + state['messages']
 
-    goto = response.next
-    reason = response.reason
+        response = llm.with_structured_output(ParallelSupervisor if PARALLEL_SPECIALISTS else Supervisor).invoke(messages)
+
+        goto = response.next
+        reason = response.reason
+
+        routing_cache[cache_key] = (goto, reason)
+        if len(routing_cache) > ROUTING_CACHE_SIZE:
+            routing_cache.popitem(last=False)
 
     print(f"--- Workflow Transition : Supervision -> {goto.upper()} ---")
 
-    return Command(update={"messages": [HumanMessage(content=reason, name="supervisor")]}, goto=goto)
+    update = {"messages": [HumanMessage(content=reason, name="supervisor")]}
+
+    if goto == "researcher_and_coder":
+        # Fan out: both specialists run in the same step on the state including the supervisor's reason
+        branch_state = {"messages": state['messages'] + update["messages"]}
+        return Command(update=update, goto=[Send("researcher", branch_state), Send("coder", branch_state)])
+
+    return Command(update=update, goto=goto)
 
 def enhancer_node(state: MessagesState) -> Command[Literal["supervisor"]]:
 
@@ -97,18 +168,6 @@ def research_node(state: MessagesState) -> Command[Literal["validator"]]:
         Takes the current task state, performs relevant research,
         and returns findings for validation.
     """
-    research_agent = create_react_agent(
-        llm,  
-        tools=[tavily_search],  
-        state_modifier= "You are an Information Specialist with expertise in comprehensive research. Your responsibilities include:\n\n"
-            "1. Identifying key information needs based on the query context\n"
-            "2. Gathering relevant, accurate, and up-to-date information from reliable sources\n"
-            "3. Organizing findings in a structured, easily digestible format\n"
-            "4. Citing sources when possible to establish credibility\n"
-            "5. Focusing exclusively on information gathering - avoid analysis or implementation\n\n"
-            "Provide thorough, factual responses without speculation where information is unavailable."
-    )
-
     result = research_agent.invoke(state)
 
     print(f"--- Workflow Transition : Researcher -> Validator ---")
@@ -117,15 +176,6 @@ def research_node(state: MessagesState) -> Command[Literal["validator"]]:
 
 def code_node(state: MessagesState) -> Command[Literal["validator"]]:
 
-    code_agent = create_react_agent(
-        llm,
-        tools=[python_repl_tool],
-        state_modifier=(
-            "You are a coder and analyst. Focus on mathematical calculations, analyzing, solving math questions, "
-            "and executing code. Handle technical problem-solving and data tasks."
-        )
-    )
-
     result = code_agent.invoke(state)
 
     print(f"--- Workflow Transition: Coder → Validator ---")
@@ -139,6 +189,18 @@ def code_node(state: MessagesState) -> Command[Literal["validator"]]:
         goto="validator",
     )
 
+def merged_specialist_answer(messages) -> str:
+    """Last agent response, or the researcher's and coder's responses merged when they ran in parallel"""
+    answers = []
+    for message in reversed(messages):
+        if message.name not in ("researcher", "coder"):
+            break
+        answers.append(f"{message.name.capitalize()}:\n{message.content}")
+
+    if len(answers) <= 1:
+        return messages[-1].content
+    return "\n\n".join(reversed(answers))
+
 def validator_node(state: MessagesState) -> Command[Literal["supervisor", "__end__"]]:
     system_prompt = '''
     Your task is to ensure reasonable quality. 
@@ -158,7 +220,7 @@ def validator_node(state: MessagesState) -> Command[Literal["supervisor", "__end
     '''
 
     user_question = state["messages"][0].content    # first human question
-    agent_answer = state["messages"][-1].content    # last agent response
+    agent_answer = merged_specialist_answer(state["messages"])    # last agent response(s)
 
     messages = [
         {"role": "system", "content": system_prompt},
@@ -210,6 +272,8 @@ def execute(inputs):
                 pprint.pprint(f"Output from node '{key}':")
                 pprint.pprint(last_message, indent=2, width=80, depth=None)
                 print()
+
+    print("Python sandbox:", python_repl_tool.pool.stats())
         
 # inputs = {"messages": [("user", "Weather in Chennai")]}
 # execute(inputs)
@@ -0,0 +1,232 @@
+"""
+Pooled, sandboxed Python execution for the coder agent.
+
+`SandboxPool` pre-forks `size` worker processes. Each worker:
+
+- limits its address space (`resource.setrlimit`) and gives every snippet its
+  own CPU budget of `cpu_seconds` (the soft CPU limit is moved to the worker's
+  usage so far plus the budget before each snippet, so CPU time of earlier
+  snippets does not count against later ones),
+- imports `warm_imports` (e.g. numpy) once at start, so snippets don't pay for them,
+- runs each snippet in a fresh namespace and returns its captured stdout / error.
+
+A snippet that exceeds `timeout` seconds gets its worker killed and replaced;
+callers wait for an idle worker when all are busy. `stats()` reports queue
+depth, in-flight runs, latency percentiles, timeouts and crashed workers.
+
+`PythonSandboxTool` replaces langchain_experimental's `PythonREPLTool` (same
+name and input handling) with a pool-backed tool. Unlike PythonREPLTool,
+variables do not persist between calls: snippets may run on different
+workers, so each call must be self-contained (the tool description says so).
+"""
+
+import atexit
+import contextlib
+import io
+import math
+import multiprocessing
+import queue
+import re
+import signal
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Dict, Sequence
+
+import numpy as np
+from langchain_core.tools import BaseTool
+from pydantic import ConfigDict
+
+try:
+    import resource
+except ImportError:     # not available on Windows; workers then run without limits
+    resource = None
+
+POOL_SIZE = 2
+CPU_SECONDS = 10
+MEMORY_MB = 1024
+TIMEOUT_SECONDS = 15
+WARM_IMPORTS = ("numpy",)
+
+def _set_cpu_budget(cpu_seconds: int) -> None:
+    """Allow `cpu_seconds` more CPU time from now: soft limit = usage so far + budget, hard limit unchanged."""
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = math.ceil(usage.ru_utime + usage.ru_stime) + cpu_seconds
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+def _worker(conn, cpu_seconds: int, memory_mb: int, warm_imports: Sequence[str]) -> None:
+    if resource is not None:
+        memory = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+
+    for module in warm_imports:
+        try:
+            __import__(module)
+        except ImportError:
+            pass
+
+    while True:
+        try:
+            code = conn.recv()
+        except EOFError:
+            return
+
+        if resource is not None:
+            _set_cpu_budget(cpu_seconds)    # past it, SIGXCPU ends the worker
+
+        stdout = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(stdout):
+                exec(code, {"__name__": "__main__"})
+            output = stdout.getvalue()
+        except BaseException:
+            # MemoryError, SystemExit etc. are reported like any other error
+            output = stdout.getvalue() + traceback.format_exc(limit=3)
+        conn.send(output)
+
+class _Worker:
+    def __init__(self, context, cpu_seconds: int, memory_mb: int, warm_imports: Sequence[str]):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker, args=(child_conn, cpu_seconds, memory_mb, tuple(warm_imports)), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+class SandboxPool:
+    """
+    Pool of pre-forked, resource-limited Python worker processes.
+
+    Attributes:
+        size (int): Number of worker processes.
+        timeout (float): Seconds a snippet may run before its worker is killed.
+    """
+    def __init__(
+        self,
+        size: int = POOL_SIZE,
+        cpu_seconds: int = CPU_SECONDS,
+        memory_mb: int = MEMORY_MB,
+        timeout: float = TIMEOUT_SECONDS,
+        warm_imports: Sequence[str] = WARM_IMPORTS,
+    ):
+        self.size = size
+        self.timeout = timeout
+        self._worker_args = (cpu_seconds, memory_mb, tuple(warm_imports))
+
+        # fork keeps start-up cheap where available (Linux); spawn elsewhere
+        methods = multiprocessing.get_all_start_methods()
+        self._context = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        for _ in range(size):
+            self._idle.put(self._spawn())
+
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._in_flight = 0
+        self._latencies = deque(maxlen=1000)
+        self._counters = {"runs": 0, "timeouts": 0, "crashes": 0}
+        self._closed = False
+
+        atexit.register(self.close)
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self._context, *self._worker_args)
+
+    def run(self, code: str) -> str:
+        """
+        Run `code` in an idle worker and return its stdout (or the error).
+        """
+        start = time.perf_counter()
+        with self._lock:
+            self._waiting += 1
+        worker = self._idle.get()
+        with self._lock:
+            self._waiting -= 1
+            self._in_flight += 1
+
+        try:
+            worker.conn.send(code)
+            if worker.conn.poll(self.timeout):
+                output = worker.conn.recv()
+                counter = "runs"
+            else:
+                worker.kill()
+                worker = self._spawn()
+                output = f"TimeoutError: execution exceeded {self.timeout:g} seconds"
+                counter = "timeouts"
+        except (EOFError, OSError):
+            # The worker died (e.g. killed by the CPU limit)
+            worker.process.join(1)
+            exitcode = worker.process.exitcode
+            worker.kill()
+            worker = self._spawn()
+            if exitcode == -signal.SIGXCPU:
+                output = f"Error: CPU time limit of {self._worker_args[0]} seconds exceeded"
+            else:
+                output = "Error: the Python worker crashed (resource limit exceeded?)"
+            counter = "crashes"
+        finally:
+            self._idle.put(worker)
+
+        with self._lock:
+            self._in_flight -= 1
+            self._counters[counter] += 1
+            self._latencies.append(time.perf_counter() - start)
+
+        return output
+
+    def stats(self) -> Dict[str, float]:
+        """Queue depth, in-flight runs, counters and latency (ms) of recent runs."""
+        with self._lock:
+            latencies = 1000 * np.array(self._latencies) if self._latencies else np.zeros(1)
+            return {
+                "queue_depth": self._waiting,
+                "in_flight": self._in_flight,
+                **self._counters,
+                "latency_ms_mean": float(latencies.mean()),
+                "latency_ms_p50": float(np.percentile(latencies, 50)),
+                "latency_ms_p95": float(np.percentile(latencies, 95)),
+            }
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().kill()
+            except queue.Empty:
+                return
+
+def sanitize_input(query: str) -> str:
+    """Strip whitespace, backticks and a leading 'python' from model-written code (as PythonREPLTool does)."""
+    query = re.sub(r"^(\s|`)*(?i:python)?\s*", "", query)
+    query = re.sub(r"(\s|`)*$", "", query)
+    return query
+
+class PythonSandboxTool(BaseTool):
+    """Python tool (in place of PythonREPLTool) that runs each snippet in a SandboxPool; no state is kept between calls."""
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    name: str = "Python_REPL"
+    description: str = (
+        "A Python shell. Use this to execute python commands. "
+        "Input should be a valid python command. "
+        "If you want to see the output of a value, you should print it out "
+        "with `print(...)`. Variables and imports do not persist between calls, "
+        "so each input must be a complete, self-contained program."
+    )
+    pool: SandboxPool
+
+    def _run(self, query: str, run_manager=None) -> str:
+        return self.pool.run(sanitize_input(query))
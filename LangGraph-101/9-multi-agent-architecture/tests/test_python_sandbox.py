@@ -0,0 +1,39 @@
+import pytest
+
+from python_sandbox import SandboxPool, resource
+
+BUSY_LOOP = """
+import time
+start = time.process_time()
+while time.process_time() - start < {seconds}:
+    pass
+print("done")
+"""
+
+@pytest.mark.skipif(resource is None, reason="CPU limits need the resource module")
+def test_sub_limit_snippets_do_not_add_up()->None:
+    pool = SandboxPool(size=1, cpu_seconds=2, timeout=10, warm_imports=())
+    try:
+        outputs = [pool.run(BUSY_LOOP.format(seconds=1)) for _ in range(4)]
+        assert outputs == ["done\n"] * 4
+        assert pool.stats()["crashes"] == 0
+    finally:
+        pool.close()
+
+@pytest.mark.skipif(resource is None, reason="CPU limits need the resource module")
+def test_snippet_over_cpu_limit_is_stopped()->None:
+    pool = SandboxPool(size=1, cpu_seconds=1, timeout=10, warm_imports=())
+    try:
+        assert "CPU time limit" in pool.run(BUSY_LOOP.format(seconds=3))
+        assert pool.stats()["crashes"] == 1
+        assert pool.run("print(1 + 1)") == "2\n"
+    finally:
+        pool.close()
+
+def test_snippets_run_in_a_fresh_namespace()->None:
+    pool = SandboxPool(size=1, warm_imports=())
+    try:
+        assert pool.run("x = 1\nprint(x)") == "1\n"
+        assert "NameError" in pool.run("print(x)")
+    finally:
+        pool.close()